@@ -4,124 +4,55 @@ import httpx
 from typing import Any, Dict, List, Optional
 from app.core.config import settings
 from app.core.session import CURRENT_HTTPX_CLIENT
+from app.clients.http_pool import get_http_client
 
 class CollectorClient:
-    def __init__(self, base_url: Optional[str] = None):
+    """
+    Collector API 호출 클라이언트
+    컨텍스트에 httpx.Client가 지정돼 있으면 그것을, 아니면 프로세스 전역 풀을 사용
+    """
+    def __init__(self, base_url: Optional[str] = None, timeout: Optional[float] = None):
         self.base_url: str = (base_url or f"{settings.COLLECTOR_BASE_URL}").rstrip("/")
+        self.timeout = timeout
 
     def _http(self) -> httpx.Client:
         cli = CURRENT_HTTPX_CLIENT.get()
-        return cli if cli is not None else httpx.Client(timeout=30.0)
+        return cli if cli is not None else get_http_client(self.base_url)
+
+    def _get_json(self, path: str) -> Any:
+        kwargs = {"timeout": self.timeout} if self.timeout is not None else {}
+        r = self._http().get(f"{self.base_url}{path}", **kwargs)
+        r.raise_for_status()
+        return r.json()
 
     # ---- 목록 API (필요 시 확장) ----
     def list_s3_buckets(self) -> List[Dict[str, Any]]:
-        h = self._http()
-        close_needed = (h is not CURRENT_HTTPX_CLIENT.get())
-        try:
-            r = h.get(f"{self.base_url}/api/s3-buckets")
-            r.raise_for_status()
-            return r.json()
-        finally:
-            if close_needed:
-                try: h.close()
-                except Exception: pass
+        return self._get_json("/api/s3-buckets")
 
     def list_dynamodb_tables(self) -> List[Dict[str, Any]]:
-        h = self._http(); close_needed = (h is not CURRENT_HTTPX_CLIENT.get())
-        try:
-            r = h.get(f"{self.base_url}/api/dynamodb-tables")
-            r.raise_for_status()
-            return r.json()
-        finally:
-            if close_needed:
-                try: h.close()
-                except Exception: pass
+        return self._get_json("/api/dynamodb-tables")
 
     def list_rds_instances(self) -> List[Dict[str, Any]]:
-        h = self._http(); close_needed = (h is not CURRENT_HTTPX_CLIENT.get())
-        try:
-            r = h.get(f"{self.base_url}/api/rds-instances")
-            r.raise_for_status()
-            return r.json()
-        finally:
-            if close_needed:
-                try: h.close()
-                except Exception: pass
+        return self._get_json("/api/rds-instances")
 
     def list_redshift_clusters(self) -> List[Dict[str, Any]]:
-        h = self._http(); close_needed = (h is not CURRENT_HTTPX_CLIENT.get())
-        try:
-            r = h.get(f"{self.base_url}/api/redshift-clusters")
-            r.raise_for_status()
-            return r.json()
-        finally:
-            if close_needed:
-                try: h.close()
-                except Exception: pass
+        return self._get_json("/api/redshift-clusters")
 
     def list_efs_filesystems(self) -> List[Dict[str, Any]]:
-        h = self._http(); close_needed = (h is not CURRENT_HTTPX_CLIENT.get())
-        try:
-            r = h.get(f"{self.base_url}/api/efs-filesystems")
-            r.raise_for_status()
-            return r.json()
-        finally:
-            if close_needed:
-                try: h.close()
-                except Exception: pass
+        return self._get_json("/api/efs-filesystems")
 
     def list_elasticache_clusters(self) -> List[Dict[str, Any]]:
-        h = self._http(); close_needed = (h is not CURRENT_HTTPX_CLIENT.get())
-        try:
-            r = h.get(f"{self.base_url}/api/elasticache-clusters")
-            r.raise_for_status()
-            return r.json()
-        finally:
-            if close_needed:
-                try: h.close()
-                except Exception: pass
+        return self._get_json("/api/elasticache-clusters")
 
     def list_kinesis_streams(self) -> List[Dict[str, Any]]:
-        h = self._http(); close_needed = (h is not CURRENT_HTTPX_CLIENT.get())
-        try:
-            r = h.get(f"{self.base_url}/api/kinesis-streams")
-            r.raise_for_status()
-            return r.json()
-        finally:
-            if close_needed:
-                try: h.close()
-                except Exception: pass
+        return self._get_json("/api/kinesis-streams")
 
     def list_msk_clusters(self) -> List[Dict[str, Any]]:
-        h = self._http(); close_needed = (h is not CURRENT_HTTPX_CLIENT.get())
-        try:
-            r = h.get(f"{self.base_url}/api/msk-clusters")
-            r.raise_for_status()
-            return r.json()
-        finally:
-            if close_needed:
-                try: h.close()
-                except Exception: pass
+        return self._get_json("/api/msk-clusters")
 
     # ---- 상세 API (필요 시 확장) ----
     def get_s3_bucket(self, name: str) -> Dict[str, Any]:
-        h = self._http(); close_needed = (h is not CURRENT_HTTPX_CLIENT.get())
-        try:
-            r = h.get(f"{self.base_url}/api/repositories/s3/{name}")
-            r.raise_for_status()
-            return r.json()
-        finally:
-            if close_needed:
-                try: h.close()
-                except Exception: pass
+        return self._get_json(f"/api/repositories/s3/{name}")
 
     def get_rds_instance(self, db_id: str) -> Dict[str, Any]:
-        h = self._http(); close_needed = (h is not CURRENT_HTTPX_CLIENT.get())
-        try:
-            r = h.get(f"{self.base_url}/api/repositories/rds/{db_id}")
-            r.raise_for_status()
-            return r.json()
-        finally:
-            if close_needed:
-                try: h.close()
-                except Exception: pass
+        return self._get_json(f"/api/repositories/rds/{db_id}")
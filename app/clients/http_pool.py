@@ -0,0 +1,83 @@
+# app/clients/http_pool.py
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict
+
+import httpx
+
+from app.core import tracing
+from app.core.config import settings
+from app.utils import snapshot
+from app.clients.upstream_health import BreakerTransport, get_breaker
+
+# 업스트림(base URL)별 프로세스 전역 keep-alive 커넥션 풀
+# - CollectorClient / MappingClient 의 모든 호출이 여기서 꺼낸 httpx.Client를 공유
+# - 요청마다 TCP/TLS 핸드셰이크를 새로 하지 않음
+# - 앱 lifespan 종료 시 close_all()로 정리
+# - 전송 계층을 서킷 브레이커로 감싸 업스트림 장애 시 타임아웃 대기 없이 빠르게 실패
+
+_POOLS: Dict[str, httpx.Client] = {}
+_LOCK = threading.Lock()
+
+
+def _new_client(base_url: str) -> httpx.Client:
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE,
+        keepalive_expiry=settings.HTTP_POOL_KEEPALIVE_EXPIRY,
+    )
+    # 스냅샷 기록/재생 모드면 전송 계층을 교체
+    transport = snapshot.http_transport(limits)
+    if snapshot.mode() != "replay":
+        transport = BreakerTransport(get_breaker(base_url), transport or httpx.HTTPTransport(limits=limits))
+    if tracing.enabled():
+        transport = tracing.TracingTransport(transport or httpx.HTTPTransport(limits=limits))
+    return httpx.Client(
+        timeout=float(settings.HTTP_TIMEOUT_SECONDS),
+        limits=limits,
+        transport=transport,
+    )
+
+
+def get_http_client(base_url: str) -> httpx.Client:
+    key = base_url.rstrip("/")
+    cli = _POOLS.get(key)
+    if cli is not None and not cli.is_closed:
+        return cli
+    with _LOCK:
+        cli = _POOLS.get(key)
+        if cli is None or cli.is_closed:
+            cli = _new_client(key)
+            _POOLS[key] = cli
+        return cli
+
+
+def close_all():
+    with _LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for cli in pools:
+        try:
+            cli.close()
+        except Exception:
+            pass
+
+
+def pool_stats() -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    with _LOCK:
+        items = list(_POOLS.items())
+    for base, cli in items:
+        try:
+            transport = cli._transport  # type: ignore[attr-defined]
+            while hasattr(transport, "inner"):
+                transport = transport.inner
+            conns = transport._pool.connections  # type: ignore[attr-defined]
+            out[base] = {
+                "connections": len(conns),
+                "idle": sum(1 for c in conns if c.is_idle()),
+            }
+        except Exception:
+            out[base] = {}
+    return out
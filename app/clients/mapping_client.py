@@ -1,54 +1,223 @@
 # app/clients/mapping_client.py
 from __future__ import annotations
 
+import asyncio
+import contextvars
 import httpx
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
-from typing import List
+from typing import Any, Dict, List, Optional
 
+from app.core import tracing
 from app.core.config import settings
 from app.models.schemas import RequirementRowOut, RequirementDetailOut
 from app.core.session import CURRENT_HTTPX_CLIENT
+from app.clients.mapping_mirror import MappingMirror, FetchResult
+from app.clients.http_pool import get_http_client
+from app.utils import snapshot
+from app.clients.upstream_health import AsyncBreakerTransport, UpstreamUnavailable, get_breaker
+
+try:
+    import h2  # type: ignore  # noqa: F401  (httpx[http2])
+    _HTTP2_AVAILABLE = True
+except Exception:
+    _HTTP2_AVAILABLE = False
+
+_RETRY_STATUS = {429, 500, 502, 503, 504}
 
 class MappingClient:
     """
     Compliance Mapping API 호출 클라이언트
-    세션 컨텍스트에 httpx.Client가 있으면 재사용
+    컨텍스트에 httpx.Client가 지정돼 있으면 그것을, 아니면 프로세스 전역 풀을 사용
+    로컬 미러(MAPPING_MIRROR_ENABLED)가 켜져 있으면 조회는 미러(메모리)에서 처리
     """
-    def __init__(self, base_url: str | None = None):
+    def __init__(self, base_url: str | None = None, use_mirror: bool = True):
         self.base_url = (base_url or settings.MAPPING_BASE_URL).rstrip("/")
+        self.mirror: Optional[MappingMirror] = get_mirror() if use_mirror and base_url is None else None
 
     def _http(self) -> httpx.Client:
         cli = CURRENT_HTTPX_CLIENT.get()
-        return cli if cli is not None else httpx.Client(timeout=30.0)
+        return cli if cli is not None else get_http_client(self.base_url)
 
     def _safe_code(self, framework: str) -> str:
         return quote(framework.strip(), safe="")
 
+    def fetch_conditional(self, path: str, etag: str | None = None, last_modified: str | None = None) -> FetchResult:
+        """
+        조건부 GET(If-None-Match / If-Modified-Since). 미러 동기화용.
+        반환: (status_code, json or None, ETag, Last-Modified)
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        r = self._http().get(f"{self.base_url}{path}", headers=headers)
+        if r.status_code == 304:
+            return 304, None, etag, last_modified
+        r.raise_for_status()
+        return r.status_code, r.json(), r.headers.get("ETag"), r.headers.get("Last-Modified")
+
+    def _mirror_ready(self, framework: str) -> bool:
+        # 처음 보는 프레임워크는 한 번 동기화(요건 목록 + 전체 매핑)해서 미러에 적재
+        if self.mirror is None:
+            return False
+        if self.mirror.has_framework(framework):
+            return True
+        try:
+            self.mirror.sync_framework(framework)
+        except Exception:
+            return False
+        return self.mirror.has_framework(framework)
+
     def get_requirements(self, framework: str) -> List[RequirementRowOut]:
+        if self._mirror_ready(framework.strip()):
+            rows = self.mirror.get_requirements(framework.strip())
+            if rows is not None:
+                return rows
+
         code = self._safe_code(framework)
         url = f"{self.base_url}/compliance/{code}/requirements"
-        h = self._http()
-        close_needed = (h is not CURRENT_HTTPX_CLIENT.get())
-        try:
-            r = h.get(url, timeout=30.0)
-            r.raise_for_status()
-            data = r.json()
-            return [RequirementRowOut(**x) for x in data]
-        finally:
-            if close_needed:
-                try: h.close()
-                except Exception: pass
+        r = self._http().get(url)
+        r.raise_for_status()
+        data = r.json()
+        return [RequirementRowOut(**x) for x in data]
 
     def get_requirement_mappings(self, framework: str, req_id: int) -> RequirementDetailOut:
+        if self._mirror_ready(framework.strip()):
+            detail = self.mirror.get_requirement_mappings(framework.strip(), req_id)
+            if detail is not None:
+                return detail
+
         code = self._safe_code(framework)
         url = f"{self.base_url}/compliance/{code}/requirements/{req_id}/mappings"
-        h = self._http()
-        close_needed = (h is not CURRENT_HTTPX_CLIENT.get())
-        try:
-            r = h.get(url, timeout=30.0)
-            r.raise_for_status()
-            return RequirementDetailOut(**r.json())
-        finally:
-            if close_needed:
-                try: h.close()
-                except Exception: pass
+        r = self._http().get(url)
+        r.raise_for_status()
+        return RequirementDetailOut(**r.json())
+
+    # ---- 일괄 프리페치(비동기) ----------------------------------------------
+    def prefetch_requirement_mappings(self, framework: str) -> Dict[int, RequirementDetailOut]:
+        """
+        프레임워크의 요건 → 매핑 그래프 전체를 실행 전에 확보.
+        - 미러가 있으면 메모리에서 바로 구성
+        - 없으면 비동기로 상세 문서를 동시 요청(동시성 상한 + 재시도/백오프)
+        반환: {requirement_id: RequirementDetailOut} (요건 목록 순서 유지)
+        """
+        fw = framework.strip()
+        with tracing.span("mapping.prefetch", framework=fw) as s:
+            if self._mirror_ready(fw):
+                rows = self.mirror.get_requirements(fw) or []
+                graph: Dict[int, RequirementDetailOut] = {}
+                for r in rows:
+                    graph[r.id] = self.get_requirement_mappings(fw, r.id)
+                if s is not None:
+                    s.set("mapping.source", "mirror")
+                    s.set("mapping.requirements", len(graph))
+                return graph
+            graph = _run_coro(self.aprefetch_requirement_mappings(fw))
+            if s is not None:
+                s.set("mapping.source", "api")
+                s.set("mapping.requirements", len(graph))
+            return graph
+
+    async def aprefetch_requirement_mappings(self, framework: str) -> Dict[int, RequirementDetailOut]:
+        code = self._safe_code(framework)
+        concurrency = max(1, int(settings.MAPPING_PREFETCH_CONCURRENCY))
+        http2 = bool(settings.MAPPING_HTTP2 and _HTTP2_AVAILABLE)
+        # HTTP/2면 연결 하나에 다중화, 아니면 동시성만큼 keep-alive 연결 사용
+        limits = httpx.Limits(
+            max_connections=1 if http2 else concurrency,
+            max_keepalive_connections=1 if http2 else concurrency,
+        )
+        transport = snapshot.async_http_transport(limits, http2)
+        if snapshot.mode() != "replay":
+            transport = AsyncBreakerTransport(
+                get_breaker(self.base_url), transport or httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+            )
+        if tracing.enabled():
+            transport = tracing.AsyncTracingTransport(transport or httpx.AsyncHTTPTransport(limits=limits, http2=http2))
+        async with httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=float(settings.HTTP_TIMEOUT_SECONDS),
+            limits=limits,
+            http2=http2,
+            transport=transport,
+        ) as c:
+            rows = [RequirementRowOut(**x) for x in await self._aget_json(c, f"/compliance/{code}/requirements")]
+            sem = asyncio.Semaphore(concurrency)
+
+            async def one(req_id: int) -> RequirementDetailOut:
+                async with sem:
+                    data = await self._aget_json(c, f"/compliance/{code}/requirements/{req_id}/mappings")
+                    return RequirementDetailOut(**data)
+
+            details = await asyncio.gather(*(one(r.id) for r in rows))
+        return {r.id: d for r, d in zip(rows, details)}
+
+    async def _aget_json(self, c: httpx.AsyncClient, path: str) -> Any:
+        retries = max(0, int(settings.MAPPING_PREFETCH_RETRIES))
+        base = float(settings.MAPPING_PREFETCH_BACKOFF_SECONDS)
+        attempt = 0
+        while True:
+            try:
+                r = await c.get(path)
+                if r.status_code in _RETRY_STATUS and attempt < retries:
+                    raise httpx.HTTPStatusError("retryable status", request=r.request, response=r)
+                r.raise_for_status()
+                return r.json()
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                # 서킷이 열려 있으면 재시도하지 않음
+                retryable = (isinstance(e, httpx.TransportError) and not isinstance(e, UpstreamUnavailable)) or (
+                    e.response is not None and e.response.status_code in _RETRY_STATUS
+                )
+                if not retryable or attempt >= retries:
+                    raise
+                # 지수 백오프 + 지터
+                await asyncio.sleep(base * (2 ** attempt) * (0.5 + random.random()))
+                attempt += 1
+
+
+def _run_coro(coro):
+    # 동기 코드에서 코루틴 실행. 이미 이벤트 루프가 도는 스레드(async 라우터)라면 별도 스레드에서 실행
+    # (현재 컨텍스트를 복사해 넘김 → 세션/추적 스팬 contextvar 유지)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        return ex.submit(contextvars.copy_context().run, asyncio.run, coro).result()
+
+
+# ── 프로세스 전역 미러 ─────────────────────────────────────────────────────
+_MIRROR: Optional[MappingMirror] = None
+_MIRROR_LOCK = threading.Lock()
+
+def get_mirror() -> Optional[MappingMirror]:
+    global _MIRROR
+    if not settings.MAPPING_MIRROR_ENABLED:
+        return None
+    with _MIRROR_LOCK:
+        if _MIRROR is None:
+            fetcher = MappingClient(use_mirror=False).fetch_conditional
+            _MIRROR = MappingMirror(
+                settings.MAPPING_MIRROR_PATH,
+                fetcher,
+                refresh_seconds=settings.MAPPING_MIRROR_REFRESH_SECONDS,
+                concurrency=settings.MAPPING_PREFETCH_CONCURRENCY,
+            )
+        return _MIRROR
+
+def start_mirror():
+    m = get_mirror()
+    if m is not None:
+        seed = [x.strip() for x in settings.MAPPING_MIRROR_FRAMEWORKS.split(",") if x.strip()]
+        m.start(seed + [fw for fw in m.frameworks() if fw not in seed])
+
+def stop_mirror():
+    global _MIRROR
+    with _MIRROR_LOCK:
+        m, _MIRROR = _MIRROR, None
+    if m is not None:
+        m.stop()
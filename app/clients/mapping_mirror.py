@@ -0,0 +1,305 @@
+# app/clients/mapping_mirror.py
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from app.core import metrics
+from app.models.schemas import RequirementRowOut, RequirementDetailOut
+
+# Mapping API 로컬 미러
+# - frameworks / requirements / mappings 를 SQLite에 영속화
+# - 기동 시 SQLite → 메모리로 적재, 감사 중 조회는 전부 메모리에서 처리
+# - 갱신은 ETag(If-None-Match) / Last-Modified(If-Modified-Since) 조건부 요청으로 백그라운드 수행
+
+# (status_code, json body or None, etag, last_modified)
+FetchResult = Tuple[int, Any, Optional[str], Optional[str]]
+Fetcher = Callable[[str, Optional[str], Optional[str]], FetchResult]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS frameworks(
+    code TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    synced_at REAL
+);
+CREATE TABLE IF NOT EXISTS requirements(
+    framework TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    pos INTEGER NOT NULL,
+    doc TEXT NOT NULL,
+    PRIMARY KEY(framework, id)
+);
+CREATE TABLE IF NOT EXISTS mappings(
+    framework TEXT NOT NULL,
+    req_id INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    doc TEXT NOT NULL,
+    PRIMARY KEY(framework, req_id)
+);
+"""
+
+
+class MappingMirror:
+    """
+    프레임워크 단위 동기화:
+      1) GET /compliance/{fw}/requirements (조건부) → 304면 목록 유지
+      2) 각 요건의 GET .../requirements/{id}/mappings (조건부, 동시 concurrency개) → 변경분만 교체
+         요건 하나의 조회 실패는 그 요건만 건너뜀(기존 행 유지, 다음 동기화에서 재시도)
+      3) SQLite 트랜잭션으로 저장 후 메모리 스냅샷 교체
+    """
+
+    def __init__(self, path: str, fetcher: Fetcher, refresh_seconds: int = 300, concurrency: int = 1):
+        self.path = path
+        self.fetcher = fetcher
+        self.refresh_seconds = max(0, int(refresh_seconds))
+        self.concurrency = max(1, int(concurrency))
+
+        self._lock = threading.RLock()
+        self._db_lock = threading.Lock()
+        self._fw_meta: Dict[str, Dict[str, Any]] = {}
+        self._requirements: Dict[str, List[RequirementRowOut]] = {}
+        self._details: Dict[Tuple[str, int], RequirementDetailOut] = {}
+        self._detail_meta: Dict[Tuple[str, int], Tuple[Optional[str], Optional[str]]] = {}
+
+        self._syncing: set[str] = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._conn = self._connect()
+        self._load()
+
+    # ---- SQLite ---------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _load(self):
+        with self._db_lock:
+            fws = self._conn.execute("SELECT code, etag, last_modified, synced_at FROM frameworks").fetchall()
+            reqs = self._conn.execute("SELECT framework, doc FROM requirements ORDER BY framework, pos").fetchall()
+            maps = self._conn.execute("SELECT framework, req_id, etag, last_modified, doc FROM mappings").fetchall()
+
+        with self._lock:
+            for code, etag, lm, synced in fws:
+                self._fw_meta[code] = {"etag": etag, "last_modified": lm, "synced_at": synced or 0.0}
+                self._requirements.setdefault(code, [])
+            for fw, doc in reqs:
+                self._requirements.setdefault(fw, []).append(RequirementRowOut(**json.loads(doc)))
+            for fw, rid, etag, lm, doc in maps:
+                self._details[(fw, rid)] = RequirementDetailOut(**json.loads(doc))
+                self._detail_meta[(fw, rid)] = (etag, lm)
+
+    def _save_framework(
+        self,
+        fw: str,
+        meta: Dict[str, Any],
+        rows: Optional[List[Dict[str, Any]]],
+        details: Dict[int, Tuple[Dict[str, Any], Optional[str], Optional[str]]],
+    ):
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO frameworks(code, etag, last_modified, synced_at) VALUES (?,?,?,?)",
+                (fw, meta.get("etag"), meta.get("last_modified"), meta.get("synced_at")),
+            )
+            if rows is not None:
+                self._conn.execute("DELETE FROM requirements WHERE framework=?", (fw,))
+                self._conn.executemany(
+                    "INSERT INTO requirements(framework, id, pos, doc) VALUES (?,?,?,?)",
+                    [(fw, int(r["id"]), i, json.dumps(r, ensure_ascii=False)) for i, r in enumerate(rows)],
+                )
+                ids = [int(r["id"]) for r in rows]
+                self._conn.execute(
+                    f"DELETE FROM mappings WHERE framework=? AND req_id NOT IN ({','.join('?' * len(ids)) or 'NULL'})",
+                    (fw, *ids),
+                )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO mappings(framework, req_id, etag, last_modified, doc) VALUES (?,?,?,?,?)",
+                [
+                    (fw, rid, etag, lm, json.dumps(doc, ensure_ascii=False))
+                    for rid, (doc, etag, lm) in details.items()
+                ],
+            )
+
+    # ---- 조회(메모리) ----------------------------------------------------
+    def has_framework(self, framework: str) -> bool:
+        with self._lock:
+            return framework in self._fw_meta
+
+    def get_requirements(self, framework: str) -> Optional[List[RequirementRowOut]]:
+        with self._lock:
+            if framework not in self._fw_meta:
+                return None
+            rows = list(self._requirements.get(framework, []))
+        self._maybe_refresh(framework)
+        return rows
+
+    def get_requirement_mappings(self, framework: str, req_id: int) -> Optional[RequirementDetailOut]:
+        with self._lock:
+            d = self._details.get((framework, int(req_id)))
+        if d is not None:
+            self._maybe_refresh(framework)
+        return d
+
+    def frameworks(self) -> List[str]:
+        with self._lock:
+            return sorted(self._fw_meta.keys())
+
+    # ---- 동기화 ----------------------------------------------------------
+    def _maybe_refresh(self, framework: str):
+        # stale-while-revalidate: 오래된 미러는 그대로 응답하고 백그라운드에서 갱신
+        if self.refresh_seconds == 0:
+            return
+        with self._lock:
+            synced = self._fw_meta.get(framework, {}).get("synced_at") or 0.0
+            if time.time() - synced < self.refresh_seconds:
+                return
+            metrics.CACHE_STALE.inc(cache="mapping_mirror")
+            if framework in self._syncing:
+                return
+            self._syncing.add(framework)
+        threading.Thread(target=self._run_claimed, args=(framework, True), daemon=True).start()
+
+    def _safe_sync(self, framework: str):
+        try:
+            self.sync_framework(framework)
+        except Exception:
+            pass
+
+    def sync_framework(self, framework: str) -> bool:
+        """
+        프레임워크 하나를 조건부로 동기화. 변경이 있었으면 True.
+        이미 다른 스레드가 동기화 중이면 False.
+        """
+        with self._lock:
+            if framework in self._syncing:
+                return False
+            self._syncing.add(framework)
+        return self._run_claimed(framework, False)
+
+    def _run_claimed(self, framework: str, swallow: bool) -> bool:
+        try:
+            with self._lock:
+                meta = dict(self._fw_meta.get(framework) or {})
+                detail_meta = {rid: m for (fw, rid), m in self._detail_meta.items() if fw == framework}
+            return self._sync(framework, meta, detail_meta)
+        except Exception:
+            if not swallow:
+                raise
+            return False
+        finally:
+            with self._lock:
+                self._syncing.discard(framework)
+
+    def _sync(self, framework: str, meta: Dict[str, Any], detail_meta: Dict[int, Tuple[Optional[str], Optional[str]]]) -> bool:
+        code = quote(framework.strip(), safe="")
+        status, body, etag, lm = self.fetcher(
+            f"/compliance/{code}/requirements", meta.get("etag"), meta.get("last_modified")
+        )
+
+        rows: Optional[List[Dict[str, Any]]]
+        if status == 304:
+            rows = None
+            with self._lock:
+                ids = [r.id for r in self._requirements.get(framework, [])]
+        else:
+            rows = list(body or [])
+            ids = [int(r["id"]) for r in rows]
+            meta["etag"], meta["last_modified"] = etag, lm
+
+        def fetch(rid: int) -> Optional[FetchResult]:
+            d_etag, d_lm = detail_meta.get(rid, (None, None))
+            try:
+                return self.fetcher(f"/compliance/{code}/requirements/{rid}/mappings", d_etag, d_lm)
+            except Exception:
+                # 404/5xx/타임아웃: 이 요건만 건너뜀 → 기존 행 유지, 다음 동기화에서 재시도
+                return None
+
+        details: Dict[int, Tuple[Dict[str, Any], Optional[str], Optional[str]]] = {}
+        failed: List[int] = []
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, max(1, len(ids)))) as ex:
+            for rid, fetched in zip(ids, ex.map(fetch, ids)):
+                if fetched is None:
+                    failed.append(rid)
+                    continue
+                d_status, d_body, n_etag, n_lm = fetched
+                if d_status == 304:
+                    continue
+                details[rid] = (d_body, n_etag, n_lm)
+
+        meta["synced_at"] = time.time()
+        meta["failed"] = failed
+        self._save_framework(framework, meta, rows, details)
+
+        with self._lock:
+            self._fw_meta[framework] = meta
+            if rows is not None:
+                self._requirements[framework] = [RequirementRowOut(**r) for r in rows]
+                keep = set(ids)
+                for key in [k for k in self._details if k[0] == framework and k[1] not in keep]:
+                    self._details.pop(key, None)
+                    self._detail_meta.pop(key, None)
+            for rid, (doc, d_etag, d_lm) in details.items():
+                self._details[(framework, rid)] = RequirementDetailOut(**doc)
+                self._detail_meta[(framework, rid)] = (d_etag, d_lm)
+
+        return rows is not None or bool(details)
+
+    # ---- 백그라운드 갱신 루프 ---------------------------------------------
+    def start(self, frameworks: List[str] | None = None):
+        if self._thread is not None or self.refresh_seconds == 0:
+            return
+        seed = list(frameworks or [])
+
+        def loop():
+            for fw in seed:
+                if self._stop.is_set():
+                    return
+                self._safe_sync(fw)
+            while not self._stop.wait(self.refresh_seconds):
+                for fw in self.frameworks():
+                    if self._stop.is_set():
+                        return
+                    self._safe_sync(fw)
+
+        self._thread = threading.Thread(target=loop, name="mapping-mirror", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        t, self._thread = self._thread, None
+        if t is not None:
+            t.join(timeout=5)
+        with self._db_lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "frameworks": {
+                    fw: {
+                        "requirements": len(self._requirements.get(fw, [])),
+                        "synced_at": m.get("synced_at"),
+                        "etag": m.get("etag"),
+                        "failedRequirements": m.get("failed") or [],
+                    }
+                    for fw, m in self._fw_meta.items()
+                },
+                "details": len(self._details),
+                "path": self.path,
+            }
@@ -0,0 +1,186 @@
+# app/clients/upstream_health.py
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+
+# 업스트림(Collector/Mapping) 상태 추적 + 서킷 브레이커
+# - closed   : 정상. 연속 실패가 임계치에 도달하면 open
+# - open     : 호출하지 않고 즉시 UpstreamUnavailable → 호출자는 바로 폴백 경로로
+# - half-open: open 유지 시간이 지나면 요청 1건만 통과시켜 탐침. 성공 → closed, 실패 → open(대기시간 2배, 상한 있음)
+# httpx 전송 계층을 감싸므로 CollectorClient/MappingClient 코드는 그대로 둔다.
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+
+class UpstreamUnavailable(httpx.TransportError):
+    """서킷이 열려 있어 호출하지 않음(빠른 실패)"""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, *, failure_threshold: int, open_seconds: float, max_open_seconds: float):
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.base_open_seconds = max(0.1, float(open_seconds))
+        self.max_open_seconds = max(self.base_open_seconds, float(max_open_seconds))
+
+        self.state = CLOSED
+        self.failures = 0
+        self.open_seconds = self.base_open_seconds
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.probe_started_at = 0.0
+        self.last_error: Optional[str] = None
+        self.last_success_at: Optional[float] = None
+        self.last_failure_at: Optional[float] = None
+        self.fast_failed = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.time() - self.opened_at >= self.open_seconds:
+                self.state = HALF_OPEN
+                self.probe_in_flight = False
+            # 탐침이 결과를 남기지 못하고 open 유지 시간 넘게 걸려 있으면 만료로 보고 새 탐침 허용
+            if self.state == HALF_OPEN and self.probe_in_flight and time.time() - self.probe_started_at >= self.open_seconds:
+                self.probe_in_flight = False
+            if self.state == HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                self.probe_started_at = time.time()
+                return True
+            self.fast_failed += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.open_seconds = self.base_open_seconds
+            self.probe_in_flight = False
+            self.last_success_at = time.time()
+
+    def release_probe(self):
+        """탐침이 성공/실패 판정 없이 끝남(취소 등) → half-open 유지, 다음 요청이 다시 탐침"""
+        with self._lock:
+            self.probe_in_flight = False
+
+    def record_failure(self, error: str):
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            self.last_failure_at = time.time()
+            if self.state == HALF_OPEN:
+                # 탐침 실패 → 더 오래 연다
+                self.open_seconds = min(self.open_seconds * 2, self.max_open_seconds)
+                self._open()
+            elif self.state == CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.time()
+        self.probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = {
+                "state": self.state,
+                "consecutiveFailures": self.failures,
+                "fastFailed": self.fast_failed,
+                "lastError": self.last_error,
+                "lastSuccessAt": self.last_success_at,
+                "lastFailureAt": self.last_failure_at,
+            }
+            if self.state == OPEN:
+                out["retryInSeconds"] = max(0.0, round(self.open_seconds - (time.time() - self.opened_at), 1))
+            return out
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_LOCK = threading.Lock()
+
+
+def get_breaker(base_url: str) -> CircuitBreaker:
+    key = base_url.rstrip("/")
+    with _LOCK:
+        b = _BREAKERS.get(key)
+        if b is None:
+            b = CircuitBreaker(
+                key,
+                failure_threshold=settings.UPSTREAM_FAILURE_THRESHOLD,
+                open_seconds=settings.UPSTREAM_OPEN_SECONDS,
+                max_open_seconds=settings.UPSTREAM_MAX_OPEN_SECONDS,
+            )
+            _BREAKERS[key] = b
+        return b
+
+
+def upstream_status() -> Dict[str, Any]:
+    with _LOCK:
+        items = list(_BREAKERS.items())
+    return {k: b.snapshot() for k, b in items}
+
+
+def _is_failure_status(code: int) -> bool:
+    return code >= 500
+
+
+class BreakerTransport(httpx.BaseTransport):
+    def __init__(self, breaker: CircuitBreaker, inner: httpx.BaseTransport):
+        self.breaker = breaker
+        self.inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.breaker.allow():
+            raise UpstreamUnavailable(f"circuit open: {self.breaker.name}", request=request)
+        try:
+            response = self.inner.handle_request(request)
+        except httpx.TransportError as e:
+            self.breaker.record_failure(f"{type(e).__name__}: {e}")
+            raise
+        except BaseException:
+            # 취소/인터럽트 등: 실패로 세지는 않지만 탐침 표시는 풀어야 영구 빠른 실패가 되지 않음
+            self.breaker.release_probe()
+            raise
+        if _is_failure_status(response.status_code):
+            self.breaker.record_failure(f"HTTP {response.status_code}")
+        else:
+            self.breaker.record_success()
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+class AsyncBreakerTransport(httpx.AsyncBaseTransport):
+    def __init__(self, breaker: CircuitBreaker, inner: httpx.AsyncBaseTransport):
+        self.breaker = breaker
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.breaker.allow():
+            raise UpstreamUnavailable(f"circuit open: {self.breaker.name}", request=request)
+        try:
+            response = await self.inner.handle_async_request(request)
+        except httpx.TransportError as e:
+            self.breaker.record_failure(f"{type(e).__name__}: {e}")
+            raise
+        except BaseException:
+            # 취소/인터럽트 등: 실패로 세지는 않지만 탐침 표시는 풀어야 영구 빠른 실패가 되지 않음
+            self.breaker.release_probe()
+            raise
+        if _is_failure_status(response.status_code):
+            self.breaker.record_failure(f"HTTP {response.status_code}")
+        else:
+            self.breaker.record_success()
+        return response
+
+    async def aclose(self):
+        await self.inner.aclose()
@@ -2,12 +2,16 @@
 from __future__ import annotations
 import boto3
 from app.core.config import settings
-from app.core.session import CURRENT_BOTO3_SESSION
+from app.core.session import CURRENT_AUDIT_SESSION, CURRENT_BOTO3_SESSION
 
 def _active_session():
     return CURRENT_BOTO3_SESSION.get()
 
 def client(service: str):
+    audit = CURRENT_AUDIT_SESSION.get()
+    if audit is not None:
+        # 세션의 서비스별 클라이언트 캐시 재사용
+        return audit.client(service)
     s = _active_session()
     if s is not None:
         return s.client(service)
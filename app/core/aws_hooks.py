@@ -0,0 +1,101 @@
+# app/core/aws_hooks.py
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Tuple
+
+import boto3
+
+# botocore 이벤트 훅 공용 설치기
+# - executor 코드를 건드리지 않고 모든 AWS API 호출에 공통 동작(기록/재생, 계측 등)을 끼워 넣는다
+# - 훅은 "세션" 단위로 등록되며, 클라이언트는 생성 시점의 이벤트 핸들러를 복사해 가므로
+#   install()은 클라이언트를 만들기 전에 호출해야 한다
+#   (boto3 기본 세션: 앱 기동 시 install_default(), AuditSession: 생성자에서 install())
+
+_HOOKS: List[Tuple[str, Callable, str]] = []  # (event_name, handler, unique_id)
+_CONFIG: Dict[str, Any] = {}  # 세션 설정 변수(retry_mode, max_attempts 등)
+_SESSIONS: "weakref.WeakSet" = weakref.WeakSet()  # 훅이 설치된 botocore 세션
+_LOCK = threading.Lock()
+_CLIENT_LOCK = threading.RLock()  # 기본 세션 클라이언트 생성 직렬화
+
+
+def register_hook(event_name: str, handler: Callable, unique_id: str):
+    """
+    이미 설치된 세션과 이후 설치될 세션 모두에 핸들러를 등록.
+    event_name은 계층형(예: "before-call" → 모든 서비스/오퍼레이션).
+    """
+    with _LOCK:
+        if any(u == unique_id for _, _, u in _HOOKS):
+            return
+        _HOOKS.append((event_name, handler, unique_id))
+        sessions = list(_SESSIONS)
+    for bs in sessions:
+        bs.register(event_name, handler, unique_id=unique_id)
+
+
+def unregister_hook(unique_id: str):
+    with _LOCK:
+        found = [h for h in _HOOKS if h[2] == unique_id]
+        _HOOKS[:] = [h for h in _HOOKS if h[2] != unique_id]
+        sessions = list(_SESSIONS)
+    for event_name, handler, uid in found:
+        for bs in sessions:
+            bs.unregister(event_name, handler, unique_id=uid)
+
+
+def set_session_config(name: str, value: Any):
+    """훅 설치 세션에 botocore 설정 변수 적용(이후 생성되는 클라이언트부터 반영)"""
+    with _LOCK:
+        _CONFIG[name] = value
+        sessions = list(_SESSIONS)
+    for bs in sessions:
+        bs.set_config_variable(name, value)
+
+
+def install(boto3_session: boto3.session.Session):
+    bs = boto3_session._session  # botocore.session.Session
+    with _LOCK:
+        if bs in _SESSIONS:
+            return
+        _SESSIONS.add(bs)
+        hooks = list(_HOOKS)
+        config = dict(_CONFIG)
+    for name, value in config.items():
+        bs.set_config_variable(name, value)
+    for event_name, handler, uid in hooks:
+        bs.register(event_name, handler, unique_id=uid)
+
+
+def _serialize_clients(boto3_session: boto3.session.Session):
+    """
+    세션의 client()/resource()를 잠금으로 직렬화.
+    boto3 세션은 스레드 안전하지 않은데 executor는 boto3.client(...)로 기본 세션을 공유하므로
+    스케줄러 워커 여러 개가 동시에 클라이언트를 만들 때 필요. 만든 클라이언트의 API 호출은 잠그지 않음
+    """
+    if getattr(boto3_session, "_client_lock_installed", False):
+        return
+    create_client, create_resource = boto3_session.client, boto3_session.resource
+
+    def client(*args, **kwargs):
+        with _CLIENT_LOCK:
+            return create_client(*args, **kwargs)
+
+    def resource(*args, **kwargs):
+        with _CLIENT_LOCK:
+            return create_resource(*args, **kwargs)
+
+    boto3_session.client = client
+    boto3_session.resource = resource
+    boto3_session._client_lock_installed = True
+
+
+def install_default() -> boto3.session.Session:
+    """boto3.client(...)가 쓰는 기본 세션에 훅 설치 + 클라이언트 생성 직렬화"""
+    with _CLIENT_LOCK:
+        if boto3.DEFAULT_SESSION is None:
+            boto3.setup_default_session()
+        session = boto3.DEFAULT_SESSION
+    install(session)
+    _serialize_clients(session)
+    return session
@@ -0,0 +1,152 @@
+# app/core/budget.py
+from __future__ import annotations
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from botocore.exceptions import ClientError
+
+from app.core.config import settings
+from app.core.aws_hooks import register_hook
+
+# 감사 실행 예산(마감 시간 / executor 타임아웃 / executor별 AWS 호출 상한)
+# - AuditService가 executor 실행 동안 CURRENT_BUDGET을 지정, before-call 훅이 호출 직전에 검사
+# - 예산을 넘으면 이후 호출은 네트워크 없이 즉시 BudgetExceeded(ClientError 하위 클래스)로 실패
+#   → executor 대부분이 ClientError를 리소스 단위로 잡으므로 남은 루프는 빠르게 끝나고 그때까지의 평가는 남음
+#   → 예산 초과로 생긴 평가(오류 문자열에 MARKER 포함)는 AuditService가 걸러 내고 결과에 truncated 표시
+# - 사실 캐시/스냅샷 재생 적중은 before-call에서 먼저 응답하므로 호출 수에 포함되지 않음
+# - 설정이 모두 0이면 훅/컨텍스트 모두 쓰지 않음
+
+MARKER = "AuditBudgetExceeded"
+
+CURRENT_BUDGET: contextvars.ContextVar[Optional["ExecutorBudget"]] = contextvars.ContextVar(
+    "CURRENT_BUDGET", default=None
+)
+
+
+class BudgetExceeded(ClientError):
+    def __init__(self, reason: str, operation_name: str, message: str):
+        super().__init__({"Error": {"Code": MARKER, "Message": message}}, operation_name)
+        self.reason = reason
+
+
+class ExecutorBudget:
+    __slots__ = ("code", "started", "deadline", "deadline_reason", "max_calls", "calls", "blocked", "tripped")
+
+    def __init__(self, code: str, run_deadline: Optional[float] = None):
+        self.code = code
+        self.started = time.monotonic()
+        self.deadline = run_deadline
+        self.deadline_reason = "deadline"
+        timeout = float(settings.EXECUTOR_TIMEOUT_SECONDS)
+        if timeout > 0 and (self.deadline is None or self.started + timeout < self.deadline):
+            self.deadline = self.started + timeout
+            self.deadline_reason = "timeout"
+        self.max_calls = int(settings.EXECUTOR_MAX_AWS_CALLS)
+        self.calls = 0  # 허용한 호출 수
+        self.blocked = 0  # 예산 초과로 막은 호출 수
+        self.tripped: Optional[str] = None  # deadline / timeout / max_calls
+
+    def check(self, operation_name: str):
+        if self.tripped is None:
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                self.tripped = self.deadline_reason
+            elif self.max_calls > 0 and self.calls >= self.max_calls:
+                self.tripped = "max_calls"
+            else:
+                self.calls += 1
+                return
+        self.blocked += 1
+        raise BudgetExceeded(
+            self.tripped, operation_name,
+            f"audit budget exceeded ({self.tripped}) for {self.code} after {self.calls} calls",
+        )
+
+    def limit(self) -> Any:
+        if self.tripped == "max_calls":
+            return self.max_calls
+        if self.tripped == "timeout":
+            return float(settings.EXECUTOR_TIMEOUT_SECONDS)
+        return float(settings.AUDIT_RUN_DEADLINE_SECONDS)
+
+    def summary(self, dropped: int = 0) -> Dict[str, Any]:
+        return {
+            "reason": self.tripped,
+            "limit": self.limit(),
+            "started": True,
+            "awsCalls": self.calls,
+            "blockedCalls": self.blocked,
+            "droppedEvaluations": dropped,
+            "elapsedSeconds": round(time.monotonic() - self.started, 3),
+        }
+
+
+def enabled() -> bool:
+    return (
+        float(settings.AUDIT_RUN_DEADLINE_SECONDS) > 0
+        or float(settings.EXECUTOR_TIMEOUT_SECONDS) > 0
+        or int(settings.EXECUTOR_MAX_AWS_CALLS) > 0
+    )
+
+
+def run_deadline() -> Optional[float]:
+    """감사 1회(요청)의 마감 시각(time.monotonic 기준). AUDIT_RUN_DEADLINE_SECONDS가 0이면 None"""
+    seconds = float(settings.AUDIT_RUN_DEADLINE_SECONDS)
+    return time.monotonic() + seconds if seconds > 0 else None
+
+
+def expired(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
+
+
+@contextmanager
+def limit(code: str, deadline: Optional[float] = None) -> Iterator[ExecutorBudget]:
+    """블록 안의 AWS 호출에 executor 예산 적용"""
+    b = ExecutorBudget(code, deadline)
+    token = CURRENT_BUDGET.set(b)
+    try:
+        yield b
+    finally:
+        CURRENT_BUDGET.reset(token)
+
+
+def marked(*values: Any) -> bool:
+    """평가 필드(extra/decision 등)에 예산 초과 오류가 남아 있는지"""
+    return any(v is not None and MARKER in str(v) for v in values)
+
+
+def exceeds(calls: float, seconds: float) -> Optional[str]:
+    """실행 계획용: 예상 호출 수/소요 시간이 executor 예산을 넘으면 사유"""
+    max_calls = int(settings.EXECUTOR_MAX_AWS_CALLS)
+    if max_calls > 0 and calls > max_calls:
+        return "max_calls"
+    timeout = float(settings.EXECUTOR_TIMEOUT_SECONDS)
+    if timeout > 0 and seconds > timeout:
+        return "timeout"
+    return None
+
+
+# ── botocore 훅 ────────────────────────────────────────────────────────────
+def _on_before_call(model, context, **kwargs):
+    b = CURRENT_BUDGET.get()
+    if b is None:
+        return None
+    try:
+        b.check(model.name)
+    except BudgetExceeded as e:
+        # 막힌 호출은 after-call(-error)이 오지 않으므로 이미 연 추적 스팬을 여기서 닫음
+        s = context.pop("trace_span", None)
+        if s is not None:
+            s.record_exception(e)
+            s.end()
+        raise
+    return None
+
+
+def activate():
+    """예산 설정이 하나라도 있으면 훅 등록. 사실 캐시/스냅샷 훅 뒤, 속도 제한 훅 앞에 호출"""
+    if not enabled():
+        return
+    register_hook("before-call", _on_before_call, "budget-check")
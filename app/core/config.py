@@ -36,6 +36,152 @@ class Settings(BaseSettings):
     # 필요시 타임아웃/리트라이 등도 여기서 관리 가능
     HTTP_TIMEOUT_SECONDS: int = 30
 
+    # ---- 리소스 데이터 소스 ----
+    # "collector": Collector 인벤토리 우선(종류별 SDK 폴백), "sdk": 항상 boto3
+    DATA_SOURCE: str = "collector"
+    COLLECTOR_TIMEOUT_SECONDS: float = 10.0
+
+    # ---- 업스트림(Collector/Mapping) 공유 커넥션 풀 ----
+    HTTP_POOL_MAX_CONNECTIONS: int = 20
+    HTTP_POOL_MAX_KEEPALIVE: int = 10
+    HTTP_POOL_KEEPALIVE_EXPIRY: float = 30.0
+
+    # ---- 실행 계측(app.core.instrument) ----
+    # executor별 소요 시간/AWS 오퍼레이션별 호출·재시도·스로틀·수신 바이트 → AuditResult.timing, Server-Timing 헤더
+    INSTRUMENTATION_ENABLED: bool = True
+    # /metrics 이벤트 루프 지연 측정 주기(초, 0이면 끔)
+    METRICS_LOOP_LAG_INTERVAL_SECONDS: float = 0.5
+    # 감사 실행 계획(GET /audit/{framework}/_plan): 호출 지연 관측치가 없을 때 가정할 AWS 호출 1건 지연(ms),
+    # 셀 수 없는 인벤토리에 가정할 리소스 수, 인벤토리 종류별 목록 조회 최대 페이지 수,
+    # 한 실행에서 같은 오퍼레이션을 이 횟수 이상 호출하면 스로틀 위험 medium(관측 스로틀 비율 5% 이상이면 high)
+    PLAN_AWS_CALL_MS: float = 80.0
+    PLAN_DEFAULT_RESOURCES: int = 10
+    PLAN_COUNT_MAX_PAGES: int = 20
+    PLAN_THROTTLE_CALLS: int = 500
+    # ---- 분산 추적(app.core.tracing, OpenTelemetry 데이터 모델) ----
+    # 내보내기: "" (끔) / "jsonl" / "otlp" / 쉼표로 여러 개
+    TRACING_EXPORTER: str = ""
+    TRACING_SERVICE_NAME: str = "dspm-audit"
+    TRACING_JSONL_PATH: str = ".traces/spans.jsonl"
+    # OTLP/HTTP(JSON) 수신 주소, 추가 헤더("k=v,k2=v2"), 전송 타임아웃(초)
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_OTLP_HEADERS: str = ""
+    TRACING_OTLP_TIMEOUT_SECONDS: float = 5.0
+    # 배치 크기 / 최대 대기(초) / 대기열 상한(넘으면 버림)
+    TRACING_BATCH_SIZE: int = 512
+    TRACING_FLUSH_SECONDS: float = 2.0
+    TRACING_MAX_QUEUE: int = 20000
+    # 관리자 토큰(X-Admin-Token 헤더). 비어 있으면 관리자 전용 기능(?profile=1 등) 비활성
+    ADMIN_TOKEN: str = ""
+    # 감사 1회 샘플링 프로파일(app.core.profiler): 저장 디렉터리, 샘플 간격(ms), 스택 최대 깊이, executor별 상위 함수 수
+    PROFILE_DIR: str = ".profiles"
+    PROFILE_INTERVAL_MS: float = 5.0
+    PROFILE_MAX_DEPTH: int = 128
+    PROFILE_TOP_N: int = 15
+
+    # ---- 멀티 워커 공유 저장소(app.utils.shared_backend) ----
+    # auto: REDIS_URL 있으면 redis, WEB_CONCURRENCY>1이면 shm(/dev/shm SQLite), 아니면 memory
+    SHARED_BACKEND: str = "auto"
+    SHARED_SHM_PATH: str = ""
+    # 캐시 값 봉투: 압축 코덱(auto=zstd 설치 시 zstd, 아니면 zlib / zlib / zstd / none),
+    # 인코딩(auto=msgpack 설치 시 msgpack, 아니면 json), 이 크기(바이트) 미만은 압축 안 함
+    CACHE_CODEC: str = "auto"
+    CACHE_ENCODING: str = "auto"
+    CACHE_COMPRESS_MIN_BYTES: int = 1024
+    # 계층 캐시: 응답/매핑 결과 키를 L1(프로세스 메모리) → L2(공유 저장소) → L3(로컬 디스크)로 조회/승격
+    # L1은 공유 저장소 앞에 있을 때 CACHE_L1_TTL_SECONDS로 제한(다른 워커 갱신 반영), L3는 CACHE_DISK_DIR 지정 시에만
+    CACHE_TIER_PREFIXES: str = "RESP:,RESULT:"
+    CACHE_L1_MAX_ITEMS: int = 256
+    CACHE_L1_TTL_SECONDS: float = 30.0
+    CACHE_DISK_DIR: str = ""
+    CACHE_DISK_MAX_MB: int = 512
+    # 같은 감사 요청이 다른 워커에서 실행 중일 때 결과를 기다리는 최대 시간 / 실행 잠금 TTL(초)
+    INFLIGHT_WAIT_SECONDS: float = 300.0
+    INFLIGHT_LOCK_TTL_SECONDS: float = 900.0
+    # 매핑(executor)별 결과 캐시 TTL(초). 같은 매핑이 여러 요건/워커에 나와도 한 번만 실행. 0이면 끔
+    MAPPING_RESULT_TTL_SECONDS: float = 60.0
+    # 매핑 실행 스케줄(app.services.scheduler): registry(등록 순서, 순차) / makespan(긴 것부터) / fast-lane(싼 점검 전용 차선)
+    # 동시 실행 워커 수, fast-lane 차선에 넣을 예상 소요 시간 상한(초), 계정별 소요 시간 EWMA 가중치, 통계 보관 TTL(초)
+    AUDIT_SCHEDULE: str = "registry"
+    AUDIT_CONCURRENCY: int = 4
+    AUDIT_FAST_LANE_MAX_SECONDS: float = 1.0
+    AUDIT_DURATION_EWMA_ALPHA: float = 0.3
+    AUDIT_DURATION_STATS_TTL_SECONDS: float = 604800.0
+    # 감사 실행 예산(app.core.budget, 0이면 끔): 요청 1회 마감 시간(초, 넘으면 남은 executor는 실행하지 않음),
+    # executor 1개 타임아웃(초), executor 1개의 AWS 호출 상한. 넘은 executor는 부분 평가 + truncated로 반환
+    AUDIT_RUN_DEADLINE_SECONDS: float = 0.0
+    EXECUTOR_TIMEOUT_SECONDS: float = 0.0
+    EXECUTOR_MAX_AWS_CALLS: int = 0
+    # 표본 감사(?mode=sample, app.core.sampling): 기본 표본 크기, 기본 seed, 비준수율 신뢰구간 신뢰수준
+    SAMPLE_SIZE: int = 200
+    SAMPLE_SEED: int = 0
+    SAMPLE_CONFIDENCE: float = 0.95
+
+    # ---- 감사 세션(session_id) 관리 ----
+    # 최대 세션 수(초과 시 가장 오래 사용 안 한 세션부터 축출), 만료 세션 정리 주기(초, 0이면 끔)
+    SESSION_MAX_COUNT: int = 64
+    SESSION_REAPER_INTERVAL_SECONDS: float = 30.0
+
+    # ---- 세션 사실 캐시(session_id 요청 간 인벤토리/읽기 전용 API 응답 재사용) ----
+    FACT_CACHE_ENABLED: bool = True
+    FACT_CACHE_TTL_SECONDS: float = 300.0
+    # 유형별 TTL(초). 유형 = boto3 서비스명 또는 "inventory". 예: "inventory=300,iam=900,logs=60"
+    FACT_CACHE_TTLS: str = ""
+    FACT_CACHE_MAX_ENTRIES: int = 5000
+
+    # ---- executor 레지스트리 ----
+    # false: 첫 사용 시 executor 모듈 import(기본), true: 기동 시 전부 import
+    REGISTRY_EAGER_IMPORT: bool = False
+
+    # ---- 기동 warm-up ----
+    # 서비스 클라이언트 생성, 자격 증명/활성 리전 해석, 매핑 메타데이터 적재를 기동 시 병렬로 미리 수행
+    WARMUP_ENABLED: bool = False
+    WARMUP_CONCURRENCY: int = 16
+    # 미리 적재할 프레임워크(쉼표 구분). 비우면 MAPPING_MIRROR_FRAMEWORKS 사용
+    WARMUP_FRAMEWORKS: str = ""
+
+    # ---- AWS API 적응형 속도 제한 (계정/리전/서비스/오퍼레이션별 토큰 버킷) ----
+    AWS_RATE_LIMIT_ENABLED: bool = True
+    AWS_RATE_INITIAL: float = 0.0      # 초당 호출 수 시작값(0이면 첫 스로틀 전까지 제한 없음)
+    AWS_RATE_MIN: float = 0.5
+    AWS_RATE_MAX: float = 0.0          # 이 속도까지 회복하면 다시 제한 없음(0이면 상한 없이 계속 증가)
+    AWS_RATE_INCREASE: float = 0.5     # 성공 1건당 증가량
+    AWS_RATE_DECREASE: float = 0.5     # 스로틀 시 곱하는 비율
+    AWS_MAX_ATTEMPTS: int = 8          # standard 재시도 모드 최대 시도 횟수
+
+    # ---- 업스트림 서킷 브레이커 ----
+    # 연속 실패(전송 오류/5xx) 임계치 도달 시 open → 대기시간 동안 즉시 실패(폴백 경로로)
+    UPSTREAM_FAILURE_THRESHOLD: int = 3
+    # open 유지 시간(초). 이후 요청 1건으로 탐침(half-open), 탐침 실패 시 2배씩 늘려 상한까지
+    UPSTREAM_OPEN_SECONDS: float = 30.0
+    UPSTREAM_MAX_OPEN_SECONDS: float = 300.0
+
+    # ---- Mapping API 로컬 미러 ----
+    # frameworks/requirements/mappings를 SQLite에 보관하고 감사 중에는 메모리에서 조회
+    MAPPING_MIRROR_ENABLED: bool = True
+    MAPPING_MIRROR_PATH: str = ".mirror/mapping.sqlite3"
+    # 백그라운드 조건부 갱신 주기(초). 0이면 백그라운드 갱신 안 함(첫 조회 시 1회 적재만)
+    MAPPING_MIRROR_REFRESH_SECONDS: int = 300
+    # 기동 시 미리 적재할 프레임워크(쉼표 구분). 예: "ISMS-P,GDPR,iso-27001"
+    MAPPING_MIRROR_FRAMEWORKS: str = ""
+
+    # ---- Mapping API 일괄 프리페치(미러가 없을 때) ----
+    MAPPING_PREFETCH_CONCURRENCY: int = 16
+    MAPPING_PREFETCH_RETRIES: int = 3
+    MAPPING_PREFETCH_BACKOFF_SECONDS: float = 0.2
+    # httpx[http2](h2) 설치 시 HTTPS 게이트웨이에 HTTP/2 사용
+    MAPPING_HTTP2: bool = True
+
+    # ---- 스냅샷 기록/재생(오프라인 재현) ----
+    # "record": AWS/Collector/Mapping 응답을 SNAPSHOT_PATH에 기록, "replay": 스냅샷에서만 응답
+    SNAPSHOT_MODE: str = ""
+    SNAPSHOT_PATH: str = "snapshots/audit.snap"
+
+    # ---- 증거(evidence) 저장소 ----
+    # 평가에 포함되는 AWS 원본 문서를 해시 기준으로 한 번만 저장하고 참조만 남긴다
+    EVIDENCE_STORE_ENABLED: bool = True
+    EVIDENCE_STORE_DIR: str = ".evidence"
+
     # ---- pydantic-settings 구성 ----
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,151 @@
+# app/core/fact_cache.py
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.aws_hooks import register_hook
+
+# 세션 단위 리소스 사실(fact) 캐시
+# - 같은 session_id로 요건을 하나씩 감사할 때 list_buckets/describe_trails/get_bucket_* 등을 매번 다시 호출하지 않도록
+#   인벤토리와 리소스별 설정 문서(읽기 전용 API 응답)를 세션에 보관
+# - 유형별 TTL: FACT_CACHE_TTLS="inventory=300,iam=900,s3=300" (키 유형 = 서비스명 또는 "inventory")
+# - 최대 항목 수(FACT_CACHE_MAX_ENTRIES) 초과 시 LRU 축출
+# - refresh=1 요청 시 세션 캐시 전체 무효화
+#
+# botocore 훅(세션이 지정된 요청에서만 동작)
+#   before-parameter-build: 사용자 파라미터로 키 계산
+#   before-call           : 적중 시 네트워크 없이 (http, parsed) 반환
+#   after-call            : 성공한 읽기 전용 호출(Get*/List*/Describe*/Lookup*) 응답 저장
+
+_READ_PREFIXES = ("Get", "List", "Describe", "Lookup")
+_MISS = object()
+
+
+def _parse_ttls(raw: str) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for part in (raw or "").split(","):
+        if "=" in part:
+            k, v = part.split("=", 1)
+            try:
+                out[k.strip()] = float(v)
+            except ValueError:
+                continue
+    return out
+
+
+class FactCache:
+    def __init__(self, max_entries: Optional[int] = None, ttls: Optional[Dict[str, float]] = None):
+        self.max_entries = max(1, int(max_entries or settings.FACT_CACHE_MAX_ENTRIES))
+        self.default_ttl = float(settings.FACT_CACHE_TTL_SECONDS)
+        self.ttls = ttls if ttls is not None else _parse_ttls(settings.FACT_CACHE_TTLS)
+        self._data: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()  # (유형, 키) → (만료 시각, 값)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def ttl_for(self, kind: str) -> float:
+        return self.ttls.get(kind, self.default_ttl)
+
+    def get(self, kind: str, key: str) -> Any:
+        k = (kind, key)
+        with self._lock:
+            item = self._data.get(k)
+            if item is None or item[0] < time.time():
+                if item is not None:
+                    self._data.pop(k, None)
+                self.misses += 1
+                metrics.CACHE_LOOKUPS.inc(cache="fact", result="miss")
+                return _MISS
+            self._data.move_to_end(k)
+            self.hits += 1
+        metrics.CACHE_LOOKUPS.inc(cache="fact", result="hit")
+        return copy.deepcopy(item[1])
+
+    def put(self, kind: str, key: str, value: Any):
+        ttl = self.ttl_for(kind)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[(kind, key)] = (time.time() + ttl, copy.deepcopy(value))
+            self._data.move_to_end((kind, key))
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                metrics.CACHE_EVICTIONS.inc(tier="fact")
+
+    def get_or_load(self, kind: str, key: str, loader: Callable[[], Any]) -> Any:
+        v = self.get(kind, key)
+        if v is not _MISS:
+            return v
+        v = loader()
+        self.put(kind, key, v)
+        return v
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+def current() -> Optional[FactCache]:
+    """현재 요청의 감사 세션 캐시(세션이 없으면 None)"""
+    from app.core.session import CURRENT_AUDIT_SESSION  # 순환 import 방지
+    s = CURRENT_AUDIT_SESSION.get()
+    return getattr(s, "facts", None) if s is not None else None
+
+
+def is_miss(value: Any) -> bool:
+    return value is _MISS
+
+
+# ── botocore 훅 ────────────────────────────────────────────────────────────
+class _RawBody:
+    def stream(self, *args, **kwargs):
+        yield b""
+
+
+def _on_params(params, model, context, **kwargs):
+    if not model.name.startswith(_READ_PREFIXES) or current() is None:
+        return
+    from app.utils.snapshot import aws_key  # 순환 import 방지
+    context["fact_key"] = aws_key(model.service_model.service_name, context.get("client_region"), model.name, params)
+
+
+def _on_before_call(model, params, context, **kwargs):
+    key = context.get("fact_key")
+    cache = current() if key else None
+    if cache is None:
+        return None
+    parsed = cache.get(model.service_model.service_name, key)
+    if parsed is _MISS:
+        return None
+    context["fact_hit"] = True
+    from botocore.awsrequest import AWSResponse
+    return AWSResponse(params.get("url", "fact-cache://"), 200, {}, _RawBody()), parsed
+
+
+def _on_after_call(http_response, parsed, model, context, **kwargs):
+    key = context.get("fact_key")
+    cache = current() if key and not context.get("fact_hit") else None
+    if cache is None or getattr(http_response, "status_code", 500) >= 300:
+        return
+    if isinstance(parsed, dict) and "Error" in parsed:
+        return
+    cache.put(model.service_model.service_name, key, parsed)
+
+
+def activate():
+    """FACT_CACHE_ENABLED면 훅 등록. 속도 제한 훅보다 먼저 등록해야 적중 시 토큰을 쓰지 않음"""
+    if not settings.FACT_CACHE_ENABLED:
+        return
+    register_hook("before-parameter-build", _on_params, "fact-cache-key")
+    register_hook("before-call", _on_before_call, "fact-cache-lookup")
+    register_hook("after-call", _on_after_call, "fact-cache-store")
@@ -0,0 +1,222 @@
+# app/core/instrument.py
+from __future__ import annotations
+
+import contextvars
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.aws_hooks import register_hook
+from app.core.rate_limit import _is_throttle
+
+# executor 실행 단위 성능 계측
+# - botocore 훅으로 AWS API 호출을 관찰하므로 executor 코드는 그대로
+# - 실행 중인 executor의 ExecutorTiming을 contextvar로 지정(measure)하고, 훅이 그 안에 오퍼레이션별로 누적
+#     before-call : 호출 시작 시각(속도 제한 대기 포함)
+#     needs-retry : 시도 수, 시도별 스로틀 여부
+#     after-call  : 소요 시간, 재시도 수, 수신 바이트, 캐시/재생 적중
+#     after-call-error : 연결 오류 등 예외로 끝난 호출
+# - 결과는 AuditResult.timing(선택 필드)과 단건 요건 응답의 Server-Timing 헤더로 노출
+# - 서비스/오퍼레이션별 호출·재시도·스로틀·오류 수와 호출 지연은 executor 밖 호출까지 /metrics(app.core.metrics)에 누적
+#
+# activate()는 다른 before-call 훅(스냅샷 재생, 사실 캐시, 속도 제한)보다 먼저 호출해야
+# 적중으로 네트워크를 건너뛴 호출과 속도 제한 대기 시간도 함께 집계된다
+
+CURRENT_TIMING: contextvars.ContextVar[Optional["ExecutorTiming"]] = contextvars.ContextVar(
+    "CURRENT_TIMING", default=None
+)
+
+
+class ExecutorTiming:
+    def __init__(self, code: str):
+        self.code = code
+        self.started = time.perf_counter()
+        self.wall_ms: Optional[float] = None
+        self.ops: Dict[str, Dict[str, float]] = {}  # "s3.GetBucketPolicy" → 집계
+        self._lock = threading.Lock()
+
+    def _op(self, name: str) -> Dict[str, float]:
+        op = self.ops.get(name)
+        if op is None:
+            op = self.ops[name] = {"calls": 0, "retries": 0, "throttles": 0, "errors": 0, "bytes": 0, "cached": 0, "ms": 0.0}
+        return op
+
+    def record_call(self, name: str, *, ms: float, retries: int, nbytes: int = 0, cached: bool = False, error: bool = False):
+        with self._lock:
+            op = self._op(name)
+            op["calls"] += 1
+            op["errors"] += int(error)
+            op["retries"] += retries
+            op["bytes"] += nbytes
+            op["cached"] += int(cached)
+            op["ms"] += ms
+
+    def record_throttle(self, name: str):
+        with self._lock:
+            self._op(name)["throttles"] += 1
+
+    def finish(self):
+        self.wall_ms = (time.perf_counter() - self.started) * 1000.0
+
+    def summary(self, evaluations: int) -> Dict[str, Any]:
+        with self._lock:
+            ops = {k: {**v, "ms": round(v["ms"], 1)} for k, v in sorted(self.ops.items())}
+        totals = {f: sum(o[f] for o in ops.values()) for f in ("calls", "retries", "throttles", "errors", "bytes", "cached")}
+        return {
+            "wallMs": round(self.wall_ms if self.wall_ms is not None else 0.0, 1),
+            "awsMs": round(float(sum(o["ms"] for o in ops.values())), 1),
+            "awsCalls": int(totals["calls"]),
+            "retries": int(totals["retries"]),
+            "throttles": int(totals["throttles"]),
+            "errors": int(totals["errors"]),
+            "bytes": int(totals["bytes"]),
+            "cachedCalls": int(totals["cached"]),
+            "evaluations": evaluations,
+            "operations": ops,
+        }
+
+
+@contextmanager
+def measure(code: str) -> Iterator[ExecutorTiming]:
+    """executor 1회 실행 계측. 블록 안에서 일어난 AWS 호출이 반환된 ExecutorTiming에 누적"""
+    t = ExecutorTiming(code)
+    token = CURRENT_TIMING.set(t)
+    try:
+        yield t
+    finally:
+        t.finish()
+        CURRENT_TIMING.reset(token)
+
+
+def enabled() -> bool:
+    return bool(settings.INSTRUMENTATION_ENABLED)
+
+
+# ── botocore 훅 ────────────────────────────────────────────────────────────
+def _op_name(model) -> str:
+    return f"{model.service_model.service_name}.{model.name}"
+
+
+def _on_before_call(model, context, **kwargs):
+    context["instr_op"] = _op_name(model)
+    context["instr_t0"] = time.perf_counter()
+    t = CURRENT_TIMING.get()
+    if t is not None:
+        context["instr_timing"] = t
+    return None
+
+
+def _response_bytes(http_response, model) -> int:
+    try:
+        length = http_response.headers.get("content-length")
+        if length is not None:
+            return int(length)
+        # 스트리밍 출력(S3 GetObject 등)은 본문을 읽지 않음
+        if model.has_streaming_output:
+            return 0
+        return len(http_response.content or b"")
+    except Exception:
+        return 0
+
+
+def _on_needs_retry(response=None, caught_exception=None, request_dict=None, operation=None, **kwargs):
+    context = (request_dict or {}).get("context")
+    if context is None or operation is None:
+        return None
+    context["instr_attempts"] = context.get("instr_attempts", 0) + 1
+    if _is_throttle(response, caught_exception):
+        metrics.AWS_THROTTLES.inc(service=operation.service_model.service_name, operation=operation.name)
+        t = context.get("instr_timing")
+        if t is not None:
+            t.record_throttle(_op_name(operation))
+    return None
+
+
+def _retries(context, parsed=None) -> int:
+    meta = (parsed.get("ResponseMetadata") or {}) if isinstance(parsed, dict) else {}
+    return max(int(meta.get("RetryAttempts") or 0), context.get("instr_attempts", 1) - 1)
+
+
+def _count(op: str, retries: int, seconds: float, error: bool = False):
+    service, _, name = op.partition(".")
+    metrics.AWS_CALLS.inc(service=service, operation=name)
+    metrics.AWS_CALL_DURATION.observe(seconds, service=service, operation=name)
+    if retries:
+        metrics.AWS_RETRIES.inc(retries, service=service, operation=name)
+    if error:
+        metrics.AWS_ERRORS.inc(service=service, operation=name)
+
+
+def _on_after_call(http_response, parsed, model, context, **kwargs):
+    t0 = context.get("instr_t0") or time.perf_counter()
+    elapsed = time.perf_counter() - t0
+    retries = _retries(context, parsed)
+    cached = bool(context.get("fact_hit") or context.get("snapshot_hit"))
+    if not cached:
+        _count(_op_name(model), retries, elapsed)
+    # 앞선 before-call 핸들러가 응답을 돌려주면 시작 훅이 생략될 수 있음 → contextvar로 보완
+    t = context.get("instr_timing") or CURRENT_TIMING.get()
+    if t is None:
+        return
+    t.record_call(
+        _op_name(model),
+        ms=elapsed * 1000.0,
+        retries=retries,
+        nbytes=0 if cached else _response_bytes(http_response, model),
+        cached=cached,
+    )
+
+
+def _on_after_call_error(context, exception=None, **kwargs):
+    # 이 이벤트에는 오퍼레이션 모델이 없으므로 before-call에서 남긴 이름 사용
+    op = context.get("instr_op", "unknown.unknown")
+    elapsed = time.perf_counter() - (context.get("instr_t0") or time.perf_counter())
+    retries = _retries(context)
+    _count(op, retries, elapsed, error=True)
+    t = context.get("instr_timing")
+    if t is None:
+        return
+    t.record_call(op, ms=elapsed * 1000.0, retries=retries, error=True)
+
+
+def activate():
+    """INSTRUMENTATION_ENABLED면 훅 등록. 앱 기동 시 다른 before-call 훅보다 먼저 호출"""
+    if not enabled():
+        return
+    register_hook("before-call", _on_before_call, "instrument-start")
+    register_hook("needs-retry", _on_needs_retry, "instrument-retry")
+    register_hook("after-call", _on_after_call, "instrument-end")
+    register_hook("after-call-error", _on_after_call_error, "instrument-error")
+
+
+# ── Server-Timing ──────────────────────────────────────────────────────────
+_TOKEN_RE = re.compile(r"[^A-Za-z0-9_-]")
+
+
+def server_timing(results: Iterable[Any]) -> str:
+    """
+    AuditResult 목록 → Server-Timing 헤더 값
+    예) m-2_0-01;dur=812.4;desc="14 calls, 1 retries", aws;dur=790.2
+    """
+    parts = []
+    aws_ms = 0.0
+    total = 0.0
+    for r in results:
+        timing = getattr(r, "timing", None)
+        if not timing:
+            continue
+        name = "m-" + _TOKEN_RE.sub("_", str(getattr(r, "mapping_code", "")))
+        desc = f'{timing.get("awsCalls", 0)} calls, {timing.get("retries", 0)} retries'
+        if timing.get("cached"):
+            desc = "cached"
+        parts.append(f'{name};dur={timing.get("wallMs", 0)};desc="{desc}"')
+        aws_ms += float(timing.get("awsMs") or 0)
+        total += float(timing.get("wallMs") or 0)
+    if parts:
+        parts.append(f"aws;dur={round(aws_ms, 1)}")
+        parts.append(f"executors;dur={round(total, 1)}")
+    return ", ".join(parts)
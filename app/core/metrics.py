@@ -0,0 +1,283 @@
+# app/core/metrics.py
+from __future__ import annotations
+
+import asyncio
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Prometheus 텍스트 노출 형식(/metrics)용 최소 구현(외부 의존성 없음)
+# - Counter / Gauge / Histogram + 레이블
+# - 스크레이프 시점에 값을 계산하는 수집기(register_collector): 세션 수, 계층 캐시 통계 등
+# - 이벤트 루프 지연 측정(start_loop_monitor): 동기 작업이 루프를 막는 시간
+#
+# 메트릭 이름은 모두 dspm_audit_ 접두사
+# 값은 워커(프로세스)별: WEB_CONCURRENCY>1이면 스크레이프 1회는 요청을 받은 워커 하나의 값이므로
+# 모든 시계열에 worker(pid) 레이블을 붙여 워커별 시계열로 구분(합계는 Prometheus에서 sum without(worker))
+
+_PREFIX = "dspm_audit_"
+_LOCK = threading.Lock()
+_METRICS: List["_Metric"] = []
+_COLLECTORS: List[Callable[[], Iterable["Sample"]]] = []
+
+# (이름, 유형, 설명, [(레이블, 값)])
+Sample = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(labels: Dict[str, str]) -> str:
+    labels = {"worker": os.getpid(), **labels}
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _fmt_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) and not v.is_integer() else str(int(v))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = _PREFIX + name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        with _LOCK:
+            _METRICS.append(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, **labels: Any):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _items(self):
+        with self._lock:
+            return [(dict(zip(self.labelnames, k)), c) for k, c in self._children.items()]
+
+    def _peek(self, labels: Dict[str, Any]):
+        # 조회 전용: 없는 레이블 조합을 만들지 않음
+        return self._children.get(tuple(str(labels.get(n, "")) for n in self.labelnames))
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, n: float = 1.0):
+        with self._lock:
+            self.value += n
+
+    def dec(self, n: float = 1.0):
+        with self._lock:
+            self.value -= n
+
+    def set(self, v: float):
+        with self._lock:
+            self.value = v
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, n: float = 1.0, **labels: Any):
+        self.labels(**labels).inc(n)
+
+    def value(self, **labels: Any) -> float:
+        c = self._peek(labels)
+        return c.value if c is not None else 0.0
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_fmt_labels(l)} {_fmt_value(c.value)}" for l, c in self._items()]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, v: float, **labels: Any):
+        self.labels(**labels).set(v)
+
+    def dec(self, n: float = 1.0, **labels: Any):
+        self.labels(**labels).dec(n)
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 = +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, v: float):
+        i = bisect.bisect_left(self.buckets, v)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += v
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, v: float, **labels: Any):
+        self.labels(**labels).observe(v)
+
+    def mean(self, **labels: Any) -> Tuple[int, Optional[float]]:
+        """(관측 수, 평균). 관측이 없으면 (0, None)"""
+        h = self._peek(labels)
+        if h is None:
+            return 0, None
+        with h._lock:
+            n, total = sum(h.counts), h.sum
+        return n, (total / n if n else None)
+
+    def render(self) -> List[str]:
+        out: List[str] = []
+        for labels, h in self._items():
+            with h._lock:
+                counts, total = list(h.counts), h.sum
+            acc = 0
+            for le, n in zip(list(self.buckets) + [float("inf")], counts):
+                acc += n
+                out.append(f"{self.name}_bucket{_fmt_labels({**labels, 'le': _fmt_value(le)})} {acc}")
+            out.append(f"{self.name}_sum{_fmt_labels(labels)} {_fmt_value(total)}")
+            out.append(f"{self.name}_count{_fmt_labels(labels)} {acc}")
+        return out
+
+
+def register_collector(fn: Callable[[], Iterable[Sample]]):
+    """스크레이프 시점에 계산할 메트릭 공급자 등록. fn은 (이름, 유형, 설명, [(레이블, 값)])을 내보냄"""
+    with _LOCK:
+        if fn not in _COLLECTORS:
+            _COLLECTORS.append(fn)
+
+
+def render() -> str:
+    with _LOCK:
+        metrics = list(_METRICS)
+        collectors = list(_COLLECTORS)
+    lines: List[str] = []
+    for m in metrics:
+        lines.append(f"# HELP {m.name} {m.help}")
+        lines.append(f"# TYPE {m.name} {m.kind}")
+        lines.extend(m.render())
+    for fn in collectors:
+        try:
+            samples = list(fn())
+        except Exception:
+            continue
+        for name, kind, help, values in samples:
+            full = _PREFIX + name
+            lines.append(f"# HELP {full} {help}")
+            lines.append(f"# TYPE {full} {kind}")
+            lines.extend(f"{full}{_fmt_labels(l)} {_fmt_value(v)}" for l, v in values)
+    return "\n".join(lines) + "\n"
+
+
+# ── 메트릭 정의 ──────────────────────────────────────────────────────────
+AUDIT_RUNS = Counter("audit_runs_total", "Completed audit runs", ("framework", "scope"))
+AUDIT_DURATION = Histogram("audit_duration_seconds", "Audit run latency", ("framework", "scope"))
+AUDITS_IN_FLIGHT = Gauge("audits_in_flight", "Audits currently running", ("scope",))
+
+MAPPING_RUNS = Counter("mapping_runs_total", "Mapping (executor) results", ("code", "status"))
+MAPPING_TRUNCATED = Counter("mapping_truncated_total", "Executor runs cut short by the audit budget", ("code", "reason"))
+MAPPING_DURATION = Histogram(
+    "mapping_duration_seconds", "Executor wall time", ("code",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+AWS_CALLS = Counter("aws_calls_total", "AWS API calls", ("service", "operation"))
+AWS_RETRIES = Counter("aws_retries_total", "AWS API retry attempts", ("service", "operation"))
+AWS_THROTTLES = Counter("aws_throttles_total", "Throttled AWS API attempts", ("service", "operation"))
+AWS_ERRORS = Counter("aws_errors_total", "AWS API calls that raised (connection errors etc.)", ("service", "operation"))
+AWS_CALL_DURATION = Histogram(
+    "aws_call_duration_seconds", "AWS API call latency incl. retries and rate-limit wait", ("service", "operation"),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+CACHE_LOOKUPS = Counter("cache_lookups_total", "Cache lookups", ("cache", "result"))
+CACHE_STALE = Counter("cache_stale_serves_total", "Stale entries served while refreshing", ("cache",))
+CACHE_EVICTIONS = Counter("cache_evictions_total", "Entries evicted by capacity limits", ("tier",))
+
+TRACE_SPANS = Counter("trace_spans_total", "Finished trace spans by export result", ("result",))
+
+LOOP_LAG = Gauge("event_loop_lag_seconds", "Most recent event loop lag")
+LOOP_LAG_HIST = Histogram(
+    "event_loop_lag_observed_seconds", "Event loop lag samples",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+
+
+@contextmanager
+def track_audit(framework: str, scope: str) -> Iterator[None]:
+    """감사 1회: 진행 중 게이지 + 완료 횟수/지연 히스토그램"""
+    AUDITS_IN_FLIGHT.labels(scope=scope).inc()
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        AUDITS_IN_FLIGHT.labels(scope=scope).dec()
+        AUDIT_RUNS.inc(framework=framework, scope=scope)
+        AUDIT_DURATION.observe(time.perf_counter() - t0, framework=framework, scope=scope)
+
+
+def track_stream(gen: Iterable[Any], framework: str) -> Iterator[Any]:
+    """스트리밍 응답 생성기를 감싸 감사 1회로 집계"""
+    with track_audit(framework, "stream"):
+        yield from gen
+
+
+# ── 이벤트 루프 지연 ──────────────────────────────────────────────────────
+_LOOP_TASK: Optional[asyncio.Task] = None
+
+
+async def _loop_monitor(interval: float):
+    while True:
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag = max(0.0, time.perf_counter() - t0 - interval)
+        LOOP_LAG.set(lag)
+        LOOP_LAG_HIST.observe(lag)
+
+
+def start_loop_monitor(interval: float = 0.5):
+    """lifespan(실행 중인 이벤트 루프)에서 호출"""
+    global _LOOP_TASK
+    if _LOOP_TASK is None and interval > 0:
+        _LOOP_TASK = asyncio.get_running_loop().create_task(_loop_monitor(interval))
+
+
+def stop_loop_monitor():
+    global _LOOP_TASK
+    if _LOOP_TASK is not None:
+        _LOOP_TASK.cancel()
+        _LOOP_TASK = None
@@ -0,0 +1,199 @@
+# app/core/profiler.py
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+
+# 감사 1회 샘플링 프로파일러(관리자 전용 ?profile=1)
+# - 별도 스레드가 PROFILE_INTERVAL_MS마다 대상 스레드의 스택(sys._current_frames)을 수집
+# - 스택은 "현재 executor" 레이블별로 집계(AuditService가 executor 실행 동안 label(code) 지정)
+# - 결과: flame graph용 collapsed stacks(flamegraph.pl / speedscope / inferno 호환) + executor별 hot function top-N
+# - 결과는 PROFILE_DIR/<id>.collapsed, <id>.json에 저장
+# - 프로파일링하지 않는 요청은 contextvar 조회 한 번 외에는 경로 변화 없음
+
+CURRENT_PROFILER: contextvars.ContextVar[Optional["SamplingProfiler"]] = contextvars.ContextVar(
+    "CURRENT_PROFILER", default=None
+)
+
+_ROOT_LABEL = "(audit)"
+
+
+_PATH_MARKERS = (os.sep + "site-packages" + os.sep, os.sep + "lib" + os.sep)
+_APP_MARKER = os.sep + "app" + os.sep
+
+
+def _frame_name(code) -> str:
+    # 경로는 패키지 기준으로 줄임(app/..., botocore/..., json/...)
+    path = code.co_filename
+    i = path.rfind(_APP_MARKER)
+    if i >= 0:
+        path = path[i + 1:]
+    else:
+        for marker in _PATH_MARKERS:
+            i = path.rfind(marker)
+            if i >= 0:
+                path = path[i + len(marker):]
+                break
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    def __init__(self, interval_ms: Optional[float] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.interval = max(0.001, float(interval_ms or settings.PROFILE_INTERVAL_MS) / 1000.0)
+        self.samples: Counter = Counter()  # (레이블, 스택 튜플) → 횟수
+        self._labels: Dict[int, str] = {}  # 스레드 → 현재 레이블
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.started_at = 0.0
+        self.duration = 0.0
+        self.max_depth = int(settings.PROFILE_MAX_DEPTH)
+
+    # ── 대상 스레드/레이블 ────────────────────────────────────────────────
+    def attach(self, label: str = _ROOT_LABEL):
+        with self._lock:
+            self._labels[threading.get_ident()] = label
+
+    @contextmanager
+    def label(self, name: str) -> Iterator[None]:
+        tid = threading.get_ident()
+        with self._lock:
+            prev = self._labels.get(tid)
+            self._labels[tid] = name
+        try:
+            yield
+        finally:
+            with self._lock:
+                if prev is None:
+                    self._labels.pop(tid, None)
+                else:
+                    self._labels[tid] = prev
+
+    # ── 샘플링 ────────────────────────────────────────────────────────────
+    def _sample_once(self):
+        with self._lock:
+            labels = dict(self._labels)
+        if not labels:
+            return
+        frames = sys._current_frames()
+        for tid, label in labels.items():
+            f = frames.get(tid)
+            stack: List[str] = []
+            while f is not None and len(stack) < self.max_depth:
+                stack.append(_frame_name(f.f_code))
+                f = f.f_back
+            if stack:
+                stack.reverse()
+                self.samples[(label, tuple(stack))] += 1
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self._sample_once()
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._loop, name=f"profiler-{self.id}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        self.duration = time.perf_counter() - self.started_at
+
+    # ── 결과 ──────────────────────────────────────────────────────────────
+    def collapsed(self) -> str:
+        """flame graph collapsed stacks: "레이블;바깥 프레임;...;안쪽 프레임 횟수" """
+        lines = []
+        for (label, stack), n in sorted(self.samples.items(), key=lambda kv: -kv[1]):
+            frames = ";".join(s.replace(";", ",") for s in stack)
+            lines.append(f"{label};{frames} {n}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def top(self, n: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """executor(레이블)별 hot function: self(스택 최상단) / total(스택에 포함) 샘플 수"""
+        n = int(n or settings.PROFILE_TOP_N)
+        self_counts: Dict[str, Counter] = defaultdict(Counter)
+        total_counts: Dict[str, Counter] = defaultdict(Counter)
+        label_totals: Counter = Counter()
+        for (label, stack), c in self.samples.items():
+            label_totals[label] += c
+            self_counts[label][stack[-1]] += c
+            for fn in set(stack):
+                total_counts[label][fn] += c
+        out: Dict[str, List[Dict[str, Any]]] = {}
+        for label, total in label_totals.most_common():
+            out[label] = [
+                {
+                    "function": fn,
+                    "self": c,
+                    "total": total_counts[label][fn],
+                    "selfPct": round(100.0 * c / total, 1),
+                }
+                for fn, c in self_counts[label].most_common(n)
+            ]
+        return out
+
+    def summary(self) -> Dict[str, Any]:
+        per_label = Counter()
+        for (label, _), c in self.samples.items():
+            per_label[label] += c
+        return {
+            "id": self.id,
+            "intervalMs": round(self.interval * 1000.0, 2),
+            "durationSeconds": round(self.duration, 3),
+            "samples": sum(per_label.values()),
+            "samplesByExecutor": dict(per_label.most_common()),
+            "top": self.top(),
+        }
+
+    def save(self) -> Dict[str, Any]:
+        """PROFILE_DIR에 collapsed/summary 저장 후 summary 반환"""
+        summary = self.summary()
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        base = os.path.join(settings.PROFILE_DIR, self.id)
+        with open(base + ".collapsed", "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False)
+        return summary
+
+
+@contextmanager
+def profile() -> Iterator[SamplingProfiler]:
+    """블록 실행 동안 현재 스레드(및 label()을 건 스레드)를 샘플링"""
+    prof = SamplingProfiler()
+    prof.attach()
+    token = CURRENT_PROFILER.set(prof)
+    prof.start()
+    try:
+        yield prof
+    finally:
+        prof.stop()
+        CURRENT_PROFILER.reset(token)
+
+
+def current() -> Optional[SamplingProfiler]:
+    return CURRENT_PROFILER.get()
+
+
+def load(profile_id: str, fmt: str = "json") -> Optional[str]:
+    if not profile_id.isalnum():
+        return None
+    path = os.path.join(settings.PROFILE_DIR, f"{profile_id}.{'collapsed' if fmt == 'collapsed' else 'json'}")
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
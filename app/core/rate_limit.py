@@ -0,0 +1,202 @@
+# app/core/rate_limit.py
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.aws_hooks import register_hook, set_session_config
+
+# 프로세스 전역 AWS API 적응형 속도 제한(AIMD 토큰 버킷)
+# - 키: (계정, 리전, 서비스, 오퍼레이션). 계정은 자격 증명 Access Key ID로 구분(키 하나 = 계정 하나)
+# - 버킷은 제한 없음으로 시작(AWS_RATE_INITIAL=0) → 첫 스로틀에서 직전 1초 관측 속도 × AWS_RATE_DECREASE로 제한 시작
+#   (API마다 한도가 크게 달라 고정 시작값/상한을 두면 한도가 높은 API를 불필요하게 늦춤)
+# - before-call: 제한 중이면 토큰 1개 획득(없으면 대기) → 동시 세션/프레임워크가 같은 API를 나눠 씀
+#   (재시도도 before-call을 다시 거치므로 여기서 속도가 맞춰짐. botocore 백오프에 대기를 더하지 않음)
+# - needs-retry: 매 시도 결과를 관찰
+#     스로틀링 오류 → 속도 × AWS_RATE_DECREASE (곱셈 감소), 남은 토큰 비움
+#     성공         → 속도 + AWS_RATE_INCREASE (덧셈 증가). AWS_RATE_MAX(>0)까지 회복하면 다시 제한 없음
+# - 훅이 설치된 세션은 standard 재시도 모드 + AWS_MAX_ATTEMPTS로 설정해 스로틀이 곧바로 SKIPPED/ERROR가 되지 않게 함
+
+THROTTLE_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestThrottledException",
+    "TooManyRequestsException",
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+    "RequestThrottled",
+    "BandwidthLimitExceeded",
+    "SlowDown",
+    "PriorRequestNotComplete",
+    "EC2ThrottledException",
+}
+
+BucketKey = Tuple[str, str, str, str]  # (account, region, service, operation)
+
+
+class AdaptiveBucket:
+    def __init__(self, rate: Optional[float], *, min_rate: float, max_rate: Optional[float]):
+        self.rate = rate  # None이면 제한 없음(스로틀 전)
+        self.min_rate = min_rate
+        self.max_rate = max_rate  # None이면 상한 없음(제한 중에는 계속 덧셈 증가)
+        self.tokens = max(1.0, rate or 1.0)
+        self.updated = time.monotonic()
+        self.calls = 0
+        self.throttled = 0
+        self.waited = 0.0
+        # 관측 속도(1초 창): 제한 없음 상태에서 첫 스로틀 시 시작 속도 계산용
+        self._window_start = self.updated
+        self._window_calls = 0
+        self._observed = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        cap = max(1.0, self.rate)
+        self.tokens = min(cap, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _count(self, now: float):
+        if now - self._window_start >= 1.0:
+            self._observed = self._window_calls / (now - self._window_start)
+            self._window_start, self._window_calls = now, 0
+        self._window_calls += 1
+        self.calls += 1
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self.rate is None:
+                    self._count(now)
+                    return
+                self._refill(now)
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    self._count(now)
+                    return
+                wait = (1.0 - self.tokens) / self.rate
+                self.waited += wait
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            if self.rate is None:
+                return
+            self.rate += float(settings.AWS_RATE_INCREASE)
+            if self.max_rate is not None and self.rate >= self.max_rate:
+                self.rate = None  # 한도까지 회복 → 다시 제한 없음
+
+    def on_throttle(self):
+        with self._lock:
+            now = time.monotonic()
+            self.throttled += 1
+            if self.rate is None:
+                elapsed = now - self._window_start
+                current = self._window_calls / elapsed if elapsed >= 0.1 else 0.0
+                self.rate = max(self._observed, current, 1.0)
+            self.rate = max(self.min_rate, self.rate * float(settings.AWS_RATE_DECREASE))
+            self.tokens = 0.0
+            self.updated = now
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate": round(self.rate, 2) if self.rate is not None else None,
+                "calls": self.calls,
+                "throttled": self.throttled,
+                "waitedSeconds": round(self.waited, 3),
+            }
+
+
+_BUCKETS: Dict[BucketKey, AdaptiveBucket] = {}
+_LOCK = threading.Lock()
+
+
+def get_bucket(key: BucketKey) -> AdaptiveBucket:
+    b = _BUCKETS.get(key)
+    if b is not None:
+        return b
+    with _LOCK:
+        b = _BUCKETS.get(key)
+        if b is None:
+            initial, ceiling = float(settings.AWS_RATE_INITIAL), float(settings.AWS_RATE_MAX)
+            b = AdaptiveBucket(
+                initial if initial > 0 else None,
+                min_rate=float(settings.AWS_RATE_MIN),
+                max_rate=ceiling if ceiling > 0 else None,
+            )
+            _BUCKETS[key] = b
+        return b
+
+
+def _account_of(request_signer) -> str:
+    try:
+        creds = request_signer._credentials  # botocore RequestSigner
+        return getattr(creds, "access_key", None) or "default"
+    except Exception:
+        return "default"
+
+
+def _is_throttle(response, caught_exception) -> bool:
+    if response is None:
+        return False
+    parsed = response[1] if isinstance(response, tuple) and len(response) > 1 else None
+    code = ((parsed or {}).get("Error") or {}).get("Code")
+    if code in THROTTLE_CODES:
+        return True
+    http = response[0] if isinstance(response, tuple) else None
+    return getattr(http, "status_code", None) == 429
+
+
+# ── botocore 훅 ────────────────────────────────────────────────────────────
+def _on_before_call(model, params, request_signer, context, **kwargs):
+    key: BucketKey = (
+        _account_of(request_signer),
+        context.get("client_region") or "",
+        model.service_model.service_name,
+        model.name,
+    )
+    context["rate_limit_key"] = key
+    get_bucket(key).acquire()
+
+
+def _on_needs_retry(response=None, caught_exception=None, request_dict=None, **kwargs):
+    key = ((request_dict or {}).get("context") or {}).get("rate_limit_key")
+    if key is None:
+        return None
+    bucket = get_bucket(key)
+    if _is_throttle(response, caught_exception):
+        # 속도만 낮춤. 재시도 대기는 botocore 백오프 + 다음 before-call의 토큰 획득이 담당(마지막 시도면 대기 없음)
+        bucket.on_throttle()
+    elif response is not None and caught_exception is None:
+        status = getattr(response[0], "status_code", 0) if isinstance(response, tuple) else 0
+        if status and status < 400:
+            bucket.on_success()
+    return None  # 재시도 여부 판단은 botocore 재시도 핸들러에 맡김
+
+
+def activate():
+    """AWS_RATE_LIMIT_ENABLED면 훅 등록. 앱 기동 시 1회 호출(클라이언트 생성 전)"""
+    if not settings.AWS_RATE_LIMIT_ENABLED:
+        return
+    set_session_config("retry_mode", "standard")
+    set_session_config("max_attempts", int(settings.AWS_MAX_ATTEMPTS))
+    register_hook("before-call", _on_before_call, "rate-limit-acquire")
+    register_hook("needs-retry", _on_needs_retry, "rate-limit-feedback")
+
+
+def stats(only_throttled: bool = False) -> Dict[str, Any]:
+    with _LOCK:
+        items = list(_BUCKETS.items())
+    out: Dict[str, Any] = {}
+    for (account, region, service, op), b in items:
+        snap = b.snapshot()
+        if only_throttled and not snap["throttled"]:
+            continue
+        # Access Key는 앞 4자리만 노출
+        acct = account if account == "default" else f"{account[:4]}…"
+        out[f"{acct}/{region}/{service}.{op}"] = snap
+    return out
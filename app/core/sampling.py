@@ -0,0 +1,101 @@
+# app/core/sampling.py
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import heapq
+import math
+from contextlib import contextmanager
+from statistics import NormalDist
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from app.core.config import settings
+
+# 통계적 표본 감사(?mode=sample)
+# - 리소스가 아주 많은 계정에서 빠른 현황 미리보기용: 리소스별 executor가 전체 대신 재현 가능한 무작위 표본만 평가
+# - 표본: (seed, 리소스 키) 해시 순위가 가장 작은 sample_size개 → 목록 순서와 무관하게 같은 seed면 같은 표본,
+#         리소스가 늘거나 줄어도 기존 리소스의 순위는 그대로
+# - 결과: 표본의 비준수율과 Wilson 신뢰구간(SAMPLE_CONFIDENCE) → AuditResult.sampled
+# - executor는 평가 대상 목록을 choose()로 줄이기만 하면 됨(표본 모드가 아니면 목록 그대로 반환)
+
+T = TypeVar("T")
+
+CURRENT_SAMPLE: contextvars.ContextVar[Optional["SampleState"]] = contextvars.ContextVar(
+    "CURRENT_SAMPLE", default=None
+)
+
+
+class SampleState:
+    """executor 1회 실행의 표본 설정과 선택 결과"""
+
+    __slots__ = ("size", "seed", "population", "chosen")
+
+    def __init__(self, size: int, seed: int):
+        self.size = max(1, int(size))
+        self.seed = int(seed)
+        self.population: Optional[int] = None  # choose()가 호출되지 않으면 None(표본 미지원 executor)
+        self.chosen: set = set()
+
+    def _rank(self, key: str) -> bytes:
+        return hashlib.blake2b(f"{self.seed}:{key}".encode("utf-8"), digest_size=8).digest()
+
+    def choose(self, items: Sequence[T], key: Callable[[T], Any]) -> List[T]:
+        keyed = [(str(key(x)), x) for x in items]
+        self.population = (self.population or 0) + len(keyed)
+        picked = keyed if len(keyed) <= self.size else heapq.nsmallest(self.size, keyed, key=lambda kx: self._rank(kx[0]))
+        self.chosen.update(k for k, _ in picked)
+        return [x for _, x in picked]
+
+    def summary(self, evaluations: Iterable[Any]) -> Dict[str, Any]:
+        # 표본 리소스의 평가만(집계 행/평가 불가 행 제외) 비준수율 계산
+        decided = [ev.status for ev in evaluations
+                   if ev.resource_id is not None and str(ev.resource_id) in self.chosen
+                   and ev.status in ("COMPLIANT", "NON_COMPLIANT")]
+        n = len(decided)
+        k = sum(1 for s in decided if s == "NON_COMPLIANT")
+        population = self.population or 0
+        confidence = float(settings.SAMPLE_CONFIDENCE)
+        full = len(self.chosen) >= population
+        interval = None
+        if n:
+            interval = (k / n, k / n) if full else wilson(k, n, confidence)
+        return {
+            "population": population,
+            "sampleSize": len(self.chosen),
+            "seed": self.seed,
+            "evaluated": n,
+            "nonCompliant": k,
+            "nonComplianceRate": round(k / n, 4) if n else None,
+            "confidence": confidence,
+            "interval": [round(interval[0], 4), round(interval[1], 4)] if interval else None,
+            "estimatedNonCompliant": [math.floor(interval[0] * population), math.ceil(interval[1] * population)] if interval else None,
+            "method": "exhaustive" if full else "wilson",
+        }
+
+
+def wilson(k: int, n: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """이항 비율 k/n의 Wilson 점수 신뢰구간"""
+    z = NormalDist().inv_cdf(1.0 - (1.0 - confidence) / 2.0)
+    p = k / n
+    denom = 1.0 + z * z / n
+    center = (p + z * z / (2.0 * n)) / denom
+    half = z * math.sqrt(p * (1.0 - p) / n + z * z / (4.0 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+@contextmanager
+def use(size: int, seed: int) -> Iterator[SampleState]:
+    state = SampleState(size, seed)
+    token = CURRENT_SAMPLE.set(state)
+    try:
+        yield state
+    finally:
+        CURRENT_SAMPLE.reset(token)
+
+
+def choose(items: Sequence[T], key: Callable[[T], Any]) -> List[T]:
+    """표본 모드면 items 중 재현 가능한 표본, 아니면 items 그대로. key는 평가의 resource_id와 같은 값"""
+    state = CURRENT_SAMPLE.get()
+    if state is None:
+        return list(items)
+    return state.choose(items, key)
@@ -1,101 +1,381 @@
 # app/core/session.py
 from __future__ import annotations
+import os
 import time
 import threading
+from collections import OrderedDict
 from contextlib import contextmanager
 from contextvars import ContextVar
-from typing import Dict, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import boto3
 import httpx
 
+from app.core import metrics
+from app.core.config import settings
+from app.core.aws_hooks import install as install_hooks
+from app.core.fact_cache import FactCache
+from app.utils import shared_backend
+from app.utils.session_mark import forget_session_context
+
 # 요청 처리 중 사용할 현재 세션(컨텍스트)
+# CURRENT_HTTPX_CLIENT: 지정 시 Collector/Mapping 호출이 전역 풀 대신 이 클라이언트를 사용(테스트/재현용)
 CURRENT_BOTO3_SESSION: ContextVar[Optional[boto3.session.Session]] = ContextVar(
     "CURRENT_BOTO3_SESSION", default=None
 )
 CURRENT_HTTPX_CLIENT: ContextVar[Optional[httpx.Client]] = ContextVar(
     "CURRENT_HTTPX_CLIENT", default=None
 )
+CURRENT_AUDIT_SESSION: ContextVar[Optional["AuditSession"]] = ContextVar(
+    "CURRENT_AUDIT_SESSION", default=None
+)
+
+def _rss_bytes() -> Optional[int]:
+    # Linux /proc 기반 현재 RSS(없으면 None)
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except Exception:
+        return None
+
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
 
 class AuditSession:
     """
-    - boto3.Session / httpx.Client 재사용
-    - 간단 TTL(세션 수명) 관리
+    - boto3.Session 재사용 (HTTP는 app.clients.http_pool 의 프로세스 전역 풀을 공유)
+    - 슬라이딩 TTL: 사용할 때마다(touch) 만료 시각이 연장됨
+    - 서비스 클라이언트별 생성 시 RSS 증가량/열린 연결 수 집계(stats)
     """
     def __init__(self, session_id: str, *, region: Optional[str], profile: Optional[str], ttl_seconds: int = 600):
         self.id = session_id
         self.region = region
         self.profile = profile
         self.created_at = int(time.time())
+        self.last_used = time.time()
         self.ttl = max(0, int(ttl_seconds))  # 0이면 만료 관리 안함
+        self.active = 0  # use_session 중인 요청 수(사용 중에는 만료/축출하지 않음)
 
-        # boto3 세션과 httpx 커넥션 풀
+        # boto3 세션 (클라이언트 생성 전에 공용 botocore 훅 설치)
         self.boto3 = boto3.session.Session(profile_name=profile, region_name=region)
-        self.http = httpx.Client(timeout=30.0)
+        install_hooks(self.boto3)
 
-        # 서비스별 클라이언트 캐시
-        self._clients: Dict[str, any] = {}
+        # 서비스별 클라이언트 캐시 + 생성 시 RSS 증가량(근사치)
+        self._clients: Dict[str, Any] = {}
+        self._client_bytes: Dict[str, int] = {}
         self._lock = threading.Lock()
 
-    def is_expired(self) -> bool:
+        # 요건 감사 간 공유하는 리소스 사실 캐시(인벤토리/읽기 전용 API 응답)
+        self.facts = FactCache()
+
+    @property
+    def ttl_seconds(self) -> int:
+        return self.ttl
+
+    @property
+    def last_used_at(self) -> datetime:
+        return datetime.fromtimestamp(self.last_used, timezone.utc)
+
+    @property
+    def expires_at(self) -> Optional[datetime]:
         if self.ttl == 0:
+            return None
+        return datetime.fromtimestamp(self.last_used + self.ttl, timezone.utc)
+
+    def touch(self):
+        self.last_used = time.time()
+
+    def acquire(self):
+        """사용 시작(active 증가). 이벤트 루프와 스레드풀 양쪽에서 호출되므로 잠금 안에서"""
+        with self._lock:
+            self.active += 1
+        self.touch()
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+        self.touch()
+
+    def meta(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "region": self.region,
+            "profile": self.profile,
+            "ttl_seconds": self.ttl,
+            "created_at": self.created_at,
+            "last_used_at": self.last_used,
+            "expires_at": (self.last_used + self.ttl) if self.ttl else None,
+            "worker": os.getpid(),
+        }
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        if self.ttl == 0 or self.active > 0:
             return False
-        return (int(time.time()) - self.created_at) > self.ttl
+        return ((now or time.time()) - self.last_used) > self.ttl
 
     def client(self, service: str):
         with self._lock:
             if service not in self._clients:
+                before = _rss_bytes()
                 self._clients[service] = self.boto3.client(service, region_name=self.region)
+                after = _rss_bytes()
+                if before is not None and after is not None:
+                    self._client_bytes[service] = max(0, after - before)
             return self._clients[service]
 
+    @property
+    def clients(self) -> Dict[str, Any]:
+        return self._clients
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            items = list(self._clients.items())
+            approx = sum(self._client_bytes.values())
+        conns = 0
+        for _, cli in items:
+            try:
+                # botocore URLLib3Session → urllib3 PoolManager → 호스트별 커넥션 풀
+                pools = cli._endpoint.http_session._manager.pools
+                for key in list(pools.keys()):
+                    pool = pools.get(key)
+                    if pool is not None:
+                        conns += pool.num_connections
+            except Exception:
+                continue
+        return {
+            "clients": len(items),
+            "connectionsOpened": conns,
+            "approxClientBytes": approx,
+            "active": self.active,
+            "facts": self.facts.stats(),
+        }
+
     def close(self):
-        try:
-            self.http.close()
-        except Exception:
-            pass
-        self._clients.clear()
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._client_bytes.clear()
+        self.facts.clear()
+        for cli in clients:
+            try:
+                cli.close()  # urllib3 커넥션 풀 정리
+            except Exception:
+                pass
 
-# 전역 세션 레지스트리
-_SESSIONS: Dict[str, AuditSession] = {}
+
+# 전역 세션 레지스트리(LRU 순서: 마지막이 가장 최근 사용)
+_SESSIONS: "OrderedDict[str, AuditSession]" = OrderedDict()
 _LOCK = threading.Lock()
 
-def create_session(session_id: str, *, region: Optional[str], profile: Optional[str], ttl_seconds: int = 600) -> AuditSession:
+
+_META_PREFIX = "SESSION:"
+_META_NO_TTL = 86400  # TTL 0(만료 관리 안함) 세션 메타데이터 보관 기간
+
+
+def _session_samples():
     with _LOCK:
-        s = AuditSession(session_id, region=region, profile=profile, ttl_seconds=ttl_seconds)
-        _SESSIONS[session_id] = s
-        return s
+        sessions = list(_SESSIONS.values())
+    return [
+        ("sessions", "gauge", "Audit sessions held by this worker", [({}, float(len(sessions)))]),
+        ("sessions_busy", "gauge", "Sessions with a request in progress", [({}, float(sum(1 for s in sessions if s.active > 0)))]),
+    ]
+
+
+metrics.register_collector(_session_samples)
+
+
+def _publish(s: AuditSession):
+    # 세션 메타데이터를 공유 저장소에 기록 → 다른 워커의 /audit/session에서도 보임
+    try:
+        shared_backend.set_json(_META_PREFIX + s.id, s.meta(), ttl=s.ttl or _META_NO_TTL)
+    except Exception:
+        pass
+
+
+def shared_sessions() -> Dict[str, Dict[str, Any]]:
+    """모든 워커의 세션 메타데이터(id → meta)"""
+    try:
+        return {k[len(_META_PREFIX):]: v for k, v in shared_backend.scan_json(_META_PREFIX).items()}
+    except Exception:
+        return {}
+
+
+def _evict(session_id: str, s: AuditSession):
+    s.close()
+    forget_session_context(session_id)
+
+
+def _enforce_cap(keep: str) -> List[Tuple[str, AuditSession]]:
+    # _LOCK 보유 상태에서 호출. 최대 개수 초과분을 LRU 순으로 꺼내 반환(정리는 락 밖에서)
+    # 사용 중(active)인 세션과 방금 등록한 세션(keep)은 건너뜀
+    out: List[Tuple[str, AuditSession]] = []
+    cap = max(1, int(settings.SESSION_MAX_COUNT))
+    for sid in list(_SESSIONS.keys()):
+        if len(_SESSIONS) <= cap:
+            break
+        if sid != keep and _SESSIONS[sid].active == 0:
+            out.append((sid, _SESSIONS.pop(sid)))
+    return out
+
+
+def _install(s: AuditSession, *, reuse: bool) -> AuditSession:
+    """
+    s를 레지스트리에 등록. reuse=True면 그 사이 다른 요청이 같은 ID로 만든 유효한 세션이 있을 때 그것을 반환(s는 폐기).
+    교체된 이전 세션은 사용 중이 아닐 때만 닫음(사용 중이면 레지스트리에서만 빠지고 요청이 끝나면 GC)
+    """
+    with _LOCK:
+        cur = _SESSIONS.get(s.id)
+        if reuse and cur is not None and not cur.is_expired():
+            cur.touch()
+            _SESSIONS.move_to_end(s.id)
+            winner, old, evicted = cur, None, []
+        else:
+            _SESSIONS.pop(s.id, None)
+            _SESSIONS[s.id] = s
+            winner, old, evicted = s, cur, _enforce_cap(keep=s.id)
+    if winner is not s:
+        s.close()
+        return winner
+    _publish(s)
+    if old is not None and old.active == 0:
+        old.close()
+    for sid, e in evicted:
+        _evict(sid, e)
+    return s
+
+
+def create_session(session_id: str, *, region: Optional[str], profile: Optional[str], ttl_seconds: int = 600) -> AuditSession:
+    """같은 ID의 기존 세션을 새 세션으로 교체"""
+    s = AuditSession(session_id, region=region, profile=profile, ttl_seconds=ttl_seconds)
+    return _install(s, reuse=False)
 
 def get_session(session_id: str) -> Optional[AuditSession]:
     with _LOCK:
         s = _SESSIONS.get(session_id)
-        if s and s.is_expired():
-            # 만료 시 정리
-            s.close()
-            _SESSIONS.pop(session_id, None)
+        if s is None:
             return None
-        return s
+        if s.is_expired():
+            _SESSIONS.pop(session_id, None)
+        else:
+            s.touch()
+            _SESSIONS.move_to_end(session_id)
+            return s
+    # 만료 시 정리
+    _evict(session_id, s)
+    return None
 
 def ensure_session(session_id: str, *, region: Optional[str], profile: Optional[str], ttl_seconds: int = 600) -> AuditSession:
+    """
+    있으면 재사용, 없으면 생성. 같은 ID의 첫 요청 둘이 동시에 와도 등록은 _LOCK 안에서 한 번만 →
+    둘 다 같은 세션을 받음(세션 생성 자체는 락 밖, 진 쪽이 만든 세션은 폐기)
+    """
     s = get_session(session_id)
     if s:
         return s
-    return create_session(session_id, region=region, profile=profile, ttl_seconds=ttl_seconds)
+    s = AuditSession(session_id, region=region, profile=profile, ttl_seconds=ttl_seconds)
+    return _install(s, reuse=True)
 
 def end_session(session_id: str) -> None:
     with _LOCK:
         s = _SESSIONS.pop(session_id, None)
-        if s:
-            s.close()
+    if s:
+        _evict(session_id, s)
+    # 명시적 종료는 모든 워커에서 사라지도록 공유 메타데이터도 삭제
+    try:
+        shared_backend.backend().delete(_META_PREFIX + session_id)
+    except Exception:
+        pass
+    forget_session_context(session_id, shared=True)
+
+def peek_all_sessions() -> Dict[str, AuditSession]:
+    """조회 전용(사용 시각 갱신 안 함)"""
+    with _LOCK:
+        return dict(_SESSIONS)
+
+def reap_expired() -> int:
+    now = time.time()
+    with _LOCK:
+        expired = [(sid, s) for sid, s in _SESSIONS.items() if s.is_expired(now)]
+        for sid, _ in expired:
+            _SESSIONS.pop(sid, None)
+    for sid, s in expired:
+        _evict(sid, s)
+    return len(expired)
+
+
+# ── 백그라운드 reaper ─────────────────────────────────────────────────────
+_REAPER_STOP = threading.Event()
+_REAPER: Optional[threading.Thread] = None
+
+def _reaper_loop(interval: float):
+    while not _REAPER_STOP.wait(interval):
+        try:
+            reap_expired()
+        except Exception:
+            pass
+
+def start_reaper():
+    global _REAPER
+    interval = float(settings.SESSION_REAPER_INTERVAL_SECONDS)
+    if interval <= 0 or (_REAPER is not None and _REAPER.is_alive()):
+        return
+    _REAPER_STOP.clear()
+    _REAPER = threading.Thread(target=_reaper_loop, args=(interval,), name="session-reaper", daemon=True)
+    _REAPER.start()
+
+def stop_reaper():
+    global _REAPER
+    _REAPER_STOP.set()
+    t, _REAPER = _REAPER, None
+    if t is not None:
+        t.join(timeout=5)
+    with _LOCK:
+        items = list(_SESSIONS.items())
+        _SESSIONS.clear()
+    for sid, s in items:
+        _evict(sid, s)
 
 @contextmanager
 def use_session(session: AuditSession):
     """
-    이 컨텍스트 안에서는 app.core.aws / http 클라이언트들이 동일 세션을 재사용
+    이 컨텍스트 안에서는 app.core.aws 클라이언트들이 동일 세션을 재사용
+    (HTTP 호출은 세션과 무관하게 프로세스 전역 풀 사용)
     """
+    session.acquire()
     tok1 = CURRENT_BOTO3_SESSION.set(session.boto3)
-    tok2 = CURRENT_HTTPX_CLIENT.set(session.http)
+    tok2 = CURRENT_AUDIT_SESSION.set(session)
     try:
         yield session
     finally:
+        CURRENT_AUDIT_SESSION.reset(tok2)
         CURRENT_BOTO3_SESSION.reset(tok1)
-        CURRENT_HTTPX_CLIENT.reset(tok2)
\ No newline at end of file
+        session.release()
+        _publish(session)
+
+
+def stream_in_session(session: AuditSession, gen: Iterator[Any]) -> Iterator[Any]:
+    """
+    스트리밍 응답용 use_session: StreamingResponse는 next()마다 컨텍스트를 새로 복사하므로
+    생성기 안의 with use_session(...)은 첫 청크에만 적용됨 → 매 단계 세션 컨텍스트를 다시 지정
+    """
+    session.acquire()
+    try:
+        while True:
+            tok1 = CURRENT_BOTO3_SESSION.set(session.boto3)
+            tok2 = CURRENT_AUDIT_SESSION.set(session)
+            try:
+                item = next(gen)
+            except StopIteration:
+                return
+            finally:
+                CURRENT_AUDIT_SESSION.reset(tok2)
+                CURRENT_BOTO3_SESSION.reset(tok1)
+            yield item
+    finally:
+        close = getattr(gen, "close", None)
+        if close is not None:
+            close()
+        session.release()
+        _publish(session)
@@ -0,0 +1,445 @@
+# app/core/tracing.py
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import httpx
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.aws_hooks import register_hook
+
+# OpenTelemetry 데이터 모델 분산 추적(외부 의존성 없는 최소 구현)
+# - 스팬: 감사 실행(audit.run) → 요건(audit.requirement) → executor(audit.executor) → AWS API 호출(<서비스>.<오퍼레이션>)
+#         + 매핑 그래프 적재(mapping.prefetch), Collector/Mapping API HTTP 호출(HTTP <메서드>)
+# - 부모 스팬은 contextvar(CURRENT_SPAN)로 전달. 다른 스레드로 넘길 때는 contextvars.copy_context() 필요
+# - AWS 호출 스팬은 botocore 훅, HTTP 스팬은 httpx 전송 계층 래퍼(TracingTransport)로 생성 → executor/클라이언트 코드는 그대로
+# - 끝난 스팬은 배치로 모아 백그라운드 스레드가 내보냄(TRACING_EXPORTER, 쉼표로 여러 개)
+#     jsonl : TRACING_JSONL_PATH에 배치당 한 줄(OTLP JSON ExportTraceServiceRequest, Collector otlpjsonfile 수신기 호환)
+#     otlp  : TRACING_OTLP_ENDPOINT로 OTLP/HTTP JSON 전송
+#   register_exporter()로 다른 내보내기 추가 가능
+# - TRACING_EXPORTER가 비어 있으면 span()은 아무것도 하지 않음(contextvar 조회도 없음)
+
+CURRENT_SPAN: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("CURRENT_SPAN", default=None)
+
+# OTLP SpanKind / StatusCode
+KIND_INTERNAL, KIND_SERVER, KIND_CLIENT = 1, 2, 3
+STATUS_UNSET, STATUS_OK, STATUS_ERROR = 0, 1, 2
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+def _attr_value(v: Any) -> Dict[str, Any]:
+    if isinstance(v, bool):
+        return {"boolValue": v}
+    if isinstance(v, int):
+        return {"intValue": str(v)}
+    if isinstance(v, float):
+        return {"doubleValue": v}
+    if isinstance(v, (list, tuple)):
+        return {"arrayValue": {"values": [_attr_value(x) for x in v]}}
+    return {"stringValue": str(v)}
+
+
+def _attrs(d: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": k, "value": _attr_value(v)} for k, v in d.items() if v is not None]
+
+
+class Span:
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "start_ns", "end_ns",
+                 "attributes", "events", "status", "status_message")
+
+    def __init__(self, name: str, kind: int, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent is not None else _new_id(16)
+        self.span_id = _new_id(8)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.events: List[Dict[str, Any]] = []
+        self.status = STATUS_UNSET
+        self.status_message = ""
+
+    def set(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def event(self, name: str, **attributes: Any):
+        self.events.append({"timeUnixNano": str(time.time_ns()), "name": name, "attributes": _attrs(attributes)})
+
+    def record_exception(self, exc: BaseException):
+        self.event("exception", **{"exception.type": type(exc).__name__, "exception.message": str(exc)})
+        self.status = STATUS_ERROR
+        self.status_message = f"{type(exc).__name__}: {exc}"
+
+    def end(self):
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        p = _PROCESSOR
+        if p is not None:
+            p.on_end(self)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": _attrs(self.attributes),
+            "status": {"code": self.status, "message": self.status_message} if self.status else {},
+        }
+        if self.parent_id:
+            out["parentSpanId"] = self.parent_id
+        if self.events:
+            out["events"] = self.events
+        return out
+
+
+# ── 내보내기 ────────────────────────────────────────────────────────────────
+def _export_request(spans: List[Span]) -> Dict[str, Any]:
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _attrs({
+                "service.name": settings.TRACING_SERVICE_NAME,
+                "process.pid": os.getpid(),
+            })},
+            "scopeSpans": [{"scope": {"name": "app.core.tracing"}, "spans": [s.to_otlp() for s in spans]}],
+        }]
+    }
+
+
+class JsonlExporter:
+    def __init__(self):
+        self.path = settings.TRACING_JSONL_PATH
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]):
+        line = json.dumps(_export_request(spans), ensure_ascii=False, separators=(",", ":"))
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def shutdown(self):
+        pass
+
+
+class OtlpHttpExporter:
+    def __init__(self):
+        headers = {"Content-Type": "application/json"}
+        for part in (settings.TRACING_OTLP_HEADERS or "").split(","):
+            if "=" in part:
+                k, v = part.split("=", 1)
+                headers[k.strip()] = v.strip()
+        self.endpoint = settings.TRACING_OTLP_ENDPOINT
+        self.client = httpx.Client(timeout=float(settings.TRACING_OTLP_TIMEOUT_SECONDS), headers=headers)
+
+    def export(self, spans: List[Span]):
+        r = self.client.post(self.endpoint, content=json.dumps(_export_request(spans), separators=(",", ":")))
+        r.raise_for_status()
+
+    def shutdown(self):
+        self.client.close()
+
+
+_EXPORTERS: Dict[str, Callable[[], Any]] = {
+    "jsonl": JsonlExporter,
+    "otlp": OtlpHttpExporter,
+}
+
+
+def register_exporter(name: str, factory: Callable[[], Any]):
+    """TRACING_EXPORTER에서 쓸 수 있는 내보내기 추가. factory() → export(spans)/shutdown()을 가진 객체"""
+    _EXPORTERS[name] = factory
+
+
+class BatchProcessor:
+    """끝난 스팬을 큐에 모아 TRACING_BATCH_SIZE개 또는 TRACING_FLUSH_SECONDS마다 내보냄(요청 경로에서 I/O 없음)"""
+
+    def __init__(self, exporters: List[Any]):
+        self.exporters = exporters
+        self.batch_size = max(1, int(settings.TRACING_BATCH_SIZE))
+        self.interval = max(0.05, float(settings.TRACING_FLUSH_SECONDS))
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(maxsize=max(1, int(settings.TRACING_MAX_QUEUE)))
+        self._thread = threading.Thread(target=self._loop, name="trace-export", daemon=True)
+        self._thread.start()
+
+    def on_end(self, span: Span):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            metrics.TRACE_SPANS.inc(result="dropped")
+
+    def _export(self, batch: List[Span]):
+        for exp in self.exporters:
+            try:
+                exp.export(batch)
+                metrics.TRACE_SPANS.inc(len(batch), result="exported")
+            except Exception:
+                metrics.TRACE_SPANS.inc(len(batch), result="failed")
+
+    def _loop(self):
+        batch: List[Span] = []
+        deadline = time.monotonic() + self.interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = False  # 주기 도래
+            if item is None:
+                break
+            if item:
+                batch.append(item)
+            if batch and (item is False or len(batch) >= self.batch_size):
+                self._export(batch)
+                batch = []
+            if item is False or time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.interval
+        # 종료: 남은 스팬 모두 내보냄
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item:
+                batch.append(item)
+        if batch:
+            self._export(batch)
+
+    def shutdown(self):
+        self._queue.put(None)
+        self._thread.join(timeout=10)
+        for exp in self.exporters:
+            try:
+                exp.shutdown()
+            except Exception:
+                pass
+
+
+_PROCESSOR: Optional[BatchProcessor] = None
+
+
+def enabled() -> bool:
+    return _PROCESSOR is not None
+
+
+# ── 스팬 API ────────────────────────────────────────────────────────────────
+def current() -> Optional[Span]:
+    return CURRENT_SPAN.get()
+
+
+def start_span(name: str, kind: int = KIND_INTERNAL, parent: Optional[Span] = None, **attributes: Any) -> Optional[Span]:
+    """contextvar를 바꾸지 않고 스팬 시작(끝낼 때 end()). 추적이 꺼져 있으면 None"""
+    if _PROCESSOR is None:
+        return None
+    return Span(name, kind, parent if parent is not None else CURRENT_SPAN.get(), attributes)
+
+
+@contextmanager
+def use_span(s: Optional[Span]) -> Iterator[Optional[Span]]:
+    """이미 시작한 스팬을 블록 동안 현재 스팬으로 지정(끝내지는 않음)"""
+    if s is None:
+        yield None
+        return
+    token = CURRENT_SPAN.set(s)
+    try:
+        yield s
+    finally:
+        CURRENT_SPAN.reset(token)
+
+
+@contextmanager
+def span(name: str, kind: int = KIND_INTERNAL, **attributes: Any) -> Iterator[Optional[Span]]:
+    """블록을 스팬으로 감쌈. 예외는 스팬에 기록하고 다시 던짐"""
+    if _PROCESSOR is None:
+        yield None
+        return
+    s = Span(name, kind, CURRENT_SPAN.get(), attributes)
+    token = CURRENT_SPAN.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.record_exception(e)
+        raise
+    finally:
+        CURRENT_SPAN.reset(token)
+        s.end()
+
+
+def trace_stream(gen: Iterable[Any], name: str, **attributes: Any) -> Iterator[Any]:
+    """
+    스트리밍 응답 제너레이터를 한 스팬으로 감쌈.
+    StreamingResponse는 next()마다 컨텍스트 복사본에서 실행하므로 매 단계 현재 스팬을 다시 지정
+    """
+    s = start_span(name, **attributes)
+    if s is None:
+        yield from gen
+        return
+    it = iter(gen)
+    try:
+        while True:
+            with use_span(s):
+                try:
+                    item = next(it)
+                except StopIteration:
+                    return
+            yield item
+    except BaseException as e:
+        if not isinstance(e, GeneratorExit):
+            s.record_exception(e)
+        raise
+    finally:
+        s.end()
+
+
+# ── httpx 전송 계층 ─────────────────────────────────────────────────────────
+def _http_span(request: httpx.Request) -> Optional[Span]:
+    return start_span(
+        f"HTTP {request.method}", KIND_CLIENT,
+        **{
+            "http.request.method": request.method,
+            "url.full": str(request.url),
+            "server.address": request.url.host,
+            "server.port": request.url.port,
+        },
+    )
+
+
+def _http_end(s: Span, response: Optional[httpx.Response], exc: Optional[BaseException]):
+    if exc is not None:
+        s.record_exception(exc)
+    elif response is not None:
+        s.set("http.response.status_code", response.status_code)
+        if response.status_code >= 500:
+            s.status = STATUS_ERROR
+    s.end()
+
+
+class TracingTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.BaseTransport):
+        self.inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        s = _http_span(request)
+        if s is None:
+            return self.inner.handle_request(request)
+        try:
+            response = self.inner.handle_request(request)
+        except BaseException as e:
+            _http_end(s, None, e)
+            raise
+        _http_end(s, response, None)
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+class AsyncTracingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport):
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        s = _http_span(request)
+        if s is None:
+            return await self.inner.handle_async_request(request)
+        try:
+            response = await self.inner.handle_async_request(request)
+        except BaseException as e:
+            _http_end(s, None, e)
+            raise
+        _http_end(s, response, None)
+        return response
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+# ── botocore 훅 ────────────────────────────────────────────────────────────
+def _on_before_call(model, context, **kwargs):
+    s = start_span(
+        f"{model.service_model.service_name}.{model.name}", KIND_CLIENT,
+        **{
+            "rpc.system": "aws-api",
+            "rpc.service": model.service_model.service_name,
+            "rpc.method": model.name,
+            "cloud.region": context.get("client_region"),
+        },
+    )
+    if s is not None:
+        context["trace_span"] = s
+    return None
+
+
+def _on_needs_retry(response=None, caught_exception=None, request_dict=None, **kwargs):
+    context = (request_dict or {}).get("context")
+    s = context.get("trace_span") if context is not None else None
+    if s is not None and (caught_exception is not None or (response is not None and response[0].status_code >= 400)):
+        status = response[0].status_code if response is not None else None
+        s.event("attempt_failed", **{"http.response.status_code": status,
+                                     "exception.type": type(caught_exception).__name__ if caught_exception else None})
+    return None
+
+
+def _on_after_call(http_response, parsed, model, context, **kwargs):
+    s = context.pop("trace_span", None)
+    if s is None:
+        return
+    meta = (parsed.get("ResponseMetadata") or {}) if isinstance(parsed, dict) else {}
+    s.set("aws.retries", int(meta.get("RetryAttempts") or 0))
+    s.set("aws.request_id", meta.get("RequestId"))
+    s.set("http.response.status_code", meta.get("HTTPStatusCode") or getattr(http_response, "status_code", None))
+    if context.get("fact_hit") or context.get("snapshot_hit"):
+        s.set("aws.cached", True)
+    if isinstance(parsed, dict) and "Error" in parsed:
+        s.status = STATUS_ERROR
+        s.status_message = str((parsed.get("Error") or {}).get("Code") or "")
+    s.end()
+
+
+def _on_after_call_error(context, exception=None, **kwargs):
+    s = context.pop("trace_span", None)
+    if s is None:
+        return
+    if exception is not None:
+        s.record_exception(exception)
+    s.end()
+
+
+def activate():
+    """TRACING_EXPORTER가 지정돼 있으면 내보내기 시작 + botocore 훅 등록. 앱 기동 시 instrument.activate() 직후 호출"""
+    global _PROCESSOR
+    names = [n.strip() for n in (settings.TRACING_EXPORTER or "").split(",") if n.strip()]
+    if not names or _PROCESSOR is not None:
+        return
+    exporters = []
+    for n in names:
+        factory = _EXPORTERS.get(n)
+        if factory is None:
+            raise ValueError(f"unknown TRACING_EXPORTER: {n}")
+        exporters.append(factory())
+    _PROCESSOR = BatchProcessor(exporters)
+    register_hook("before-call", _on_before_call, "trace-start")
+    register_hook("needs-retry", _on_needs_retry, "trace-retry")
+    register_hook("after-call", _on_after_call, "trace-end")
+    register_hook("after-call-error", _on_after_call_error, "trace-error")
+
+
+def shutdown():
+    """남은 스팬을 모두 내보내고 종료(앱 종료 시)"""
+    global _PROCESSOR
+    p, _PROCESSOR = _PROCESSOR, None
+    if p is not None:
+        p.shutdown()
@@ -1,10 +1,55 @@
 # app/main.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import health, audit
+from app.routers import health, audit, metrics as metrics_router
+from app.clients.mapping_client import start_mirror, stop_mirror
+from app.clients.http_pool import close_all as close_http_pools
+from app.core.aws_hooks import install_default as install_default_hooks
+from app.core.config import settings
+from app.core import budget, fact_cache, instrument, metrics, rate_limit, tracing
+from app.core.session import start_reaper, stop_reaper
+from app.services import registry, warmup
+from app.utils import shared_backend, snapshot
 import os
 
-app = FastAPI(title="Compliance Mapping Auditor API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 실행 계측, 추적, 스냅샷 기록/재생, 세션 사실 캐시, 실행 예산, AWS API 속도 제한 훅 등록(등록 순서 = before-call 실행 순서) → boto3 기본 세션에 공용 botocore 훅 설치
+    instrument.activate()
+    tracing.activate()
+    snapshot.activate()
+    fact_cache.activate()
+    budget.activate()
+    if snapshot.mode() != "replay":
+        rate_limit.activate()
+    install_default_hooks()
+    # Mapping API 미러: SQLite 적재 + 백그라운드 조건부 갱신
+    start_mirror()
+    # 선택: executor 모듈 일괄 import(기본은 첫 사용 시 지연 import)
+    registry.maybe_warm_all()
+    # 선택: 클라이언트/자격 증명/리전/매핑 메타데이터 사전 준비(백그라운드, 끝날 때까지 /health 503)
+    warmup.start()
+    # 만료 세션 백그라운드 정리
+    start_reaper()
+    # /metrics 이벤트 루프 지연 측정
+    metrics.start_loop_monitor(float(settings.METRICS_LOOP_LAG_INTERVAL_SECONDS))
+    try:
+        yield
+    finally:
+        metrics.stop_loop_monitor()
+        stop_reaper()
+        stop_mirror()
+        snapshot.close()
+        shared_backend.flush()
+        # Collector/Mapping keep-alive 풀 정리
+        close_http_pools()
+        # 남은 추적 스팬 내보내기
+        tracing.shutdown()
+
+
+app = FastAPI(title="Compliance Mapping Auditor API", version="0.1.0", lifespan=lifespan)
 
 
 # ── CORS 설정 ────────────────────────────────────────────────────────────────
@@ -35,4 +80,5 @@ app.add_middleware(
 
 
 app.include_router(health.router, prefix="/health", tags=["health"])
-app.include_router(audit.router,  prefix="/audit",  tags=["audit"])       
\ No newline at end of file
+app.include_router(audit.router,  prefix="/audit",  tags=["audit"])
+app.include_router(metrics_router.router, prefix="/metrics", tags=["metrics"])       
\ No newline at end of file
@@ -71,6 +71,12 @@ class AuditResult(BaseModel):
     evidence: Dict[str, Any] = Field(default_factory=dict)
     reason: Optional[str] = None
     extract: Optional[Dict[str, Any]] = None
+    # 실행 계측(app.core.instrument): wallMs/awsCalls/retries/throttles/bytes/evaluations/operations
+    timing: Optional[Dict[str, Any]] = None
+    # 실행 예산 초과로 중단된 경우(app.core.budget): reason(deadline/timeout/max_calls)/limit/awsCalls/droppedEvaluations 등
+    truncated: Optional[Dict[str, Any]] = None
+    # 표본 감사로 평가한 경우(app.core.sampling): population/sampleSize/seed/nonComplianceRate/interval 등
+    sampled: Optional[Dict[str, Any]] = None
 
 class RequirementAuditResponse(BaseModel):
     framework: str
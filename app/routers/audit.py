@@ -1,16 +1,21 @@
 # app/routers/audit.py
 from __future__ import annotations
 
-from fastapi import APIRouter, Path, Query, Request, Response
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+import hmac
 import json
 
 from app.services.audit_service import AuditService
+from app.services import planner
+from app.core import instrument, metrics, profiler, tracing
 from app.core.config import settings
-from app.core.session import ensure_session, use_session
+from app.core.session import ensure_session, stream_in_session, use_session
 
 # ⬇ 세션 TTL 캐시 + ETag 유틸
-from app.utils.caching import maybe_return_cached, store_response_to_cache
+from app.utils.caching import maybe_return_cached, single_flight, wants_refresh
 from app.utils.etag_utils import etag_response
 
 # ⬇ 세션 조회/요약
@@ -21,10 +26,37 @@ from app.utils.session_introspect import (
 
 # ⬇ 세션에 프레임워크 사용 흔적 태깅
 from app.utils.session_mark import mark_session_framework
+from app.utils import snapshot
+
+# ⬇ 증거 참조({"$ref": "sha256:..."}) 원본 조회
+from app.utils.evidence_store import get_evidence
 
 router = APIRouter()
 
 
+def _require_admin(request: Request):
+    """X-Admin-Token 헤더가 ADMIN_TOKEN과 일치해야 함(ADMIN_TOKEN이 비어 있으면 항상 거부)"""
+    token = settings.ADMIN_TOKEN
+    given = request.headers.get("x-admin-token", "")
+    if not token or not hmac.compare_digest(given.encode(), token.encode()):
+        raise HTTPException(status_code=403, detail="admin token required")
+
+
+def _profiled(response: Response, run):
+    """
+    캐시/single_flight 없이 run()을 한 번 실행하며 샘플링 프로파일을 남긴다.
+    - 라우터는 run_in_threadpool로 호출 → 이벤트 루프를 막지 않고, profile()이 run()을 실행하는 워커 스레드에 붙음
+    - 프로파일(collapsed stacks + 요약)은 PROFILE_DIR에 저장, ID는 X-Profile-Id 헤더
+    - 응답: {"result": 감사 결과, "profile": 요약(executor별 상위 함수)}
+    """
+    with profiler.profile() as prof:
+        result = run()
+    summary = prof.save()
+    response.headers["X-Profile-Id"] = prof.id
+    response.headers["Cache-Control"] = "no-store"
+    return {"result": result, "profile": summary}
+
+
 @router.get("/session", summary="세션 목록 또는 단건 조회(쿼리)")
 def session_overview(
     session_id: str | None = Query(None, description="조회할 세션 ID(없으면 전체 요약)")
@@ -46,45 +78,124 @@ def session_get(session_id: str = Path(..., description="세션 ID")):
     return _peek_session(session_id)
 
 
+@router.get("/evidence/{digest}", summary="증거 원본 문서 조회(콘텐츠 해시)")
+def evidence_get(digest: str = Path(..., description="sha256:<hex> 또는 <hex>")):
+    """
+    평가 결과의 extra에 담긴 {"$ref": "sha256:..."} 참조를 원본 문서로 풀어서 반환.
+    콘텐츠 주소 기반이라 내용이 바뀌지 않으므로 장기 캐시 가능.
+    """
+    doc = get_evidence(digest)
+    if doc is None:
+        raise HTTPException(status_code=404, detail="evidence not found")
+    return Response(
+        content=json.dumps(doc, ensure_ascii=False),
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+
+@router.get("/profile/{profile_id}", summary="감사 프로파일 조회(관리자)")
+def profile_get(
+    profile_id: str = Path(..., description="X-Profile-Id 헤더 값"),
+    format: str = Query("json", pattern="^(json|collapsed)$", description="json: 요약 / collapsed: flame graph 입력"),
+    request: Request = None,
+):
+    """
+    ?profile=1 실행으로 저장된 프로파일 반환.
+    collapsed 형식은 flamegraph.pl / speedscope / inferno에 그대로 넣을 수 있음.
+    """
+    _require_admin(request)
+    text = profiler.load(profile_id, format)
+    if text is None:
+        raise HTTPException(status_code=404, detail="profile not found")
+    if format == "collapsed":
+        return PlainTextResponse(text)
+    return Response(content=text, media_type="application/json")
+
+
+@router.get("/{framework}/_plan", summary="(프레임워크) 감사 실행 계획(dry-run)")
+def audit_plan(
+    framework: str = Path(..., description="예: ISMS-P / GDPR / iso-27001"),
+    accounts: int = Query(1, ge=1, description="추정할 계정 수(현재 계정 인벤토리 기준 배수)"),
+    regions: int = Query(1, ge=1, description="계정당 리전 수(리전 서비스만 배수 적용)"),
+    concurrency: int = Query(1, ge=1, description="동시에 실행할 계정×리전 감사 수"),
+    session_id: str | None = Query(None, description="세션 ID(있으면 인벤토리 조회를 세션 사실 캐시에 남김)"),
+    session_ttl: int = Query(600, ge=0, description="세션 TTL(초). 0이면 만료 관리 안함"),
+):
+    """
+    요건→매핑 그래프 해석 + 인벤토리 수(목록 조회)만으로 AWS 호출 수/소요 시간/스로틀 위험 추정.
+    상세 점검은 실행하지 않음.
+    """
+    framework = framework.strip()
+    kwargs = dict(accounts=accounts, regions=regions, concurrency=concurrency)
+    try:
+        if not session_id:
+            return planner.plan(framework, **kwargs)
+        s = ensure_session(session_id, region=settings.AWS_REGION, profile=None, ttl_seconds=session_ttl)
+        with use_session(s):
+            mark_session_framework(s, framework)
+            return planner.plan(framework, **kwargs)
+    finally:
+        # record 모드면 인벤토리 조회 응답도 스냅샷 파일에 반영
+        snapshot.flush()
+
+
 @router.post("/{framework}/_all", summary="(프레임워크) 전체 감사 수행")
 async def audit_framework(
     framework: str = Path(..., description="예: ISMS-P / GDPR / iso-27001"),
     stream: bool = Query(False, description="True면 NDJSON으로 항목별 스트리밍 전송"),
     session_id: str | None = Query(None, description="세션 ID(있으면 boto3/httpx 재사용)"),
     session_ttl: int = Query(600, ge=0, description="세션 TTL(초). 0이면 만료 관리 안함"),
+    profile: bool = Query(False, description="True면 캐시 없이 실행하며 프로파일 반환(관리자, 비스트리밍만)"),
+    schedule: str | None = Query(None, pattern="^(registry|makespan|fast-lane)$", description="매핑 실행 순서: registry(등록 순서) / makespan(긴 것부터 동시 실행) / fast-lane(계정 단위 점검 먼저). 기본 AUDIT_SCHEDULE"),
+    mode: str = Query("full", pattern="^(full|sample)$", description="full: 전체 리소스 평가 / sample: 리소스별 점검(3.0-04, 2.0-01, 4.0-03, 5.0-06)은 표본만 평가하고 비준수율 신뢰구간 보고"),
+    sample_size: int | None = Query(None, ge=1, description="mode=sample 표본 크기(기본 SAMPLE_SIZE)"),
+    seed: int | None = Query(None, description="mode=sample 표본 seed(같은 seed면 같은 표본, 기본 SAMPLE_SEED)"),
     request: Request = None,
     response: Response = None,
 ):
     """
     - stream=False: JSON 한 방 응답 → 캐시/ETag 적용
     - stream=True : NDJSON 스트리밍 → 캐시/ETag 미적용
+    - profile=True: 캐시/ETag 없이 1회 실행 + 샘플링 프로파일(X-Admin-Token 필요)
     """
     framework = framework.strip()
-    svc = AuditService()
+    if profile:
+        _require_admin(request)
+        if stream:
+            raise HTTPException(status_code=400, detail="profile은 비스트리밍 요청에서만 지원")
+    svc = AuditService(
+        refresh=profile or wants_refresh(request), schedule=schedule, mode=mode, sample_size=sample_size, seed=seed
+    )
 
     # ─────────────────────────────────────────────────────
     # 비스트리밍 모드: 캐시/ETag 경로 (세션 유무와 무관)
     # ─────────────────────────────────────────────────────
     if not stream:
         # 1) 캐시 조회 (?refresh=1 이면 BYPASS)
-        cached = await maybe_return_cached(request, response, ttl=600)
+        cached = None if profile else await maybe_return_cached(request, response, ttl=600)
         if cached is not None:
             return etag_response(request, response, cached)
 
-        # 2) 실제 실행
-        if not session_id:
-            result = svc.audit_compliance(framework)
-        else:
+        # 2) 실제 실행 (같은 요청이 다른 워커에서 실행 중이면 그 결과를 기다림)
+        def run():
+            if not session_id:
+                return svc.audit_compliance(framework)
             s = ensure_session(
                 session_id, region=settings.AWS_REGION, profile=None, ttl_seconds=session_ttl
             )
+            if wants_refresh(request):
+                s.facts.clear()
             with use_session(s):
                 # 세션이 어떤 프레임워크에 사용되는지 기록
                 mark_session_framework(s, framework)
-                result = svc.audit_compliance(framework)
+                return svc.audit_compliance(framework)
 
-        # 3) 캐시에 저장 + ETag/Cache-Control
-        store_response_to_cache(request, result)
+        if profile:
+            return await run_in_threadpool(_profiled, response, run)
+
+        # 3) 캐시에 저장(single_flight 내부) + ETag/Cache-Control
+        result = await single_flight(request, response, run)
         response.headers["Cache-Control"] = "public, max-age=600"
         return etag_response(request, response, result)
 
@@ -94,16 +205,18 @@ async def audit_framework(
     if not session_id:
 
         def gen_ndjson_no_session():
-            reqs = svc.mapping_client.get_requirements(framework)
-            total = len(reqs)
+            graph = svc.mapping_client.prefetch_requirement_mappings(framework)
+            total = len(graph)
             yield (
                 json.dumps({"type": "meta", "framework": framework, "total": total}, ensure_ascii=False)
                 + "\n"
             )
             executed = 0
-            for r in reqs:
-                res = svc.audit_requirement(framework, r.id)
+            truncated = 0
+            # registry 모드는 요건 순서, 그 외 모드는 매핑이 모두 끝난 요건부터 전송
+            for res in svc.iter_requirements(framework, graph):
                 executed += 1
+                truncated += sum(1 for rr in res.results if rr.truncated)
                 yield (
                     json.dumps(
                         {
@@ -113,7 +226,7 @@ async def audit_framework(
                             "item_code": res.item_code,
                             "requirement_status": res.requirement_status,
                             "summary": res.summary,
-                            "results": [rr.dict() for rr in res.results],
+                            "results": jsonable_encoder(res.results),
                         },
                         ensure_ascii=False,
                     )
@@ -121,59 +234,70 @@ async def audit_framework(
                 )
             yield (
                 json.dumps(
-                    {"type": "summary", "framework": framework, "executed": executed, "total": total},
+                    {"type": "summary", "framework": framework, "executed": executed, "truncated": truncated, "total": total},
                     ensure_ascii=False,
                 )
                 + "\n"
             )
 
         return StreamingResponse(
-            gen_ndjson_no_session(), media_type="application/x-ndjson; charset=utf-8"
+            tracing.trace_stream(
+                metrics.track_stream(gen_ndjson_no_session(), framework),
+                "audit.run", **{"audit.framework": framework, "audit.scope": "stream"},
+            ),
+            media_type="application/x-ndjson; charset=utf-8",
         )
 
     # 세션 모드 스트리밍
     s = ensure_session(session_id, region=settings.AWS_REGION, profile=None, ttl_seconds=session_ttl)
+    if wants_refresh(request):
+        s.facts.clear()
 
     def gen_ndjson_with_session():
-        with use_session(s):
-            # 스트리밍 시작 시에도 프레임워크 태깅
-            mark_session_framework(s, framework)
+        # 스트리밍 시작 시에도 프레임워크 태깅
+        mark_session_framework(s, framework)
 
-            reqs = svc.mapping_client.get_requirements(framework)
-            total = len(reqs)
-            yield (
-                json.dumps({"type": "meta", "framework": framework, "total": total}, ensure_ascii=False)
-                + "\n"
-            )
-            executed = 0
-            for r in reqs:
-                res = svc.audit_requirement(framework, r.id)
-                executed += 1
-                yield (
-                    json.dumps(
-                        {
-                            "type": "requirement",
-                            "framework": res.framework,
-                            "requirement_id": res.requirement_id,
-                            "item_code": res.item_code,
-                            "requirement_status": res.requirement_status,
-                            "summary": res.summary,
-                            "results": [rr.dict() for rr in res.results],
-                        },
-                        ensure_ascii=False,
-                    )
-                    + "\n"
-                )
+        graph = svc.mapping_client.prefetch_requirement_mappings(framework)
+        total = len(graph)
+        yield (
+            json.dumps({"type": "meta", "framework": framework, "total": total}, ensure_ascii=False)
+            + "\n"
+        )
+        executed = 0
+        truncated = 0
+        # registry 모드는 요건 순서, 그 외 모드는 매핑이 모두 끝난 요건부터 전송
+        for res in svc.iter_requirements(framework, graph):
+            executed += 1
+            truncated += sum(1 for rr in res.results if rr.truncated)
             yield (
                 json.dumps(
-                    {"type": "summary", "framework": framework, "executed": executed, "total": total},
+                    {
+                        "type": "requirement",
+                        "framework": res.framework,
+                        "requirement_id": res.requirement_id,
+                        "item_code": res.item_code,
+                        "requirement_status": res.requirement_status,
+                        "summary": res.summary,
+                        "results": jsonable_encoder(res.results),
+                    },
                     ensure_ascii=False,
                 )
                 + "\n"
             )
+        yield (
+            json.dumps(
+                {"type": "summary", "framework": framework, "executed": executed, "truncated": truncated, "total": total},
+                ensure_ascii=False,
+            )
+            + "\n"
+        )
 
     return StreamingResponse(
-        gen_ndjson_with_session(), media_type="application/x-ndjson; charset=utf-8"
+        tracing.trace_stream(
+            metrics.track_stream(stream_in_session(s, gen_ndjson_with_session()), framework),
+            "audit.run", **{"audit.framework": framework, "audit.scope": "stream"},
+        ),
+        media_type="application/x-ndjson; charset=utf-8",
     )
 
 
@@ -183,31 +307,52 @@ async def audit_requirement(
     req_id: int = Path(..., description="매핑 백엔드의 requirement.id"),
     session_id: str | None = Query(None, description="세션 ID(있으면 boto3/httpx 재사용)"),
     session_ttl: int = Query(600, ge=0, description="세션 TTL(초). 0이면 만료 관리 안함"),
+    profile: bool = Query(False, description="True면 캐시 없이 실행하며 프로파일 반환(관리자)"),
+    schedule: str | None = Query(None, pattern="^(registry|makespan|fast-lane)$", description="매핑 실행 순서: registry(등록 순서) / makespan(긴 것부터 동시 실행) / fast-lane(계정 단위 점검 먼저). 기본 AUDIT_SCHEDULE"),
+    mode: str = Query("full", pattern="^(full|sample)$", description="full: 전체 리소스 평가 / sample: 리소스별 점검(3.0-04, 2.0-01, 4.0-03, 5.0-06)은 표본만 평가하고 비준수율 신뢰구간 보고"),
+    sample_size: int | None = Query(None, ge=1, description="mode=sample 표본 크기(기본 SAMPLE_SIZE)"),
+    seed: int | None = Query(None, description="mode=sample 표본 seed(같은 seed면 같은 표본, 기본 SAMPLE_SEED)"),
     request: Request = None,
     response: Response = None,
 ):
     """
     단일 항목 감사는 항상 한 방 JSON 응답 → 캐시/ETag 적용
+    (profile=True면 캐시/ETag 없이 1회 실행 + 샘플링 프로파일)
     """
     framework = framework.strip()
-    svc = AuditService()
+    if profile:
+        _require_admin(request)
+    svc = AuditService(
+        refresh=profile or wants_refresh(request), schedule=schedule, mode=mode, sample_size=sample_size, seed=seed
+    )
 
     # 1) 캐시 조회
-    cached = await maybe_return_cached(request, response, ttl=600)
+    cached = None if profile else await maybe_return_cached(request, response, ttl=600)
     if cached is not None:
         return etag_response(request, response, cached)
 
-    # 2) 실제 실행
-    if not session_id:
-        result = svc.audit_requirement(framework, req_id)
-    else:
-        s = ensure_session(session_id, region=settings.AWS_REGION, profile=None, ttl_seconds=session_ttl)
-        with use_session(s):
-            # 단건 감사에서도 프레임워크 태깅
-            mark_session_framework(s, framework)
-            result = svc.audit_requirement(framework, req_id)
+    # 2) 실제 실행 (같은 요청이 다른 워커에서 실행 중이면 그 결과를 기다림)
+    def run():
+        if not session_id:
+            res = svc.audit_requirement(framework, req_id)
+        else:
+            s = ensure_session(session_id, region=settings.AWS_REGION, profile=None, ttl_seconds=session_ttl)
+            if wants_refresh(request):
+                s.facts.clear()
+            with use_session(s):
+                # 단건 감사에서도 프레임워크 태깅
+                mark_session_framework(s, framework)
+                res = svc.audit_requirement(framework, req_id)
+        # executor별 소요 시간(실제 실행한 경우에만)
+        timing = instrument.server_timing(res.results)
+        if timing:
+            response.headers["Server-Timing"] = timing
+        return res
+
+    if profile:
+        return await run_in_threadpool(_profiled, response, run)
 
-    # 3) 캐시에 저장 + ETag/Cache-Control
-    store_response_to_cache(request, result)
+    # 3) 캐시에 저장(single_flight 내부) + ETag/Cache-Control
+    result = await single_flight(request, response, run)
     response.headers["Cache-Control"] = "public, max-age=600"
     return etag_response(request, response, result)
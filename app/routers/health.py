@@ -1,6 +1,26 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.clients.upstream_health import upstream_status
+from app.core import rate_limit
+from app.services import registry, warmup
+from app.utils import shared_backend
+from app.utils.evidence_store import evidence_stats
 router = APIRouter()
 
 @router.get("", summary="Health")
 def health():
-    return {"status": "ok"}
+    # 기동 warm-up(WARMUP_ENABLED) 중에는 503 → 로드밸런서가 준비 완료 후에만 트래픽을 보냄
+    if warmup.status().get("status") == "warming":
+        return JSONResponse(status_code=503, content={"status": "warming", "warmup": warmup.status()})
+    # 업스트림별 서킷 상태(closed/open/half-open). 감사 서버 자체는 업스트림 장애와 무관하게 ok
+    # awsThrottled: 스로틀이 발생한 AWS API 버킷의 현재 속도, cache: 공유 저장소/계층별 적중률
+    # evidence: 증거 저장소 기록/중복 제거 통계
+    return {
+        "status": "ok",
+        "warmup": warmup.status(),
+        "upstreams": upstream_status(),
+        "awsThrottled": rate_limit.stats(only_throttled=True),
+        "executorImports": registry.import_stats(),
+        "cache": shared_backend.describe(),
+        "evidence": evidence_stats(),
+    }
@@ -0,0 +1,9 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core import metrics
+router = APIRouter()
+
+@router.get("", summary="Metrics (Prometheus text format)", response_class=PlainTextResponse)
+def metrics_text():
+    # 감사 처리량/지연, AWS 호출, 캐시 적중/축출, 세션, 진행 중 감사, 이벤트 루프 지연
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,9 +1,17 @@
 # app/services/audit_service.py
 from __future__ import annotations
-from typing import List, Dict, Any
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator
+from fastapi.encoders import jsonable_encoder
 from app.clients.mapping_client import MappingClient
+from app.services import scheduler
 from app.services.registry import make_executor
-from app.models.schemas import AuditResult, RequirementAuditResponse, Status
+from app.models.schemas import AuditResult, RequirementAuditResponse, RequirementDetailOut, Status
+from app.core import budget, instrument, metrics, profiler, sampling, tracing
+from app.core.config import settings
+from app.core.session import CURRENT_AUDIT_SESSION
+from app.utils import shared_backend, snapshot
 
 def _summarize_status(results: List[AuditResult]) -> Dict[str, int]:
     summary = {"COMPLIANT": 0, "NON_COMPLIANT": 0, "SKIPPED": 0, "ERROR": 0}
@@ -21,30 +29,239 @@ def _decide_overall_status(summary: Dict[str, int]) -> Status:
         return "COMPLIANT"
     return "SKIPPED"
 
+def _account_key() -> str:
+    s = CURRENT_AUDIT_SESSION.get()
+    profile = (s.profile if s is not None else None) or "default"
+    region = (s.region if s is not None else None) or settings.AWS_REGION or ""
+    return f"{profile}@{region}"
+
+def _result_key(code: str) -> str:
+    # 매핑 결과는 계정(프로파일)/리전 단위 사실 → 워커/요건/세션 간 공유
+    return f"RESULT:{_account_key()}:{code}"
+
 class AuditService:
-    def __init__(self, mapping_client: MappingClient | None = None):
+    def __init__(
+        self,
+        mapping_client: MappingClient | None = None,
+        refresh: bool = False,
+        schedule: str | None = None,
+        mode: str = "full",
+        sample_size: int | None = None,
+        seed: int | None = None,
+    ):
         self.mapping_client = mapping_client or MappingClient()
+        self.refresh = refresh  # True면 매핑별 결과 캐시를 읽지 않음(이번 실행에서 처음 만나는 매핑은 새로 실행 후 갱신)
+        self.schedule = schedule or settings.AUDIT_SCHEDULE  # registry / makespan / fast-lane (app.services.scheduler)
+        # mode=sample: 리소스별 executor는 (표본 크기, seed) 표본만 평가(app.core.sampling)
+        self.sample = (
+            (int(sample_size or settings.SAMPLE_SIZE), int(settings.SAMPLE_SEED if seed is None else seed))
+            if mode == "sample" else None
+        )
+        self._refreshed: set = set()
+        self.deadline = None  # 요청 전체 마감 시각(AUDIT_RUN_DEADLINE_SECONDS). 실행 중에만 설정(_run_window)
+        self._running = False
+
+    @contextmanager
+    def _run_window(self):
+        """
+        마감 시각은 실제 감사 시작 시점부터 계산(single_flight 대기, 스트림 시작 지연은 제외).
+        audit_compliance → iter_requirements처럼 중첩되면 바깥 호출의 마감을 그대로 사용
+        """
+        if self._running:
+            yield
+            return
+        self._running = True
+        self.deadline = budget.run_deadline()
+        try:
+            yield
+        finally:
+            self._running = False
+            self.deadline = None
+
+    @staticmethod
+    def _audit_safely(code: str, executor) -> AuditResult:
+        # executor 내부의 예기치 못한 예외(모델 검증 실패, 잘못된 API 이름 등)가 전체 감사를 중단시키지 않도록 ERROR로 기록
+        try:
+            return executor.audit()
+        except Exception as e:
+            return AuditResult(
+                mapping_code=code,
+                title=getattr(executor, "title", None),
+                status="ERROR",
+                reason=f"{type(e).__name__}: {e}",
+            )
+
+    def _bounded(self, code: str, executor) -> AuditResult:
+        if not budget.enabled():
+            return self._audit_safely(code, executor)
+        if budget.expired(self.deadline):
+            # 마감 시간이 지나면 남은 executor는 실행하지 않고 바로 반환(전체 응답이 한 executor에 묶이지 않도록)
+            metrics.MAPPING_TRUNCATED.inc(code=code, reason="deadline")
+            return AuditResult(
+                mapping_code=code,
+                title=getattr(executor, "title", None),
+                status="ERROR",
+                reason="감사 마감 시간 초과: 실행하지 않음",
+                truncated={"reason": "deadline", "limit": float(settings.AUDIT_RUN_DEADLINE_SECONDS),
+                           "awsCalls": 0, "started": False},
+            )
+        with budget.limit(code, self.deadline) as b:
+            result = self._audit_safely(code, executor)
+        if b.tripped is not None:
+            self._truncate(code, result, b)
+        return result
+
+    @staticmethod
+    def _truncate(code: str, result: AuditResult, b: "budget.ExecutorBudget"):
+        # 예산 초과 뒤 막힌 호출로 생긴 평가(권한 없음/읽기 실패 등으로 보이는 행)는 버리고 그 전까지의 평가만 남김
+        kept = [ev for ev in result.evaluations if not budget.marked(ev.extra, ev.decision, ev.observed_value)]
+        dropped = len(result.evaluations) - len(kept)
+        result.evaluations = kept
+        result.truncated = b.summary(dropped=dropped)
+        # 부분 평가만으로는 준수를 단정할 수 없음: 위반이 하나라도 확인됐으면 NON_COMPLIANT, 아니면 ERROR
+        result.status = "NON_COMPLIANT" if any(ev.status == "NON_COMPLIANT" for ev in kept) else "ERROR"
+        result.reason = f"감사 예산 초과({b.tripped}): 부분 평가 {len(kept)}건"
+        metrics.MAPPING_TRUNCATED.inc(code=code, reason=b.tripped)
+
+    def _sampled(self, code: str, executor) -> AuditResult:
+        if self.sample is None:
+            return self._bounded(code, executor)
+        with sampling.use(*self.sample) as state:
+            result = self._bounded(code, executor)
+        # 표본을 지원하는 executor(choose() 호출)만 표시, 나머지는 전체 평가 그대로
+        if state.population is not None:
+            result.sampled = state.summary(result.evaluations)
+        return result
+
+    def _execute(self, code: str, executor) -> AuditResult:
+        t0 = time.perf_counter()
+        prof = profiler.current()
+        if prof is not None:
+            # 관리자 프로파일 실행: 이 executor 동안의 스택 샘플을 매핑 코드로 분류
+            with prof.label(code):
+                result = self._measured(code, executor)
+        else:
+            result = self._measured(code, executor)
+        # 스케줄러의 계정별 소요 시간 통계(캐시 적중은 제외: 실제 실행만 기록)
+        scheduler.STATS.record(_account_key(), code, time.perf_counter() - t0)
+        return result
+
+    def _measured(self, code: str, executor) -> AuditResult:
+        if not instrument.enabled():
+            result = self._sampled(code, executor)
+            metrics.MAPPING_RUNS.inc(code=code, status=result.status)
+            return result
+        with instrument.measure(code) as t:
+            result = self._sampled(code, executor)
+        result.timing = t.summary(evaluations=len(result.evaluations))
+        metrics.MAPPING_RUNS.inc(code=code, status=result.status)
+        metrics.MAPPING_DURATION.observe(t.wall_ms / 1000.0, code=code)
+        return result
+
+    def _run_mapping(self, code: str) -> AuditResult:
+        with tracing.span("audit.executor", **{"mapping.code": code}) as s:
+            result = self._run_mapping_inner(code)
+            if s is not None:
+                s.set("audit.status", result.status)
+                s.set("audit.cached", bool(result.timing and result.timing.get("cached")))
+                s.set("audit.evaluations", len(result.evaluations))
+                if result.truncated:
+                    s.set("audit.truncated", result.truncated.get("reason"))
+            return result
+
+    def _run_mapping_inner(self, code: str) -> AuditResult:
+        ttl = float(settings.MAPPING_RESULT_TTL_SECONDS)
+        executor = make_executor(code)
+        if not executor:
+            return AuditResult(
+                mapping_code=code,
+                status="SKIPPED",
+                reason="미구현 매핑",
+                evaluations=[],
+                evidence={},
+            )
+        # record 모드는 모든 AWS 응답을 남겨야 하므로 결과 캐시를 쓰지 않음
+        if ttl <= 0 or snapshot.mode() == "record":
+            return self._execute(code, executor)
+        key = _result_key(code)
+        if self.sample is not None:
+            key += ":sample:%d:%d" % self.sample
+        if not self.refresh or code in self._refreshed:
+            cached = shared_backend.get_json(key)
+            if cached is not None:
+                try:
+                    result = AuditResult(**cached)
+                    if result.timing is not None:
+                        result.timing = {"cached": True, "wallMs": 0.0, "evaluations": len(result.evaluations)}
+                    metrics.CACHE_LOOKUPS.inc(cache="mapping_result", result="hit")
+                    return result
+                except Exception:
+                    pass
+            metrics.CACHE_LOOKUPS.inc(cache="mapping_result", result="miss")
+        result = self._execute(code, executor)
+        self._refreshed.add(code)
+        # 오류/예산 초과로 잘린 결과는 캐시하지 않음
+        if result.status != "ERROR" and result.truncated is None:
+            shared_backend.set_json(key, jsonable_encoder(result), ttl=ttl)
+        return result
 
     def audit_requirement(self, framework: str, req_id: int) -> RequirementAuditResponse:
-        detail = self.mapping_client.get_requirement_mappings(framework, req_id)
+        with self._run_window(), metrics.track_audit(framework, "requirement"), \
+                tracing.span("audit.run", **{"audit.framework": framework, "audit.scope": "requirement"}):
+            detail = self.mapping_client.get_requirement_mappings(framework, req_id)
+            return list(self.iter_requirements(framework, {req_id: detail}))[0]
+
+    def iter_requirements(self, framework: str, graph: Dict[Any, RequirementDetailOut]) -> Iterator[RequirementAuditResponse]:
+        """요건별 감사 결과. registry 모드는 그래프 순서대로, 그 외 모드는 매핑이 모두 끝난 요건부터"""
+        with self._run_window():
+            try:
+                if self.schedule not in scheduler.MODES or self.schedule == "registry":
+                    for detail in graph.values():
+                        yield self.audit_detail(framework, detail)
+                else:
+                    yield from self._scheduled(framework, list(graph.values()))
+            finally:
+                scheduler.STATS.save()
+                # record 모드면 이번 실행의 응답을 스냅샷 파일에 반영(스트리밍/단건 포함)
+                snapshot.flush()
+
+    def _scheduled(self, framework: str, details: List[RequirementDetailOut]) -> Iterator[RequirementAuditResponse]:
+        # 매핑 코드 → 그 매핑을 쓰는 요건 인덱스(같은 매핑은 한 번만 실행), 요건별 남은 매핑 수
+        waiting: Dict[str, List[int]] = {}
+        remaining: List[int] = []
+        for i, detail in enumerate(details):
+            codes = list(dict.fromkeys(m.code for m in detail.mappings))
+            remaining.append(len(codes))
+            for code in codes:
+                waiting.setdefault(code, []).append(i)
+        for i, detail in enumerate(details):
+            if not remaining[i]:
+                yield self._requirement_response(framework, detail, [])
+
+        results: Dict[str, AuditResult] = {}
+        for code, result in scheduler.run(list(waiting), self._run_mapping, mode=self.schedule, account=_account_key()):
+            if isinstance(result, Exception):
+                result = AuditResult(mapping_code=code, status="ERROR", reason=f"{type(result).__name__}: {result}")
+            results[code] = result
+            for i in waiting[code]:
+                remaining[i] -= 1
+                if not remaining[i]:
+                    detail = details[i]
+                    yield self._requirement_response(framework, detail, [results[m.code] for m in detail.mappings])
+
+    def audit_detail(self, framework: str, detail: RequirementDetailOut) -> RequirementAuditResponse:
         req = detail.requirement
         results: List[AuditResult] = []
 
-        for m in detail.mappings:
-            executor = make_executor(m.code)
-            if executor:
-                results.append(executor.audit())
-            else:
-                results.append(
-                    AuditResult(
-                        mapping_code=m.code,
-                        status="SKIPPED",
-                        reason="미구현 매핑",
-                        evaluations=[],
-                        evidence={},
-                    )
-                )
+        with tracing.span("audit.requirement", **{"audit.requirement_id": req.id, "audit.item_code": req.item_code}):
+            for m in detail.mappings:
+                results.append(self._run_mapping(m.code))
+
+        return self._requirement_response(framework, detail, results)
 
+    @staticmethod
+    def _requirement_response(framework: str, detail: RequirementDetailOut, results: List[AuditResult]) -> RequirementAuditResponse:
+        req = detail.requirement
         summary = _summarize_status(results)
         requirement_status = _decide_overall_status(summary)
 
@@ -58,15 +275,28 @@ class AuditService:
         )
 
     def audit_compliance(self, framework: str) -> Dict[str, Any]:
-        reqs = self.mapping_client.get_requirements(framework)
+        with self._run_window(), metrics.track_audit(framework, "all"), \
+                tracing.span("audit.run", **{"audit.framework": framework, "audit.scope": "all"}):
+            return self._audit_compliance(framework)
+
+    def _audit_compliance(self, framework: str) -> Dict[str, Any]:
+        # 실행 전에 요건→매핑 그래프 전체를 확보(미러 또는 동시 프리페치)
+        graph = self.mapping_client.prefetch_requirement_mappings(framework)
         out: Dict[str, Any] = {
             "framework": framework,
-            "total_requirements": len(reqs),
+            "total_requirements": len(graph),
             "executed": 0,
+            "truncated": 0,
             "results": [],
         }
-        for r in reqs:
-            res = self.audit_requirement(framework, r.id)
+        # 스케줄 모드에 따라 끝나는 순서가 달라도 응답은 그래프(요건) 순서로
+        done: Dict[int, RequirementAuditResponse] = {}
+        order = {detail.requirement.id: i for i, detail in enumerate(graph.values())}
+        for res in self.iter_requirements(framework, graph):
+            done[order[res.requirement_id]] = res
+        for i in sorted(done):
+            res = done[i]
             out["results"].append(res.dict())
             out["executed"] += 1
+            out["truncated"] += sum(1 for r in res.results if r.truncated)
         return out
@@ -0,0 +1,172 @@
+# app/services/datasource.py
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
+
+from app.core.config import settings
+from app.core import aws, fact_cache
+from app.clients.collector_client import CollectorClient
+
+# 리소스 사실(fact) 조회 계층
+# - executor는 boto3를 직접 나열하지 않고 datasource().list(kind)로 인벤토리를 받는다
+# - "collector": Collector API에서 전체 인벤토리를 일괄 조회, 실패/형식 불충분 시 종류별로 SDK 폴백
+# - "sdk"      : 항상 boto3로 조회
+# 반환 레코드는 AWS SDK 응답과 같은 모양(키 이름)으로 정규화한다.
+
+Inventory = Tuple[List[Dict[str, Any]], str]  # (records, origin: "collector" | "aws-sdk")
+
+
+class ResourceSource(Protocol):
+    name: str
+    def list(self, kind: str) -> Inventory: ...
+
+
+# ── SDK 나열 함수 ────────────────────────────────────────────────────────────
+def _paginate(service: str, op: str, key: str, **params) -> List[Dict[str, Any]]:
+    cli = aws.client(service)
+    out: List[Any] = []
+    for page in cli.get_paginator(op).paginate(**params):
+        out.extend(page.get(key, []) or [])
+    return out
+
+
+def _sdk_s3_buckets() -> List[Dict[str, Any]]:
+    return list(aws.client("s3").list_buckets().get("Buckets", []) or [])
+
+
+def _sdk_dynamodb_tables() -> List[Dict[str, Any]]:
+    return [{"TableName": n} for n in _paginate("dynamodb", "list_tables", "TableNames")]
+
+
+def _sdk_rds_instances() -> List[Dict[str, Any]]:
+    return _paginate("rds", "describe_db_instances", "DBInstances")
+
+
+def _sdk_redshift_clusters() -> List[Dict[str, Any]]:
+    return _paginate("redshift", "describe_clusters", "Clusters")
+
+
+def _sdk_efs_filesystems() -> List[Dict[str, Any]]:
+    return _paginate("efs", "describe_file_systems", "FileSystems")
+
+
+def _sdk_elasticache_clusters() -> List[Dict[str, Any]]:
+    return _paginate("elasticache", "describe_cache_clusters", "CacheClusters")
+
+
+def _sdk_kinesis_streams() -> List[Dict[str, Any]]:
+    return [{"StreamName": n} for n in _paginate("kinesis", "list_streams", "StreamNames")]
+
+
+def _sdk_msk_clusters() -> List[Dict[str, Any]]:
+    return _paginate("kafka", "list_clusters", "ClusterInfoList")
+
+
+# kind → (SDK 나열 함수, Collector 메서드명, 식별자 키, 식별자 별칭, 레코드에 반드시 있어야 할 필드)
+_KINDS: Dict[str, Tuple[Callable[[], List[Dict[str, Any]]], str, str, Tuple[str, ...], Tuple[str, ...]]] = {
+    "s3_buckets": (_sdk_s3_buckets, "list_s3_buckets", "Name", ("name", "bucket_name", "Bucket", "bucket"), ()),
+    "dynamodb_tables": (_sdk_dynamodb_tables, "list_dynamodb_tables", "TableName", ("name", "table_name", "Name"), ()),
+    "rds_instances": (
+        _sdk_rds_instances, "list_rds_instances", "DBInstanceIdentifier",
+        ("db_instance_identifier", "id", "name"), ("StorageEncrypted", "MultiAZ"),
+    ),
+    "redshift_clusters": (
+        _sdk_redshift_clusters, "list_redshift_clusters", "ClusterIdentifier",
+        ("cluster_identifier", "id", "name"), ("Encrypted",),
+    ),
+    "efs_filesystems": (
+        _sdk_efs_filesystems, "list_efs_filesystems", "FileSystemId",
+        ("file_system_id", "id"), ("Encrypted",),
+    ),
+    "elasticache_clusters": (
+        _sdk_elasticache_clusters, "list_elasticache_clusters", "CacheClusterId",
+        ("cache_cluster_id", "id", "name"), (),
+    ),
+    "kinesis_streams": (_sdk_kinesis_streams, "list_kinesis_streams", "StreamName", ("name", "stream_name"), ()),
+    "msk_clusters": (_sdk_msk_clusters, "list_msk_clusters", "ClusterArn", ("cluster_arn", "arn"), ()),
+}
+
+RESOURCE_KINDS = tuple(_KINDS.keys())
+
+
+def _kind(kind: str):
+    spec = _KINDS.get(kind)
+    if spec is None:
+        raise ValueError(f"unknown resource kind: {kind}")
+    return spec
+
+
+class SdkSource:
+    name = "sdk"
+
+    def list(self, kind: str) -> Inventory:
+        sdk_fn = _kind(kind)[0]
+        return sdk_fn(), "aws-sdk"
+
+
+class CollectorSource:
+    """
+    Collector 우선. 종류별로
+      - 호출 실패
+      - 식별자 키를 찾을 수 없는 레코드
+      - 판정에 필요한 필드가 빠진 레코드
+    가 있으면 그 종류만 fallback(SDK)으로 조회한다.
+    """
+    name = "collector"
+
+    def __init__(self, client: Optional[CollectorClient] = None, fallback: Optional[ResourceSource] = None):
+        self.client = client or CollectorClient(timeout=float(settings.COLLECTOR_TIMEOUT_SECONDS))
+        self.fallback = fallback or SdkSource()
+
+    def _normalize(self, kind: str, data: Any) -> Optional[List[Dict[str, Any]]]:
+        _, _, id_key, aliases, required = _kind(kind)
+        if isinstance(data, dict):
+            # {"items": [...]} 형태 허용
+            data = data.get("items") or data.get("data") or data.get("results")
+        if not isinstance(data, list):
+            return None
+        out: List[Dict[str, Any]] = []
+        for x in data:
+            if isinstance(x, str):
+                if required:
+                    return None
+                out.append({id_key: x})
+                continue
+            if not isinstance(x, dict):
+                return None
+            rec = dict(x)
+            if not rec.get(id_key):
+                ident = next((rec.get(a) for a in aliases if rec.get(a)), None)
+                if not ident:
+                    return None
+                rec[id_key] = ident
+            if any(f not in rec for f in required):
+                return None
+            out.append(rec)
+        return out
+
+    def list(self, kind: str) -> Inventory:
+        method = _kind(kind)[1]
+        try:
+            data = getattr(self.client, method)()
+            records = self._normalize(kind, data)
+            if records is not None:
+                return records, "collector"
+        except Exception:
+            pass
+        return self.fallback.list(kind)
+
+
+def datasource() -> ResourceSource:
+    if (settings.DATA_SOURCE or "").lower() == "collector":
+        return CollectorSource()
+    return SdkSource()
+
+
+def list_resources(kind: str) -> Inventory:
+    # 감사 세션이 있으면 세션 사실 캐시("inventory" 유형 TTL)에서 재사용
+    cache = fact_cache.current()
+    if cache is None:
+        return datasource().list(kind)
+    records, origin = cache.get_or_load("inventory", kind, lambda: datasource().list(kind))
+    return records, origin
@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import List, Dict, Any
 import boto3, botocore
 from app.models.schemas import AuditResult, ServiceEvaluation
+from app.services.datasource import list_resources
 
 class Exec_11_0_03:
     code = "11.0-03"
@@ -14,7 +15,7 @@ class Exec_11_0_03:
 
         try:
             # 모든 버킷 순회 (조직/계정 정책에 따라 제한될 수 있음)
-            buckets = s3.list_buckets().get("Buckets", [])
+            buckets, _ = list_resources("s3_buckets")
             for b in buckets:
                 name = b.get("Name")
                 evidence["bucketsChecked"] += 1
@@ -3,6 +3,7 @@ from typing import List, Dict, Any
 import json
 import boto3, botocore
 from app.models.schemas import AuditResult, ServiceEvaluation
+from app.services.datasource import list_resources
 
 class Exec_12_0_04:
     code = "12.0-04"
@@ -19,7 +20,7 @@ class Exec_12_0_04:
         }
 
         try:
-            buckets = s3.list_buckets().get("Buckets", []) or []
+            buckets, _ = list_resources("s3_buckets")
             if not buckets:
                 return AuditResult(
                     mapping_code=self.code, title=self.title, status="SKIPPED",
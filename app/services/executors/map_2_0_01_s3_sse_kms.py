@@ -1,8 +1,10 @@
 # app/services/executors/map_2_0_01_s3_sse_kms.py
-import httpx
 from botocore.exceptions import ClientError
 from app.models.schemas import AuditResult, ServiceEvaluation
 from app.core.config import settings
+from app.utils.evidence_store import put_evidence
+from app.services.datasource import list_resources
+from app.core import sampling
 
 try:
     from app.core.aws import s3 as _s3_factory
@@ -13,8 +15,6 @@ except Exception:
     def _s3():
         return boto3.client("s3", region_name=getattr(settings, "AWS_REGION", None))
 
-COLLECTOR_BASE = "http://localhost:8000"
-
 def _final_status(evals):
     if any(e.status == "ERROR" for e in evals):
         return "ERROR"
@@ -33,25 +33,10 @@ class Exec_2_0_01:
     code = "2.0-01"
 
     def _list_buckets(self) -> list[str]:
+        # Collector 우선, 실패 시 SDK(list_buckets) 폴백 — app.services.datasource
         try:
-            with httpx.Client(timeout=10.0) as c:
-                r = c.get(f"{COLLECTOR_BASE}/api/s3-buckets")
-                r.raise_for_status()
-                data = r.json()
-                names = []
-                for x in data or []:
-                    if isinstance(x, str):
-                        names.append(x)
-                    elif isinstance(x, dict):
-                        names.append(x.get("name") or x.get("bucket_name") or x.get("Bucket") or x.get("Name"))
-                return [n for n in names if n]
-        except Exception:
-            pass
-
-        try:
-            s3 = _s3()
-            resp = s3.list_buckets()
-            return [b["Name"] for b in resp.get("Buckets", [])]
+            buckets, _ = list_resources("s3_buckets")
+            return [b["Name"] for b in buckets if b.get("Name")]
         except Exception:
             return []
 
@@ -78,7 +63,9 @@ class Exec_2_0_01:
 
     def audit(self) -> AuditResult:
         evaluations: list[ServiceEvaluation] = []
-        buckets = self._list_buckets()
+        # 표본 모드(?mode=sample)면 재현 가능한 표본만 GetBucketEncryption(전체 수는 표본 전에 기록)
+        listed = self._list_buckets()
+        buckets = sampling.choose(listed, key=lambda b: b)
 
         if not buckets:
             evaluations.append(ServiceEvaluation(
@@ -122,7 +109,7 @@ class Exec_2_0_01:
                     decision=decision,
                     status="COMPLIANT" if passed else "NON_COMPLIANT",
                     source="aws-sdk",
-                    extra={"raw": raw}
+                    extra={"raw": put_evidence(raw)}
                 ))
 
             except ClientError as e:
@@ -173,7 +160,7 @@ class Exec_2_0_01:
                     extra={"error": str(e)}
                 ))
 
-        total = len(buckets)
+        total = len(listed)
         kms_ok = sum(1 for ev in evaluations if ev.status == "COMPLIANT")
         not_ok = sum(1 for ev in evaluations if ev.status == "NON_COMPLIANT")
         skipped = sum(1 for ev in evaluations if ev.status == "SKIPPED")
@@ -183,5 +170,5 @@ class Exec_2_0_01:
             mapping_code=self.code,
             status=_final_status(evaluations),
             evaluations=evaluations,
-            evidence={"totalBuckets": total, "kmsCompliant": kms_ok, "nonCompliant": not_ok, "skipped": skipped, "errors": errors}
+            evidence={"totalBuckets": total, "checkedBuckets": len(buckets), "kmsCompliant": kms_ok, "nonCompliant": not_ok, "skipped": skipped, "errors": errors}
         )
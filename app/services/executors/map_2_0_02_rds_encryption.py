@@ -1,22 +1,19 @@
 from __future__ import annotations
 from typing import List, Dict, Any
-import boto3, botocore
+import botocore
 from app.models.schemas import AuditResult, ServiceEvaluation
+from app.services.datasource import list_resources
 
 class Exec_2_0_02:
     code = "2.0-02"
     title = "RDS"
 
     def audit(self) -> AuditResult:
-        client = boto3.client("rds")
         evals: List[ServiceEvaluation] = []
         evidence: Dict[str, Any] = {"dbInstances": 0, "encrypted": 0, "nonEncrypted": []}
 
         try:
-            paginator = client.get_paginator("describe_db_instances")
-            dbs = []
-            for page in paginator.paginate():
-                dbs.extend(page.get("DBInstances", []))
+            dbs, origin = list_resources("rds_instances")
 
             evidence["dbInstances"] = len(dbs)
             for db in dbs:
@@ -38,7 +35,7 @@ class Exec_2_0_02:
                     passed=passed,
                     decision=f"observed {enc} == True → {'passed' if passed else 'failed'}",
                     status="COMPLIANT" if passed else "NON_COMPLIANT",
-                    source="aws-sdk",
+                    source=origin,
                     extra={}
                 ))
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import List, Dict, Any
 import boto3, botocore
 from app.models.schemas import AuditResult, ServiceEvaluation
+from app.services.datasource import list_resources
 
 class Exec_2_0_03:
     code = "2.0-03"
@@ -13,10 +14,7 @@ class Exec_2_0_03:
         evidence: Dict[str, Any] = {"tables": 0, "enabled": 0, "disabled": []}
 
         try:
-            tables = []
-            paginator = client.get_paginator("list_tables")
-            for page in paginator.paginate():
-                tables.extend(page.get("TableNames", []))
+            tables = [t["TableName"] for t in list_resources("dynamodb_tables")[0]]
             evidence["tables"] = len(tables)
 
             for t in tables:
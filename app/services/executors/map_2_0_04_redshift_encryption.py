@@ -1,19 +1,19 @@
 from __future__ import annotations
 from typing import List, Dict, Any
-import boto3, botocore
+import botocore
 from app.models.schemas import AuditResult, ServiceEvaluation
+from app.services.datasource import list_resources
 
 class Exec_2_0_04:
     code = "2.0-04"
     title = "Redshift"
 
     def audit(self) -> AuditResult:
-        client = boto3.client("redshift")
         evals: List[ServiceEvaluation] = []
         ev: Dict[str, Any] = {"clusters": 0, "encrypted": 0, "nonEncrypted": []}
 
         try:
-            clusters = client.describe_clusters().get("Clusters", [])
+            clusters, origin = list_resources("redshift_clusters")
             ev["clusters"] = len(clusters)
             for c in clusters:
                 cid = c["ClusterIdentifier"]
@@ -28,7 +28,7 @@ class Exec_2_0_04:
                     observed_value=enc, passed=enc,
                     decision=f"observed {enc} == True → {'passed' if enc else 'failed'}",
                     status="COMPLIANT" if enc else "NON_COMPLIANT",
-                    source="aws-sdk", extra={}
+                    source=origin, extra={}
                 ))
 
             final = "NON_COMPLIANT" if ev["nonEncrypted"] else "COMPLIANT"
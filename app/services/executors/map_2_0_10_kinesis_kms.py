@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import List, Dict, Any
 import boto3, botocore
 from app.models.schemas import AuditResult, ServiceEvaluation
+from app.services.datasource import list_resources
 
 class Exec_2_0_10:
     code = "2.0-10"
@@ -12,7 +13,7 @@ class Exec_2_0_10:
         evals: List[ServiceEvaluation] = []
         ev: Dict[str, Any] = {"streams": 0, "kms": 0, "none": []}
         try:
-            streams = client.list_streams().get("StreamNames", [])
+            streams = [s["StreamName"] for s in list_resources("kinesis_streams")[0]]
             ev["streams"] = len(streams)
             for s in streams:
                 summ = client.describe_stream_summary(StreamName=s)["StreamDescriptionSummary"]
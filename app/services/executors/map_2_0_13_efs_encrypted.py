@@ -1,18 +1,18 @@
 from __future__ import annotations
 from typing import List, Dict, Any
-import boto3, botocore
+import botocore
 from app.models.schemas import AuditResult, ServiceEvaluation
+from app.services.datasource import list_resources
 
 class Exec_2_0_13:
     code = "2.0-13"
     title = "EFS"
 
     def audit(self) -> AuditResult:
-        client = boto3.client("efs")
         evals: List[ServiceEvaluation] = []
         ev: Dict[str, Any] = {"fileSystems": 0, "encrypted": 0, "nonEncrypted": []}
         try:
-            fss = client.describe_file_systems().get("FileSystems", [])
+            fss, origin = list_resources("efs_filesystems")
             ev["fileSystems"] = len(fss)
             for fs in fss:
                 fsid = fs["FileSystemId"]
@@ -24,7 +24,7 @@ class Exec_2_0_13:
                     service="EFS", resource_id=fsid, evidence_path="FileSystems[*].Encrypted",
                     checked_field="Encrypted", comparator="eq", expected_value=True,
                     observed_value=enc, passed=enc, decision=f"observed {enc} == True → {'passed' if enc else 'failed'}",
-                    status="COMPLIANT" if enc else "NON_COMPLIANT", source="aws-sdk", extra={}
+                    status="COMPLIANT" if enc else "NON_COMPLIANT", source=origin, extra={}
                 ))
 
             final = "NON_COMPLIANT" if ev["nonEncrypted"] else "COMPLIANT"
@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import List, Dict, Any
 import boto3, botocore
 from app.models.schemas import AuditResult, ServiceEvaluation
+from app.services.datasource import list_resources
 
 class Exec_2_0_14:
     code = "2.0-14"
@@ -12,7 +13,7 @@ class Exec_2_0_14:
         evals: List[ServiceEvaluation] = []
         ev: Dict[str, Any] = {"clusters": 0, "ok": 0, "notOk": []}
         try:
-            arns = client.list_clusters().get("ClusterInfoList", [])
+            arns, _ = list_resources("msk_clusters")
             ev["clusters"] = len(arns)
             for info in arns:
                 arn = info["ClusterArn"]
@@ -31,7 +32,7 @@ class Exec_2_0_14:
                     service="MSK", resource_id=arn,
                     evidence_path="ClusterInfo.EncryptionInfo",
                     checked_field="At-rest/Transit encryption",
-                    comparator="custom", expected_value="KMS at-rest & TLS transit",
+                    comparator="eq", expected_value="KMS at-rest & TLS transit",
                     observed_value={"atRestKMS": bool(at_rest), "inTransit": in_transit},
                     passed=ok, decision="configured" if ok else "missing",
                     status="COMPLIANT" if ok else "NON_COMPLIANT", source="aws-sdk", extra={}
@@ -54,7 +55,7 @@ class Exec_2_0_14:
                 mapping_code=self.code, title=self.title, status="SKIPPED",
                 evaluations=[ServiceEvaluation(
                     service="MSK", resource_id=None, evidence_path="ClusterInfo.EncryptionInfo",
-                    checked_field="Encryption", comparator="custom", expected_value="configured",
+                    checked_field="Encryption", comparator="eq", expected_value="configured",
                     observed_value=None, passed=None, decision="cannot evaluate: missing permissions",
                     status="SKIPPED", source="aws-sdk", extra={"error": str(e)}
                 )], evidence={}, reason="Missing permissions", extract=None
@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import List, Dict, Any
 import boto3, botocore
 from app.models.schemas import AuditResult, ServiceEvaluation
+from app.core import sampling
 
 class Exec_3_0_04:
     code = "3.0-04"
@@ -17,8 +18,11 @@ class Exec_3_0_04:
             groups = []
             for page in paginator.paginate():
                 groups.extend(page.get("logGroups", []))
-
+            # 표본 모드(?mode=sample)면 재현 가능한 표본만 평가(전체 수는 표본 전에 기록)
             evidence["totalLogGroups"] = len(groups)
+            groups = sampling.choose(groups, key=lambda g: g.get("logGroupName"))
+            evidence["checkedLogGroups"] = len(groups)
+
             for g in groups:
                 name = g.get("logGroupName")
                 r = g.get("retentionInDays", 0) or 0
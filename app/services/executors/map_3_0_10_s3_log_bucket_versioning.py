@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import List, Dict, Any
 import boto3, botocore
 from app.models.schemas import AuditResult, ServiceEvaluation
+from app.services.datasource import list_resources
 
 class Exec_3_0_10:
     """
@@ -48,7 +49,7 @@ class Exec_3_0_10:
         evidence: Dict[str, Any] = {"checkedBuckets": [], "nonCompliant": []}
 
         try:
-            buckets = s3.list_buckets().get("Buckets", []) or []
+            buckets, _ = list_resources("s3_buckets")
             target_buckets = []
             for b in buckets:
                 name = b.get("Name")
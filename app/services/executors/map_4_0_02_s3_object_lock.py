@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import List, Dict, Any
 import boto3, botocore
 from app.models.schemas import AuditResult, ServiceEvaluation
+from app.services.datasource import list_resources
 
 class Exec_4_0_02:
     code = "4.0-02"
@@ -17,7 +18,7 @@ class Exec_4_0_02:
         }
 
         try:
-            buckets = s3.list_buckets().get("Buckets", [])
+            buckets, _ = list_resources("s3_buckets")
             evidence["checkedBuckets"] = len(buckets)
 
             if not buckets:
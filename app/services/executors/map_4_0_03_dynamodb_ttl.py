@@ -2,6 +2,8 @@ from __future__ import annotations
 from typing import List, Dict, Any
 import boto3, botocore
 from app.models.schemas import AuditResult, ServiceEvaluation
+from app.services.datasource import list_resources
+from app.core import sampling
 
 class Exec_4_0_03:
     code = "4.0-03"
@@ -13,10 +15,10 @@ class Exec_4_0_03:
         evidence: Dict[str, Any] = {"checkedTables": 0, "nonCompliant": []}
 
         try:
-            paginator = ddb.get_paginator("list_tables")
-            tables: List[str] = []
-            for page in paginator.paginate():
-                tables.extend(page.get("TableNames", []))
+            tables: List[str] = [t["TableName"] for t in list_resources("dynamodb_tables")[0]]
+            # 표본 모드(?mode=sample)면 재현 가능한 표본만 DescribeTimeToLive(전체 수는 표본 전에 기록)
+            evidence["totalTables"] = len(tables)
+            tables = sampling.choose(tables, key=lambda t: t)
 
             evidence["checkedTables"] = len(tables)
 
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import List, Dict, Any
 import boto3, botocore
 from app.models.schemas import AuditResult, ServiceEvaluation
+from app.core import sampling
 
 class Exec_5_0_06:
     code = "5.0-06"
@@ -56,59 +57,68 @@ class Exec_5_0_06:
             non_compliant = []
             sample = []
 
-            for db in db_names:
-                tables = list_tables(db)
-                for t in tables:
-                    try:
-                        tr = glue.get_table(DatabaseName=db, Name=t)
-                        tbl = tr.get("Table", {})
-                        sd = (tbl.get("StorageDescriptor") or {})
-                        cols = sd.get("Columns") or []
-                        ok = True if cols else False
-                        # 간단한 필드 유효성(name/type 존재) 체크
-                        if ok:
-                            for c in cols:
-                                if not c.get("Name") or not c.get("Type"):
-                                    ok = False
-                                    break
-
-                        evidence["tablesChecked"] += 1
-                        if len(sample) < 5:
-                            sample.append({"db": db, "table": t, "columns": len(cols)})
-
-                        evals.append(ServiceEvaluation(
-                            service="Glue",
-                            resource_id=f"{db}/{t}",
-                            evidence_path="Table.StorageDescriptor.Columns",
-                            checked_field="columns defined",
-                            comparator="eq",
-                            expected_value=True,
-                            observed_value=ok,
-                            passed=ok,
-                            decision=f"{'columns present & valid' if ok else 'missing/invalid columns'}",
-                            status="COMPLIANT" if ok else "NON_COMPLIANT",
-                            source="aws-sdk",
-                            extra={}
-                        ))
-
-                        if not ok:
-                            non_compliant.append(f"{db}/{t}")
-
-                    except botocore.exceptions.ClientError as e:
-                        evals.append(ServiceEvaluation(
-                            service="Glue",
-                            resource_id=f"{db}/{t}",
-                            evidence_path="get_table",
-                            checked_field="read table",
-                            comparator="exists",
-                            expected_value=True,
-                            observed_value=None,
-                            passed=None,
-                            decision="cannot read table",
-                            status="SKIPPED",
-                            source="aws-sdk",
-                            extra={"error": str(e)}
-                        ))
+            def table_pairs():
+                for db in db_names:
+                    for t in list_tables(db):
+                        yield db, t
+
+            if sampling.CURRENT_SAMPLE.get() is not None:
+                # 표본 모드(?mode=sample)면 전체 목록을 모은 뒤 재현 가능한 표본 테이블만 GetTable
+                pairs = sampling.choose(list(table_pairs()), key=lambda p: f"{p[0]}/{p[1]}")
+            else:
+                # 기본: DB별로 테이블 목록 → 바로 GetTable(목록 전체를 먼저 모으지 않음)
+                pairs = table_pairs()
+            for db, t in pairs:
+                try:
+                    tr = glue.get_table(DatabaseName=db, Name=t)
+                    tbl = tr.get("Table", {})
+                    sd = (tbl.get("StorageDescriptor") or {})
+                    cols = sd.get("Columns") or []
+                    ok = True if cols else False
+                    # 간단한 필드 유효성(name/type 존재) 체크
+                    if ok:
+                        for c in cols:
+                            if not c.get("Name") or not c.get("Type"):
+                                ok = False
+                                break
+
+                    evidence["tablesChecked"] += 1
+                    if len(sample) < 5:
+                        sample.append({"db": db, "table": t, "columns": len(cols)})
+
+                    evals.append(ServiceEvaluation(
+                        service="Glue",
+                        resource_id=f"{db}/{t}",
+                        evidence_path="Table.StorageDescriptor.Columns",
+                        checked_field="columns defined",
+                        comparator="eq",
+                        expected_value=True,
+                        observed_value=ok,
+                        passed=ok,
+                        decision=f"{'columns present & valid' if ok else 'missing/invalid columns'}",
+                        status="COMPLIANT" if ok else "NON_COMPLIANT",
+                        source="aws-sdk",
+                        extra={}
+                    ))
+
+                    if not ok:
+                        non_compliant.append(f"{db}/{t}")
+
+                except botocore.exceptions.ClientError as e:
+                    evals.append(ServiceEvaluation(
+                        service="Glue",
+                        resource_id=f"{db}/{t}",
+                        evidence_path="get_table",
+                        checked_field="read table",
+                        comparator="exists",
+                        expected_value=True,
+                        observed_value=None,
+                        passed=None,
+                        decision="cannot read table",
+                        status="SKIPPED",
+                        source="aws-sdk",
+                        extra={"error": str(e)}
+                    ))
 
             evidence["tablesWithMissingSchema"] = non_compliant
             evidence["sampleChecked"] = sample
@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import List, Dict, Any
 import boto3, botocore
 from app.models.schemas import AuditResult, ServiceEvaluation
+from app.services.datasource import list_resources
 
 class Exec_9_0_01:
     code = "9.0-01"
@@ -14,10 +15,7 @@ class Exec_9_0_01:
 
         try:
             # 모든 테이블 순회
-            paginator = ddb.get_paginator("list_tables")
-            tables = []
-            for page in paginator.paginate():
-                tables.extend(page.get("TableNames", []) or [])
+            tables = [t["TableName"] for t in list_resources("dynamodb_tables")[0]]
             evidence["tables"] = len(tables)
 
             if not tables:
@@ -1,22 +1,19 @@
 from __future__ import annotations
 from typing import List, Dict, Any
-import boto3, botocore
+import botocore
 from app.models.schemas import AuditResult, ServiceEvaluation
+from app.services.datasource import list_resources
 
 class Exec_9_0_02:
     code = "9.0-02"
     title = "RDS Multi-AZ 구성"
 
     def audit(self) -> AuditResult:
-        rds = boto3.client("rds")
         evals: List[ServiceEvaluation] = []
         evidence: Dict[str, Any] = {"dbInstances": 0, "multiAZ": 0, "nonMultiAZ": []}
 
         try:
-            paginator = rds.get_paginator("describe_db_instances")
-            dbs = []
-            for page in paginator.paginate():
-                dbs.extend(page.get("DBInstances", []) or [])
+            dbs, origin = list_resources("rds_instances")
             evidence["dbInstances"] = len(dbs)
 
             if not dbs:
@@ -46,7 +43,7 @@ class Exec_9_0_02:
                     observed_value=mz, passed=mz,
                     decision=f"observed {mz} == True → {'passed' if mz else 'failed'}",
                     status="COMPLIANT" if mz else "NON_COMPLIANT",
-                    source="aws-sdk", extra={}
+                    source=origin, extra={}
                 ))
 
             overall = "COMPLIANT" if evidence["dbInstances"] > 0 and len(evidence["nonMultiAZ"]) == 0 \
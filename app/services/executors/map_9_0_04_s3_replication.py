@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import List, Dict, Any
 import boto3, botocore
 from app.models.schemas import AuditResult, ServiceEvaluation
+from app.services.datasource import list_resources
 
 
 class Exec_9_0_04:
@@ -19,7 +20,7 @@ class Exec_9_0_04:
         }
 
         try:
-            buckets = s3.list_buckets().get("Buckets", [])
+            buckets, _ = list_resources("s3_buckets")
         except botocore.exceptions.ClientError as e:
             # 계정 전체 버킷 조회 권한이 없을 때
             return AuditResult(
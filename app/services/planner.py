@@ -0,0 +1,469 @@
+# app/services/planner.py
+from __future__ import annotations
+
+import math
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.clients.mapping_client import MappingClient
+from app.core import aws, budget, fact_cache, metrics
+from app.core.config import settings
+from app.services.datasource import list_resources
+from app.services.registry import EXECUTOR_MODULES
+
+# 감사 실행 계획(dry-run)
+# - 요건→매핑 그래프를 해석하고, 인벤토리 수(버킷/키/로그 그룹/테이블 등)만 목록 조회로 센 뒤
+#   executor별 선언된 호출 패턴(CALL_PATTERNS)으로 AWS 호출 수/소요 시간/스로틀 위험을 추정
+# - 상세 점검(Get*/Describe* 리소스별 호출)은 하나도 실행하지 않음
+# - 호출 1건 지연은 /metrics의 오퍼레이션별 관측치(aws_call_duration_seconds), 없으면 PLAN_AWS_CALL_MS
+# - 소요 시간은 순차 실행 + 오퍼레이션별 적응형 속도 제한(AWS_RATE_*)을 가정한 값
+
+# 호출 패턴 항목: (오퍼레이션, 인벤토리 종류, 페이지 크기)
+#   종류 None         → 1회
+#   종류 + 페이지 0   → 리소스마다 1회
+#   종류 + 페이지 N   → ceil(수 / N)회(최소 1, 목록 페이지)
+Call = Tuple[str, Optional[str], int]
+
+_S3_LIST: Call = ("s3.ListBuckets", None, 0)
+_DDB_LIST: Call = ("dynamodb.ListTables", "dynamodb_tables", 100)
+_KMS_LIST: Call = ("kms.ListKeys", "kms_keys", 100)
+_ELB_LIST: Call = ("elbv2.DescribeLoadBalancers", "load_balancers", 400)
+_TRAILS: Call = ("cloudtrail.DescribeTrails", None, 0)
+_OPENSEARCH: Tuple[Call, ...] = (
+    ("opensearch.ListDomainNames", None, 0),
+    ("opensearch.DescribeDomain", "opensearch_domains", 0),
+)
+
+# 매핑 코드 → executor가 내는 AWS 호출(새 executor를 추가하면 여기도 선언)
+CALL_PATTERNS: Dict[str, Tuple[Call, ...]] = {
+    "1.0-01": (("sso-admin.ListInstances", None, 0), ("sso-admin.ListPermissionSets", None, 0)),
+    "1.0-02": (("organizations.ListPolicies", None, 0),),
+    "1.0-03": (("iam.GetCredentialReport", None, 0),),
+    "1.0-04": (("iam.GetAccountPasswordPolicy", None, 0),),
+    "1.0-05": (("accessanalyzer.ListAnalyzers", None, 0),),
+    "1.0-06": (("iam.GetAccountSummary", None, 0),),
+
+    "2.0-01": (_S3_LIST, ("s3.GetBucketEncryption", "s3_buckets", 0)),
+    "2.0-02": (("rds.DescribeDBInstances", None, 0),),
+    "2.0-03": (_DDB_LIST, ("dynamodb.DescribeTable", "dynamodb_tables", 0)),
+    "2.0-04": (("redshift.DescribeClusters", None, 0),),
+    "2.0-05": _OPENSEARCH,
+    "2.0-06": _OPENSEARCH,
+    "2.0-09": (_ELB_LIST, ("elbv2.DescribeListeners", "load_balancers", 0)),
+    "2.0-10": (("kinesis.ListStreams", "kinesis_streams", 100), ("kinesis.DescribeStreamSummary", "kinesis_streams", 0)),
+    "2.0-11": (("sqs.ListQueues", None, 0), ("sqs.GetQueueAttributes", "sqs_queues", 0)),
+    "2.0-12": (("sns.ListTopics", "sns_topics", 100), ("sns.GetTopicAttributes", "sns_topics", 0)),
+    "2.0-13": (("efs.DescribeFileSystems", None, 0),),
+    "2.0-14": (("kafka.ListClusters", None, 0), ("kafka.DescribeCluster", "msk_clusters", 0)),
+    "2.0-15": (("cloudfront.ListDistributions", None, 0),),
+    "2.0-16": (_KMS_LIST, ("kms.GetKeyRotationStatus", "kms_keys", 0)),
+
+    "3.0-01": (_TRAILS,),
+    "3.0-02": (_TRAILS, ("cloudtrail.GetEventSelectors", "cloudtrail_trails", 0)),
+    "3.0-03": (("config.DescribeConfigurationRecorderStatus", None, 0),),
+    "3.0-04": (("logs.DescribeLogGroups", "log_groups", 50),),
+    "3.0-07": (_ELB_LIST, ("elbv2.DescribeLoadBalancerAttributes", "load_balancers", 0)),
+    "3.0-08": (("cloudfront.ListDistributions", None, 0),),
+    "3.0-10": (_S3_LIST, ("s3.GetBucketTagging", "s3_buckets", 0), ("s3.GetBucketVersioning", "s3_buckets", 0)),
+    "3.0-11": (
+        _TRAILS, ("cloudtrail.ListEventDataStores", None, 0),
+        ("cloudtrail.GetInsightSelectors", "cloudtrail_trails", 0),
+    ),
+
+    "4.0-01": (_S3_LIST, ("s3.GetBucketLifecycleConfiguration", "s3_buckets", 0)),
+    "4.0-02": (_S3_LIST, ("s3.GetObjectLockConfiguration", "s3_buckets", 0)),
+    "4.0-03": (_DDB_LIST, ("dynamodb.DescribeTimeToLive", "dynamodb_tables", 0)),
+    "4.0-04": (("backup.ListBackupVaults", None, 0),),
+    "4.0-05": (("macie2.ListClassificationJobs", None, 0),),
+
+    "5.0-01": (("databrew.ListProjects", None, 0),),
+    "5.0-02": (("glue.ListDataQualityRulesets", None, 0),),
+    "5.0-03": (("sagemaker.ListExperiments", None, 0),),
+    "5.0-04": (("sagemaker.ListFeatureGroups", None, 0),),
+    "5.0-05": (("lakeformation.ListLFTags", None, 0),),
+    "5.0-06": (
+        ("glue.GetDatabases", "glue_databases", 100),
+        ("glue.GetTables", "glue_table_pages", 0),
+        ("glue.GetTable", "glue_tables", 0),
+    ),
+
+    "6.0-01": (("sagemaker.ListEndpoints", None, 0),),
+    "6.0-02": (("sagemaker.ListMonitoringSchedules", None, 0),),
+    "6.0-03": (("ecr.DescribeRepositories", None, 0),),
+    "6.0-04": (("inspector2.ListCoverageStatistics", None, 0),),
+
+    "7.0-01": (("securityhub.DescribeHub", None, 0), ("securityhub.GetEnabledStandards", None, 0)),
+    "7.0-02": (("guardduty.ListDetectors", None, 0), ("guardduty.GetDetector", "guardduty_detectors", 0)),
+    "7.0-03": (("cloudwatch.DescribeAlarms", None, 0),),
+    "7.0-04": (("detective.ListGraphs", None, 0),),
+
+    "8.0-01": (("ec2.DescribeSecurityGroups", None, 0),),
+    "8.0-03": (
+        ("wafv2.ListWebACLs", None, 0), _ELB_LIST,
+        ("wafv2.GetWebACLForResource", "application_load_balancers", 0),
+    ),
+    "8.0-05": (
+        ("route53resolver.ListFirewallRuleGroups", None, 0),
+        ("route53resolver.ListFirewallRuleGroupAssociations", None, 0),
+    ),
+    "8.0-07": (("network-firewall.ListFirewalls", None, 0),),
+
+    "9.0-01": (_DDB_LIST, ("dynamodb.DescribeContinuousBackups", "dynamodb_tables", 0)),
+    "9.0-02": (("rds.DescribeDBInstances", None, 0),),
+    "9.0-03": (("backup.ListCopyJobs", None, 0),),
+    "9.0-04": (_S3_LIST, ("s3.GetBucketReplication", "s3_buckets", 0)),
+    "9.0-07": (("dlm.GetLifecyclePolicies", None, 0),),
+
+    "10.0-01": (("secretsmanager.ListSecrets", "secrets", 100), ("secretsmanager.DescribeSecret", "secrets", 0)),
+    # GetKeyRotationStatus는 고객 관리 키만 호출 → 상한으로 선언
+    "10.0-04": (_KMS_LIST, ("kms.DescribeKey", "kms_keys", 0), ("kms.GetKeyRotationStatus", "kms_keys", 0)),
+
+    "11.0-01": (
+        ("organizations.ListRoots", None, 0),
+        ("organizations.ListOrganizationalUnitsForParent", "organization_roots", 0),
+    ),
+    "11.0-02": (("config.DescribeConformancePackStatus", None, 0),),
+    "11.0-03": (_S3_LIST, ("s3.GetBucketNotificationConfiguration", "s3_buckets", 0)),
+
+    "12.0-01": (("ec2.DescribeVpcEndpoints", None, 0),),
+    "12.0-02": (("datasync.ListTasks", None, 0),),
+    "12.0-04": (_S3_LIST, ("s3.GetBucketPolicy", "s3_buckets", 0)),
+    "12.0-05": (("cloudfront.ListDistributions", None, 0),),
+
+    "13.0-02": (("lakeformation.ListPermissions", None, 0),),
+
+    "16.0-01": (
+        ("codecommit.ListRepositories", "codecommit_repositories", 1000),
+        ("codecommit.ListAssociatedApprovalRuleTemplatesForRepository", "codecommit_repositories", 0),
+    ),
+    "16.0-02": (
+        ("codepipeline.ListPipelines", "codepipeline_pipelines", 100),
+        ("codepipeline.GetPipeline", "codepipeline_pipelines", 0),
+    ),
+    "16.0-05": (
+        ("codedeploy.ListApplications", "codedeploy_applications", 100),
+        ("codedeploy.ListDeploymentGroups", "codedeploy_applications", 0),
+        ("codedeploy.GetDeploymentGroup", "codedeploy_deployment_groups", 0),
+    ),
+}
+
+# 계정 단위(리전과 무관) 서비스: 다중 리전 추정 시 계정당 1회로 계산
+_GLOBAL_SERVICES = {"iam", "organizations", "s3", "cloudfront"}
+
+
+# ── 인벤토리 수 세기(목록 조회만) ────────────────────────────────────────────
+# 세는 함수(max_pages) → ({종류: 수}, 끝까지 셌는지). 페이지 상한에 걸리면 하한값
+Counted = Tuple[Dict[str, int], bool]
+
+
+class _Truncated(Exception):
+    pass
+
+
+def _pages(service: str, op: str, key: str, max_pages: int, **params):
+    cli = aws.client(service)
+    if not cli.can_paginate(op):
+        yield getattr(cli, op)(**params).get(key, []) or []
+        return
+    for i, page in enumerate(cli.get_paginator(op).paginate(**params)):
+        yield page.get(key, []) or []
+        # 상한 페이지까지 읽었으면 다음 페이지를 요청하지 않고 하한값으로 처리
+        if i + 1 >= max_pages:
+            raise _Truncated()
+
+
+def _listing(kind: str, service: str, op: str, key: str) -> Callable[[int], Counted]:
+    def count(max_pages: int) -> Counted:
+        n = 0
+        try:
+            for items in _pages(service, op, key, max_pages):
+                n += len(items)
+        except _Truncated:
+            return {kind: n}, False
+        return {kind: n}, True
+    return count
+
+
+def _inventory(kind: str) -> Callable[[int], Counted]:
+    # datasource 종류는 Collector 우선 + 세션 사실 캐시 재사용(실제 감사와 같은 경로)
+    def count(max_pages: int) -> Counted:
+        records, _ = list_resources(kind)
+        return {kind: len(records)}, True
+    return count
+
+
+def _count_load_balancers(max_pages: int) -> Counted:
+    total = alb = 0
+    try:
+        for items in _pages("elbv2", "describe_load_balancers", "LoadBalancers", max_pages):
+            total += len(items)
+            alb += sum(1 for lb in items if lb.get("Type") == "application")
+    except _Truncated:
+        return {"load_balancers": total, "application_load_balancers": alb}, False
+    return {"load_balancers": total, "application_load_balancers": alb}, True
+
+
+def _count_glue(max_pages: int) -> Counted:
+    # 5.0-06과 같은 순서: 데이터베이스 목록 → 데이터베이스별 GetTables 페이지
+    dbs: List[str] = []
+    tables = pages = 0
+    pages_left = max_pages
+    try:
+        for items in _pages("glue", "get_databases", "DatabaseList", max_pages):
+            dbs.extend(d["Name"] for d in items if d.get("Name"))
+        for db in dbs:
+            if pages_left <= 0:
+                raise _Truncated()
+            for items in _pages("glue", "get_tables", "TableList", pages_left, DatabaseName=db):
+                tables += len(items)
+                pages += 1
+                pages_left -= 1
+    except _Truncated:
+        return {"glue_databases": len(dbs), "glue_tables": tables, "glue_table_pages": max(pages, len(dbs))}, False
+    return {"glue_databases": len(dbs), "glue_tables": tables, "glue_table_pages": pages}, True
+
+
+def _count_codedeploy(max_pages: int) -> Counted:
+    apps: List[str] = []
+    groups = 0
+    pages_left = max_pages
+    try:
+        for items in _pages("codedeploy", "list_applications", "applications", max_pages):
+            apps.extend(items)
+        for app in apps:
+            if pages_left <= 0:
+                raise _Truncated()
+            for items in _pages("codedeploy", "list_deployment_groups", "deploymentGroups", pages_left, applicationName=app):
+                groups += len(items)
+                pages_left -= 1
+    except _Truncated:
+        return {"codedeploy_applications": len(apps), "codedeploy_deployment_groups": groups}, False
+    return {"codedeploy_applications": len(apps), "codedeploy_deployment_groups": groups}, True
+
+
+# 인벤토리 종류 → 세는 함수(한 함수가 여러 종류를 함께 세면 같은 함수를 가리킴)
+_COUNTERS: Dict[str, Callable[[int], Counted]] = {
+    "s3_buckets": _inventory("s3_buckets"),
+    "dynamodb_tables": _inventory("dynamodb_tables"),
+    "kinesis_streams": _inventory("kinesis_streams"),
+    "msk_clusters": _inventory("msk_clusters"),
+    "kms_keys": _listing("kms_keys", "kms", "list_keys", "Keys"),
+    "log_groups": _listing("log_groups", "logs", "describe_log_groups", "logGroups"),
+    "opensearch_domains": _listing("opensearch_domains", "opensearch", "list_domain_names", "DomainNames"),
+    "sqs_queues": _listing("sqs_queues", "sqs", "list_queues", "QueueUrls"),
+    "sns_topics": _listing("sns_topics", "sns", "list_topics", "Topics"),
+    "cloudtrail_trails": _listing("cloudtrail_trails", "cloudtrail", "describe_trails", "trailList"),
+    "guardduty_detectors": _listing("guardduty_detectors", "guardduty", "list_detectors", "DetectorIds"),
+    "secrets": _listing("secrets", "secretsmanager", "list_secrets", "SecretList"),
+    "organization_roots": _listing("organization_roots", "organizations", "list_roots", "Roots"),
+    "codecommit_repositories": _listing("codecommit_repositories", "codecommit", "list_repositories", "repositories"),
+    "codepipeline_pipelines": _listing("codepipeline_pipelines", "codepipeline", "list_pipelines", "pipelines"),
+    "load_balancers": _count_load_balancers,
+    "application_load_balancers": _count_load_balancers,
+    "glue_databases": _count_glue,
+    "glue_tables": _count_glue,
+    "glue_table_pages": _count_glue,
+    "codedeploy_applications": _count_codedeploy,
+    "codedeploy_deployment_groups": _count_codedeploy,
+}
+
+
+def count_inventory(kinds) -> Dict[str, Dict[str, Any]]:
+    """
+    필요한 인벤토리 종류만 센다. 반환: 종류 → {count, complete, source}
+      source: "counted"(목록 조회) / "assumed"(조회 실패 → PLAN_DEFAULT_RESOURCES)
+    """
+    max_pages = max(1, int(settings.PLAN_COUNT_MAX_PAGES))
+    out: Dict[str, Dict[str, Any]] = {}
+    done = set()
+    for kind in sorted(kinds):
+        if kind in out:
+            continue
+        fn = _COUNTERS.get(kind)
+        if fn is not None and fn not in done:
+            done.add(fn)
+            try:
+                counts, complete = fn(max_pages)
+                for k, n in counts.items():
+                    out[k] = {"count": n, "complete": complete, "source": "counted"}
+            except Exception as e:
+                for k, f in _COUNTERS.items():
+                    if f is fn:
+                        out[k] = {"count": int(settings.PLAN_DEFAULT_RESOURCES), "complete": False,
+                                  "source": "assumed", "error": f"{type(e).__name__}: {e}"}
+        if kind not in out:
+            out[kind] = {"count": int(settings.PLAN_DEFAULT_RESOURCES), "complete": False, "source": "assumed"}
+    return {k: out[k] for k in sorted(kinds)}
+
+
+# ── 추정 ──────────────────────────────────────────────────────────────────
+def _calls(entry: Call, inventory: Dict[str, Dict[str, Any]]) -> int:
+    _, kind, page = entry
+    if kind is None:
+        return 1
+    n = int(inventory[kind]["count"])
+    if page:
+        return max(1, math.ceil(n / page))
+    return n
+
+
+def _latency(op: str) -> Tuple[float, str]:
+    service, _, name = op.partition(".")
+    n, mean = metrics.AWS_CALL_DURATION.mean(service=service, operation=name)
+    if mean is not None and n >= 5:
+        return mean, "observed"
+    return float(settings.PLAN_AWS_CALL_MS) / 1000.0, "default"
+
+
+def _rate_limited_seconds(n: int) -> float:
+    """
+    오퍼레이션별 AIMD 토큰 버킷(app.core.rate_limit)이 n건을 내보내는 데 걸리는 최소 시간(스로틀 없음 가정).
+    버킷이 제한 없음으로 시작하면(AWS_RATE_INITIAL=0) 스로틀 전에는 대기가 없으므로 0
+    """
+    if not settings.AWS_RATE_LIMIT_ENABLED or n <= 0 or float(settings.AWS_RATE_INITIAL) <= 0:
+        return 0.0
+    r0 = float(settings.AWS_RATE_INITIAL)
+    rmax = float(settings.AWS_RATE_MAX) if float(settings.AWS_RATE_MAX) > 0 else math.inf
+    rmax = max(rmax, r0)
+    inc = float(settings.AWS_RATE_INCREASE)
+    rest = n - max(1, int(r0))  # 시작 시 토큰 max(1, rate)개
+    if rest <= 0:
+        return 0.0
+    if inc <= 0:
+        return rest / r0
+    ramp = rest if math.isinf(rmax) else min(rest, math.ceil((rmax - r0) / inc))
+    # 증가 구간: 1/(r0 + inc·k) 합 ≈ ln((r0 + inc·ramp) / r0) / inc
+    return math.log((r0 + inc * ramp) / r0) / inc + ((rest - ramp) / rmax if rest > ramp else 0.0)
+
+
+def _throttle_risk(op: str, calls: int) -> Tuple[str, Optional[float]]:
+    service, _, name = op.partition(".")
+    seen = metrics.AWS_CALLS.value(service=service, operation=name)
+    throttled = metrics.AWS_THROTTLES.value(service=service, operation=name)
+    ratio = throttled / seen if seen >= 20 else None
+    heavy = calls >= int(settings.PLAN_THROTTLE_CALLS)
+    if (ratio is not None and ratio >= 0.05) or (heavy and not settings.AWS_RATE_LIMIT_ENABLED):
+        return "high", ratio
+    if ratio or heavy:
+        return "medium", ratio
+    return "low", ratio
+
+
+_RISK_ORDER = ("low", "medium", "high")
+
+
+def plan(
+    framework: str,
+    *,
+    mapping_client: Optional[MappingClient] = None,
+    accounts: int = 1,
+    regions: int = 1,
+    concurrency: int = 1,
+) -> Dict[str, Any]:
+    """
+    framework 전체 감사의 실행 계획. 상세 점검 없이 그래프 해석 + 인벤토리 수 세기만 수행.
+    accounts/regions는 현재 계정·리전의 인벤토리가 다른 계정·리전에도 비슷하다고 보고 배수로 확장,
+    concurrency는 계정×리전 실행을 동시에 몇 개 돌리는지(속도 제한 버킷은 계정/리전별로 독립).
+    """
+    graph = (mapping_client or MappingClient()).prefetch_requirement_mappings(framework)
+    occurrences: Counter = Counter()
+    for detail in graph.values():
+        for m in detail.mappings:
+            occurrences[m.code] += 1
+    # 매핑 결과 캐시가 켜져 있으면 같은 매핑은 한 실행에서 한 번만 실행
+    runs = {c: (1 if float(settings.MAPPING_RESULT_TTL_SECONDS) > 0 else n) for c, n in occurrences.items()}
+    planned = {c: CALL_PATTERNS[c] for c in runs if c in CALL_PATTERNS}
+    unimplemented = sorted(c for c in runs if c not in EXECUTOR_MODULES)
+    undeclared = sorted(c for c in runs if c in EXECUTOR_MODULES and c not in CALL_PATTERNS)
+
+    kinds = {kind for calls in planned.values() for _, kind, _ in calls if kind}
+    inventory = count_inventory(kinds)
+
+    # 세션 사실 캐시가 있으면 같은 목록 조회(리소스별이 아닌 호출)는 실행 전체에서 한 번만 나감
+    shared_lists = fact_cache.current() is not None
+    op_calls: Counter = Counter()
+    list_calls: Dict[str, int] = {}
+    per_executor: Dict[str, Counter] = {}
+    for code, calls in planned.items():
+        ops: Counter = Counter()
+        for entry in calls:
+            ops[entry[0]] += _calls(entry, inventory) * runs[code]
+            is_list = entry[1] is None or entry[2] > 0
+            if shared_lists and is_list:
+                list_calls[entry[0]] = max(list_calls.get(entry[0], 0), _calls(entry, inventory))
+            else:
+                op_calls[entry[0]] += _calls(entry, inventory) * runs[code]
+        per_executor[code] = ops
+    op_calls.update(list_calls)
+
+    operations: List[Dict[str, Any]] = []
+    per_call: Dict[str, float] = {}
+    seconds_by_op: Dict[str, float] = {}
+    for op, n in sorted(op_calls.items(), key=lambda kv: -kv[1]):
+        latency, source = _latency(op)
+        seconds = max(n * latency, _rate_limited_seconds(n))
+        risk, ratio = _throttle_risk(op, n)
+        per_call[op] = seconds / n if n else latency
+        seconds_by_op[op] = seconds
+        operations.append({
+            "operation": op,
+            "calls": n,
+            "seconds": round(seconds, 2),
+            "latencyMs": round(latency * 1000.0, 1),
+            "latencySource": source,
+            "throttleRisk": risk,
+            "observedThrottleRatio": round(ratio, 4) if ratio is not None else None,
+        })
+
+    executors = []
+    for code, ops in sorted(per_executor.items(), key=lambda kv: -sum(kv[1].values())):
+        n, mean = metrics.MAPPING_DURATION.mean(code=code)
+        calls = sum(ops.values())
+        seconds = sum(per_call[op] * c for op, c in ops.items())
+        executors.append({
+            "code": code,
+            "runs": runs[code],
+            "calls": calls,
+            "seconds": round(seconds, 2),
+            "observedSeconds": round(mean, 3) if mean is not None else None,
+            "operations": dict(ops),
+            # 1회 실행 기준 실행 예산(EXECUTOR_MAX_AWS_CALLS/EXECUTOR_TIMEOUT_SECONDS) 초과 예상 사유
+            "overBudget": budget.exceeds(calls / runs[code], seconds / runs[code]) if runs[code] else None,
+        })
+
+    total_calls = sum(op_calls.values())
+    total_seconds = sum(seconds_by_op.values())
+    global_calls = sum(n for op, n in op_calls.items() if op.partition(".")[0] in _GLOBAL_SERVICES)
+    global_seconds = sum(s for op, s in seconds_by_op.items() if op.partition(".")[0] in _GLOBAL_SERVICES)
+    accounts, regions, concurrency = max(1, accounts), max(1, regions), max(1, concurrency)
+    fleet_calls = accounts * (global_calls + regions * (total_calls - global_calls))
+    fleet_seconds = accounts * (global_seconds + regions * (total_seconds - global_seconds))
+    overall = max((o["throttleRisk"] for o in operations), key=_RISK_ORDER.index, default="low")
+
+    return {
+        "framework": framework,
+        "requirements": len(graph),
+        "mappings": {
+            "total": sum(occurrences.values()),
+            "unique": len(occurrences),
+            "planned": len(planned),
+            "unimplemented": unimplemented,
+            "undeclared": undeclared,
+        },
+        "inventory": inventory,
+        "lowerBound": any(not v["complete"] for v in inventory.values()),
+        "totals": {
+            "awsCalls": total_calls,
+            "seconds": round(total_seconds, 1),
+            "throttleRisk": overall,
+        },
+        "fleet": {
+            "accounts": accounts,
+            "regions": regions,
+            "concurrency": concurrency,
+            "awsCalls": fleet_calls,
+            "wallSeconds": round(fleet_seconds / min(concurrency, accounts * regions), 1),
+        },
+        "operations": operations,
+        "executors": executors,
+    }
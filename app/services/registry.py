@@ -1,78 +1,20 @@
-from typing import Dict, Type, Optional, Protocol
+# app/services/registry.py
+from __future__ import annotations
+
+import importlib
+import threading
+import time
+from typing import Dict, Iterator, Mapping, Optional, Protocol, Tuple, Type
+
+from app.core.config import settings
 from app.models.schemas import AuditResult
 
-# ── 기존 executors ──────────────────────────────────────────────────────────
-from app.services.executors.map_1_0_01_sso_permission_sets import Exec_1_0_01
-from app.services.executors.map_1_0_02_org_scp import Exec_1_0_02
-from app.services.executors.map_1_0_06_root_mfa import Exec_1_0_06
-from app.services.executors.map_11_0_02_config_conformance_pack import Exec_11_0_02
-from app.services.executors.map_2_0_01_s3_sse_kms import Exec_2_0_01
-from app.services.executors.map_2_0_15_cloudfront_https import Exec_2_0_15
-
-# ── 새로 추가한 executors ───────────────────────────────────────────────────
-from app.services.executors.map_2_0_02_rds_encryption import Exec_2_0_02
-from app.services.executors.map_2_0_03_dynamodb_sse import Exec_2_0_03
-from app.services.executors.map_2_0_04_redshift_encryption import Exec_2_0_04
-from app.services.executors.map_2_0_05_06_opensearch import Exec_2_0_05_06
-from app.services.executors.map_2_0_09_alb_tls import Exec_2_0_09
-from app.services.executors.map_2_0_10_kinesis_kms import Exec_2_0_10
-from app.services.executors.map_2_0_11_sqs_kms import Exec_2_0_11
-from app.services.executors.map_2_0_12_sns_kms import Exec_2_0_12
-from app.services.executors.map_2_0_13_efs_encrypted import Exec_2_0_13
-from app.services.executors.map_2_0_14_msk_encryption import Exec_2_0_14
-from app.services.executors.map_2_0_16_kms_rotation import Exec_2_0_16
-from app.services.executors.map_3_0_01_cloudtrail_basics import Exec_3_0_01
-from app.services.executors.map_3_0_04_cwlogs_retention import Exec_3_0_04
-from app.services.executors.map_3_0_11_cloudtrail_lake_insights import Exec_3_0_11
-from app.services.executors.map_7_0_02_guardduty import Exec_7_0_02
-from app.services.executors.map_7_0_04_detective_graph import Exec_7_0_04
-from app.services.executors.map_11_0_03_s3_event_masking import Exec_11_0_03
-from app.services.executors.map_3_0_07_elbv2_access_logs import Exec_3_0_07
-from app.services.executors.map_3_0_08_cloudfront_logs import Exec_3_0_08
-from app.services.executors.map_4_0_01_s3_lifecycle import Exec_4_0_01
-from app.services.executors.map_4_0_03_dynamodb_ttl import Exec_4_0_03
-from app.services.executors.map_4_0_04_backup_vault_lock import Exec_4_0_04
-from app.services.executors.map_4_0_02_s3_object_lock import Exec_4_0_02
-from app.services.executors.map_10_0_04_kms_rotation import Exec_10_0_04
-from app.services.executors.map_12_0_05_cloudfront_oac import Exec_12_0_05
-from app.services.executors.map_8_0_03_wafv2_web_acl import Exec_8_0_03
-from app.services.executors.map_5_0_05_lakeformation_lftags import Exec_5_0_05
-from app.services.executors.map_5_0_06_glue_catalog_schema import Exec_5_0_06
-from app.services.executors.map_3_0_10_s3_log_bucket_versioning import Exec_3_0_10
-from app.services.executors.map_16_0_01_codecommit_branch_protection import Exec_16_0_01
-from app.services.executors.map_16_0_02_codepipeline_manual_approval import Exec_16_0_02
-from app.services.executors.map_16_0_05_codedeploy_blue_green import Exec_16_0_05
-from app.services.executors.map_11_0_01_org_ou_separation import Exec_11_0_01
-from app.services.executors.map_13_0_02_lf_tag_separation import Exec_13_0_02
-from app.services.executors.map_7_0_01_security_hub import Exec_7_0_01
-from app.services.executors.map_1_0_03_iam_credential_report import Exec_1_0_03
-from app.services.executors.map_3_0_02_ct_data_events import Exec_3_0_02
-from app.services.executors.map_3_0_03_config_recorder import Exec_3_0_03
-from app.services.executors.map_7_0_03_cw_alarms import Exec_7_0_03
-from app.services.executors.map_8_0_01_sg_no_public_ingress import Exec_8_0_01
-from app.services.executors.map_5_0_02_glue_data_quality import Exec_5_0_02
-from app.services.executors.map_5_0_01_databrew_projects import Exec_5_0_01
-from app.services.executors.map_4_0_05_macie_jobs import Exec_4_0_05
-from app.services.executors.map_6_0_04_inspector2_coverage import Exec_6_0_04
-from app.services.executors.map_8_0_07_network_firewall import Exec_8_0_07
-from app.services.executors.map_10_0_01_secrets_rotation import Exec_10_0_01
-from app.services.executors.map_9_0_07_dlm_policies import Exec_9_0_07
-from app.services.executors.map_5_0_03_sm_experiments import Exec_5_0_03
-from app.services.executors.map_5_0_04_sm_feature_store import Exec_5_0_04
-from app.services.executors.map_9_0_01_ddb_pitr import Exec_9_0_01
-from app.services.executors.map_9_0_02_rds_multiaz import Exec_9_0_02
-from app.services.executors.map_9_0_03_backup_copy_rules import Exec_9_0_03
-from app.services.executors.map_12_0_04_s3_bucket_policy_org_only import Exec_12_0_04
-from app.services.executors.map_12_0_01_privatelink_interface_endpoints import Exec_12_0_01
-from app.services.executors.map_1_0_04_iam_password_policy import Exec_1_0_04
-from app.services.executors.map_12_0_02_datasync_tasks import Exec_12_0_02
-from app.services.executors.map_9_0_04_s3_replication import Exec_9_0_04
-from app.services.executors.map_6_0_01_sagemaker_endpoints import Exec_6_0_01
-from app.services.executors.map_6_0_02_sagemaker_model_monitor import Exec_6_0_02
-from app.services.executors.map_6_0_03_ecr_scan_on_push import Exec_6_0_03
-from app.services.executors.map_1_0_05_access_analyzer import Exec_1_0_05
-from app.services.executors.map_8_0_05_route53_dns_firewall import Exec_8_0_05
+# mapping code → (executor 모듈, 클래스) 지연 로딩 레지스트리
+# - 프레임워크 실행이 실제로 쓰는 executor만 첫 사용 시 import (기동 시간/워커당 유휴 RSS 절감)
+# - REGISTRY_EAGER_IMPORT=true면 기동 시 전부 import (warm_all)
+# - 모듈별 import 소요 시간을 기록해 import_stats()로 보고
 
+_PACKAGE = "app.services.executors"
 
 
 class Auditable(Protocol):
@@ -80,92 +22,168 @@ class Auditable(Protocol):
     def audit(self) -> AuditResult: ...
 
 
-EXECUTOR_REGISTRY: Dict[str, Type[Auditable]] = {
-
-    "1.0-01": Exec_1_0_01,
-    "1.0-02": Exec_1_0_02,
-    "1.0-03": Exec_1_0_03,
-    "1.0-04": Exec_1_0_04,
-    "1.0-05": Exec_1_0_05,
-    "1.0-06": Exec_1_0_06,
-
-    "2.0-01": Exec_2_0_01,
-    "2.0-02": Exec_2_0_02,      
-    "2.0-03": Exec_2_0_03,     
-    "2.0-04": Exec_2_0_04,       
-    "2.0-05": Exec_2_0_05_06,    
-    "2.0-06": Exec_2_0_05_06,  
-    "2.0-09": Exec_2_0_09,      
-    "2.0-10": Exec_2_0_10,     
-    "2.0-11": Exec_2_0_11,       
-    "2.0-12": Exec_2_0_12,     
-    "2.0-13": Exec_2_0_13,       
-    "2.0-14": Exec_2_0_14,      
-    "2.0-15": Exec_2_0_15,
-    "2.0-16": Exec_2_0_16,       
-
-    "3.0-01": Exec_3_0_01,
-    "3.0-02": Exec_3_0_02,
-    "3.0-03": Exec_3_0_03,
-    "3.0-04": Exec_3_0_04,
-    "3.0-07": Exec_3_0_07,
-    "3.0-08": Exec_3_0_08,
-    "3.0-10": Exec_3_0_10,
-    "3.0-11": Exec_3_0_11,
-
-    "4.0-01": Exec_4_0_01,
-    "4.0-02": Exec_4_0_02,
-    "4.0-03": Exec_4_0_03,
-    "4.0-04": Exec_4_0_04,
-    "4.0-05": Exec_4_0_05,
-
-    "5.0-01": Exec_5_0_01,
-    "5.0-02": Exec_5_0_02,
-    "5.0-03": Exec_5_0_03,
-    "5.0-04": Exec_5_0_04,
-    "5.0-05": Exec_5_0_05,
-    "5.0-06": Exec_5_0_06,
-
-    "6.0-01": Exec_6_0_01,
-    "6.0-02": Exec_6_0_02,
-    "6.0-03": Exec_6_0_03,
-    "6.0-04": Exec_6_0_04,
-
-    "7.0-01": Exec_7_0_01,
-    "7.0-02": Exec_7_0_02,
-    "7.0-03": Exec_7_0_03,
-    "7.0-04": Exec_7_0_04,
-
-    "8.0-01": Exec_8_0_01,
-    "8.0-03": Exec_8_0_03,
-    "8.0-05": Exec_8_0_05,
-    "8.0-07": Exec_8_0_07,
-
-    "9.0-01": Exec_9_0_01,
-    "9.0-02": Exec_9_0_02,
-    "9.0-03": Exec_9_0_03,
-    "9.0-04": Exec_9_0_04,
-    "9.0-07": Exec_9_0_07,
-
-    "10.0-01": Exec_10_0_01,
-    "10.0-04": Exec_10_0_04,
-
-    "11.0-01": Exec_11_0_01,
-    "11.0-02": Exec_11_0_02,
-    "11.0-03": Exec_11_0_03,
-
-    "12.0-01": Exec_12_0_01,
-    "12.0-02": Exec_12_0_02,
-    "12.0-04": Exec_12_0_04,
-    "12.0-05": Exec_12_0_05,
-
-    "13.0-02": Exec_13_0_02,
-
-    "16.0-01": Exec_16_0_01,
-    "16.0-02": Exec_16_0_02,
-    "16.0-05": Exec_16_0_05,
+EXECUTOR_MODULES: Dict[str, Tuple[str, str]] = {
+
+    "1.0-01": ("map_1_0_01_sso_permission_sets", "Exec_1_0_01"),
+    "1.0-02": ("map_1_0_02_org_scp", "Exec_1_0_02"),
+    "1.0-03": ("map_1_0_03_iam_credential_report", "Exec_1_0_03"),
+    "1.0-04": ("map_1_0_04_iam_password_policy", "Exec_1_0_04"),
+    "1.0-05": ("map_1_0_05_access_analyzer", "Exec_1_0_05"),
+    "1.0-06": ("map_1_0_06_root_mfa", "Exec_1_0_06"),
+
+    "2.0-01": ("map_2_0_01_s3_sse_kms", "Exec_2_0_01"),
+    "2.0-02": ("map_2_0_02_rds_encryption", "Exec_2_0_02"),
+    "2.0-03": ("map_2_0_03_dynamodb_sse", "Exec_2_0_03"),
+    "2.0-04": ("map_2_0_04_redshift_encryption", "Exec_2_0_04"),
+    "2.0-05": ("map_2_0_05_06_opensearch", "Exec_2_0_05_06"),
+    "2.0-06": ("map_2_0_05_06_opensearch", "Exec_2_0_05_06"),
+    "2.0-09": ("map_2_0_09_alb_tls", "Exec_2_0_09"),
+    "2.0-10": ("map_2_0_10_kinesis_kms", "Exec_2_0_10"),
+    "2.0-11": ("map_2_0_11_sqs_kms", "Exec_2_0_11"),
+    "2.0-12": ("map_2_0_12_sns_kms", "Exec_2_0_12"),
+    "2.0-13": ("map_2_0_13_efs_encrypted", "Exec_2_0_13"),
+    "2.0-14": ("map_2_0_14_msk_encryption", "Exec_2_0_14"),
+    "2.0-15": ("map_2_0_15_cloudfront_https", "Exec_2_0_15"),
+    "2.0-16": ("map_2_0_16_kms_rotation", "Exec_2_0_16"),
+
+    "3.0-01": ("map_3_0_01_cloudtrail_basics", "Exec_3_0_01"),
+    "3.0-02": ("map_3_0_02_ct_data_events", "Exec_3_0_02"),
+    "3.0-03": ("map_3_0_03_config_recorder", "Exec_3_0_03"),
+    "3.0-04": ("map_3_0_04_cwlogs_retention", "Exec_3_0_04"),
+    "3.0-07": ("map_3_0_07_elbv2_access_logs", "Exec_3_0_07"),
+    "3.0-08": ("map_3_0_08_cloudfront_logs", "Exec_3_0_08"),
+    "3.0-10": ("map_3_0_10_s3_log_bucket_versioning", "Exec_3_0_10"),
+    "3.0-11": ("map_3_0_11_cloudtrail_lake_insights", "Exec_3_0_11"),
+
+    "4.0-01": ("map_4_0_01_s3_lifecycle", "Exec_4_0_01"),
+    "4.0-02": ("map_4_0_02_s3_object_lock", "Exec_4_0_02"),
+    "4.0-03": ("map_4_0_03_dynamodb_ttl", "Exec_4_0_03"),
+    "4.0-04": ("map_4_0_04_backup_vault_lock", "Exec_4_0_04"),
+    "4.0-05": ("map_4_0_05_macie_jobs", "Exec_4_0_05"),
+
+    "5.0-01": ("map_5_0_01_databrew_projects", "Exec_5_0_01"),
+    "5.0-02": ("map_5_0_02_glue_data_quality", "Exec_5_0_02"),
+    "5.0-03": ("map_5_0_03_sm_experiments", "Exec_5_0_03"),
+    "5.0-04": ("map_5_0_04_sm_feature_store", "Exec_5_0_04"),
+    "5.0-05": ("map_5_0_05_lakeformation_lftags", "Exec_5_0_05"),
+    "5.0-06": ("map_5_0_06_glue_catalog_schema", "Exec_5_0_06"),
+
+    "6.0-01": ("map_6_0_01_sagemaker_endpoints", "Exec_6_0_01"),
+    "6.0-02": ("map_6_0_02_sagemaker_model_monitor", "Exec_6_0_02"),
+    "6.0-03": ("map_6_0_03_ecr_scan_on_push", "Exec_6_0_03"),
+    "6.0-04": ("map_6_0_04_inspector2_coverage", "Exec_6_0_04"),
+
+    "7.0-01": ("map_7_0_01_security_hub", "Exec_7_0_01"),
+    "7.0-02": ("map_7_0_02_guardduty", "Exec_7_0_02"),
+    "7.0-03": ("map_7_0_03_cw_alarms", "Exec_7_0_03"),
+    "7.0-04": ("map_7_0_04_detective_graph", "Exec_7_0_04"),
+
+    "8.0-01": ("map_8_0_01_sg_no_public_ingress", "Exec_8_0_01"),
+    "8.0-03": ("map_8_0_03_wafv2_web_acl", "Exec_8_0_03"),
+    "8.0-05": ("map_8_0_05_route53_dns_firewall", "Exec_8_0_05"),
+    "8.0-07": ("map_8_0_07_network_firewall", "Exec_8_0_07"),
+
+    "9.0-01": ("map_9_0_01_ddb_pitr", "Exec_9_0_01"),
+    "9.0-02": ("map_9_0_02_rds_multiaz", "Exec_9_0_02"),
+    "9.0-03": ("map_9_0_03_backup_copy_rules", "Exec_9_0_03"),
+    "9.0-04": ("map_9_0_04_s3_replication", "Exec_9_0_04"),
+    "9.0-07": ("map_9_0_07_dlm_policies", "Exec_9_0_07"),
+
+    "10.0-01": ("map_10_0_01_secrets_rotation", "Exec_10_0_01"),
+    "10.0-04": ("map_10_0_04_kms_rotation", "Exec_10_0_04"),
+
+    "11.0-01": ("map_11_0_01_org_ou_separation", "Exec_11_0_01"),
+    "11.0-02": ("map_11_0_02_config_conformance_pack", "Exec_11_0_02"),
+    "11.0-03": ("map_11_0_03_s3_event_masking", "Exec_11_0_03"),
+
+    "12.0-01": ("map_12_0_01_privatelink_interface_endpoints", "Exec_12_0_01"),
+    "12.0-02": ("map_12_0_02_datasync_tasks", "Exec_12_0_02"),
+    "12.0-04": ("map_12_0_04_s3_bucket_policy_org_only", "Exec_12_0_04"),
+    "12.0-05": ("map_12_0_05_cloudfront_oac", "Exec_12_0_05"),
+
+    "13.0-02": ("map_13_0_02_lf_tag_separation", "Exec_13_0_02"),
+
+    "16.0-01": ("map_16_0_01_codecommit_branch_protection", "Exec_16_0_01"),
+    "16.0-02": ("map_16_0_02_codepipeline_manual_approval", "Exec_16_0_02"),
+    "16.0-05": ("map_16_0_05_codedeploy_blue_green", "Exec_16_0_05"),
 }
 
+_CLASSES: Dict[str, Type[Auditable]] = {}   # 모듈.클래스 → 클래스
+_IMPORT_SECONDS: Dict[str, float] = {}      # 모듈 → import 소요 시간
+_LOCK = threading.RLock()
+
+
+def module_path(mapping_code: str) -> Optional[str]:
+    spec = EXECUTOR_MODULES.get(mapping_code)
+    return f"{_PACKAGE}.{spec[0]}" if spec else None
+
+
+def load_executor_class(mapping_code: str) -> Optional[Type[Auditable]]:
+    spec = EXECUTOR_MODULES.get(mapping_code)
+    if spec is None:
+        return None
+    mod_name, cls_name = spec
+    key = f"{mod_name}.{cls_name}"
+    cls = _CLASSES.get(key)
+    if cls is not None:
+        return cls
+    with _LOCK:
+        cls = _CLASSES.get(key)
+        if cls is None:
+            t0 = time.perf_counter()
+            module = importlib.import_module(f"{_PACKAGE}.{mod_name}")
+            _IMPORT_SECONDS.setdefault(mod_name, time.perf_counter() - t0)
+            cls = getattr(module, cls_name)
+            _CLASSES[key] = cls
+        return cls
+
+
+class _LazyRegistry(Mapping):
+    """기존 EXECUTOR_REGISTRY[code] 사용처 호환: 조회 시점에 import"""
+    def __getitem__(self, code: str) -> Type[Auditable]:
+        cls = load_executor_class(code)
+        if cls is None:
+            raise KeyError(code)
+        return cls
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(EXECUTOR_MODULES)
+
+    def __len__(self) -> int:
+        return len(EXECUTOR_MODULES)
+
+    def __contains__(self, code: object) -> bool:
+        return code in EXECUTOR_MODULES
+
+
+EXECUTOR_REGISTRY: Mapping[str, Type[Auditable]] = _LazyRegistry()
+
+
 def make_executor(mapping_code: str) -> Optional[Auditable]:
-    cls = EXECUTOR_REGISTRY.get(mapping_code)
+    cls = load_executor_class(mapping_code)
     return cls() if cls else None
+
+
+def warm_all() -> Dict[str, float]:
+    """모든 executor 모듈 import. 반환: 이번 호출에서 새로 import한 모듈별 소요 시간"""
+    before = set(_IMPORT_SECONDS)
+    for code in EXECUTOR_MODULES:
+        load_executor_class(code)
+    return {m: s for m, s in _IMPORT_SECONDS.items() if m not in before}
+
+
+def maybe_warm_all():
+    if settings.REGISTRY_EAGER_IMPORT:
+        warm_all()
+
+
+def import_stats(top: int = 5) -> Dict[str, object]:
+    with _LOCK:
+        times = dict(_IMPORT_SECONDS)
+    slowest = sorted(times.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    return {
+        "modules": len({m for m, _ in EXECUTOR_MODULES.values()}),
+        "imported": len(times),
+        "importSeconds": round(sum(times.values()), 4),
+        "slowest": {m: round(s, 4) for m, s in slowest},
+    }
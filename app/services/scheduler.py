@@ -0,0 +1,173 @@
+# app/services/scheduler.py
+from __future__ import annotations
+
+import contextvars
+import math
+import queue
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from app.core import metrics
+from app.core.aws_hooks import install_default as install_default_hooks
+from app.core.config import settings
+from app.services.planner import CALL_PATTERNS
+from app.utils import shared_backend
+
+# 매핑(executor) 동시 실행 스케줄러
+# - 순서 모드(AUDIT_SCHEDULE / ?schedule=)
+#     registry : 요건/매핑 등록 순서대로 하나씩(기존 동작, 스케줄러를 거치지 않음)
+#     makespan : 예상 소요 시간이 긴 executor부터(LPT) → 전체 실행 시간 최소화
+#     fast-lane: 워커 하나는 싼 executor(예상 AUDIT_FAST_LANE_MAX_SECONDS 이하) 전용 차선에서 짧은 것부터,
+#                나머지 워커는 긴 것부터 → 비밀번호 정책/루트 MFA/GuardDuty 같은 계정 단위 점검이 먼저 끝남
+# - 같은 실행 안에서 여러 요건에 나오는 매핑은 한 번만 실행
+# - 예상 소요 시간: 계정(프로파일@리전)별 실행 시간 EWMA → /metrics 전체 평균 → 실행 계획 선언 호출 수 × PLAN_AWS_CALL_MS
+# - 계정별 통계는 공유 저장소(DUR:<계정>)에 보관해 워커/재시작 간 유지
+# - 워커 스레드는 호출 시점의 contextvars(세션, 추적, 프로파일러, 실행 예산 마감 등)를 복사해 실행
+# - executor는 boto3.client(...)로 기본 세션을 공유하므로 워커 시작 전에 기본 세션을 만들고
+#   클라이언트 생성을 직렬화해 둔다(app.core.aws_hooks.install_default)
+
+MODES = ("registry", "makespan", "fast-lane")
+
+
+class DurationStats:
+    def __init__(self):
+        self._data: Dict[str, Dict[str, List[float]]] = {}  # 계정 → {매핑 코드: [EWMA(초), 관측 수]}
+        self._dirty: set = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(account: str) -> str:
+        return f"DUR:{account}"
+
+    def _table(self, account: str) -> Dict[str, List[float]]:
+        with self._lock:
+            table = self._data.get(account)
+        if table is not None:
+            return table
+        loaded = shared_backend.get_json(self._key(account)) or {}
+        with self._lock:
+            return self._data.setdefault(account, {k: list(v) for k, v in loaded.items()})
+
+    def record(self, account: str, code: str, seconds: float):
+        table = self._table(account)
+        alpha = float(settings.AUDIT_DURATION_EWMA_ALPHA)
+        with self._lock:
+            cur = table.get(code)
+            if cur is None:
+                table[code] = [seconds, 1]
+            else:
+                cur[0] = alpha * seconds + (1.0 - alpha) * cur[0]
+                cur[1] += 1
+            self._dirty.add(account)
+
+    def observed(self, account: str, code: str) -> Optional[float]:
+        table = self._table(account)
+        with self._lock:
+            cur = table.get(code)
+            return cur[0] if cur is not None else None
+
+    def save(self):
+        """변경된 계정 통계를 공유 저장소에 기록"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            tables = {a: {k: list(v) for k, v in self._data.get(a, {}).items()} for a in dirty}
+        ttl = float(settings.AUDIT_DURATION_STATS_TTL_SECONDS)
+        for account, data in tables.items():
+            shared_backend.set_json(self._key(account), data, ttl=ttl)
+
+
+STATS = DurationStats()
+
+
+def _static(code: str) -> float:
+    """실행 계획의 선언 호출 패턴으로 본 예상 소요 시간(인벤토리는 PLAN_DEFAULT_RESOURCES개로 가정)"""
+    calls = CALL_PATTERNS.get(code)
+    if not calls:
+        return 0.0
+    per_kind = int(settings.PLAN_DEFAULT_RESOURCES)
+    n = sum(1 if kind is None else (math.ceil(per_kind / page) if page else per_kind) for _, kind, page in calls)
+    return n * float(settings.PLAN_AWS_CALL_MS) / 1000.0
+
+
+def estimate(account: str, code: str) -> Tuple[float, str]:
+    seconds = STATS.observed(account, code)
+    if seconds is not None:
+        return seconds, "account"
+    n, mean = metrics.MAPPING_DURATION.mean(code=code)
+    if n and mean is not None:
+        return mean, "global"
+    return _static(code), "static"
+
+
+def plan_order(codes: List[str], account: str, mode: str) -> Tuple[Deque[str], Deque[str]]:
+    """(빠른 차선 큐, 일반 큐). makespan은 빠른 차선 없이 긴 것부터"""
+    est = {c: estimate(account, c)[0] for c in codes}
+    heavy = sorted(codes, key=lambda c: -est[c])
+    if mode != "fast-lane":
+        return deque(), deque(heavy)
+    cap = float(settings.AUDIT_FAST_LANE_MAX_SECONDS)
+    cheap = sorted((c for c in codes if est[c] <= cap), key=lambda c: est[c])
+    fast = set(cheap)
+    return deque(cheap), deque(c for c in heavy if c not in fast)
+
+
+def run(
+    codes: List[str],
+    fn: Callable[[str], Any],
+    *,
+    mode: str,
+    account: str,
+    concurrency: Optional[int] = None,
+) -> Iterator[Tuple[str, Any]]:
+    """codes를 fn(code)로 동시 실행하고 끝나는 순서대로 (code, 결과) 반환. fn이 던진 예외는 결과 자리에 예외 객체로"""
+    if not codes:
+        return
+    lane, heavy = plan_order(codes, account, mode)
+    install_default_hooks()
+    lock = threading.Lock()
+    stop = threading.Event()
+    done: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+
+    def take(fast_lane: bool) -> Optional[str]:
+        with lock:
+            if stop.is_set():
+                return None
+            first, second = (lane, heavy) if fast_lane else (heavy, lane)
+            if first:
+                return first.popleft()
+            if second:
+                return second.popleft()
+            return None
+
+    def worker(fast_lane: bool):
+        while True:
+            code = take(fast_lane)
+            if code is None:
+                return
+            try:
+                result = fn(code)
+            except Exception as e:
+                result = e
+            done.put((code, result))
+
+    n = max(1, min(int(concurrency or settings.AUDIT_CONCURRENCY), len(codes)))
+    threads = [
+        threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(worker, mode == "fast-lane" and i == 0),
+            name=f"audit-sched-{i}",
+            daemon=True,
+        )
+        for i in range(n)
+    ]
+    for t in threads:
+        t.start()
+    try:
+        for _ in range(len(codes)):
+            yield done.get()
+    finally:
+        # 소비자가 중간에 멈추면(스트리밍 연결 종료 등) 새 executor는 시작하지 않음
+        stop.set()
+    for t in threads:
+        t.join()
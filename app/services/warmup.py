@@ -0,0 +1,156 @@
+# app/services/warmup.py
+from __future__ import annotations
+
+import importlib.util
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set
+
+import boto3
+from botocore.config import Config
+
+from app.core.config import settings
+from app.services import registry
+
+# 기동 시 사전 준비(WARMUP_ENABLED)
+# 배포/스케일아웃 직후 첫 감사가 느린 원인을 미리 치른다.
+# - registry의 executor 모듈 import + 이들이 쓰는 서비스 클라이언트 생성(botocore 서비스 모델 로딩, 엔드포인트 해석)
+# - 자격 증명 해석 + 계정 확인(sts), 활성 리전 목록
+# - Mapping API 메타데이터(요건/매핑) 적재
+# 위 작업을 병렬로 실행하고, 끝날 때까지 /health는 503 "warming"을 반환한다.
+# 개별 작업 실패는 기록만 하고 준비 완료를 막지 않는다.
+
+_CLIENT_RE = re.compile(r"""client\(\s*["']([a-z0-9-]+)["']""")
+
+# datasource 인벤토리 조회에 쓰이는 서비스 + 계정 확인용
+_EXTRA_SERVICES = ("sts", "s3", "dynamodb", "rds", "redshift", "efs", "elasticache", "kinesis", "kafka")
+
+# warm-up의 네트워크 호출은 짧게 끊는다(준비 지연이 감사 지연보다 길어지지 않도록)
+_PROBE_CONFIG = Config(connect_timeout=3, read_timeout=5, retries={"max_attempts": 2, "mode": "standard"})
+
+_STATE: Dict[str, Any] = {"status": "idle"}
+_LOCK = threading.Lock()
+_READY = threading.Event()
+
+
+def required_services() -> List[str]:
+    """registry에 등록된 executor 모듈 소스에서 boto3 서비스 이름을 추출(import 없이 파일만 읽음)"""
+    found: Set[str] = set(_EXTRA_SERVICES)
+    for code in registry.EXECUTOR_MODULES:
+        try:
+            spec = importlib.util.find_spec(registry.module_path(code))
+            with open(spec.origin, encoding="utf-8") as f:
+                found.update(_CLIENT_RE.findall(f.read()))
+        except (OSError, TypeError, AttributeError, ImportError):
+            continue
+    return sorted(found)
+
+
+def _frameworks() -> List[str]:
+    raw = settings.WARMUP_FRAMEWORKS or settings.MAPPING_MIRROR_FRAMEWORKS
+    return [x.strip() for x in raw.split(",") if x.strip()]
+
+
+def _warm_client(service: str):
+    # 기본 세션의 loader가 서비스 모델/엔드포인트 규칙을 캐시 → 이후 executor의 boto3.client(...)가 빨라짐
+    boto3.client(service, region_name=settings.AWS_REGION)
+
+
+def _warm_credentials() -> Dict[str, Any]:
+    if boto3.DEFAULT_SESSION is None:
+        boto3.setup_default_session()
+    creds = boto3.DEFAULT_SESSION.get_credentials()
+    if creds is None:
+        return {"credentials": None}
+    creds.get_frozen_credentials()  # refreshable(AssumeRole/IMDS)이면 여기서 실제 해석
+    ident = boto3.client("sts", region_name=settings.AWS_REGION, config=_PROBE_CONFIG).get_caller_identity()
+    return {"credentials": getattr(creds, "method", None), "account": ident.get("Account")}
+
+
+def _warm_regions() -> Dict[str, Any]:
+    ec2 = boto3.client("ec2", region_name=settings.AWS_REGION, config=_PROBE_CONFIG)
+    regions = [r["RegionName"] for r in ec2.describe_regions().get("Regions", [])]
+    return {"regions": sorted(regions)}
+
+
+def _warm_executors() -> Dict[str, Any]:
+    # 모듈별 import 시간은 /health의 executorImports(registry.import_stats)가 보고 → 여기서는 개수만
+    return {"executorsImported": len(registry.warm_all())}
+
+
+def _warm_mapping(framework: str):
+    # 순환 import 방지
+    from app.clients.mapping_client import MappingClient
+    MappingClient().prefetch_requirement_mappings(framework)
+
+
+def run():
+    started = time.time()
+    with _LOCK:
+        _STATE.clear()
+        _STATE.update({"status": "warming", "startedAt": started, "errors": {}})
+    _READY.clear()
+
+    services = required_services()
+    frameworks = _frameworks()
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+
+    def step(name: str, fn, *args):
+        try:
+            out = fn(*args)
+            if isinstance(out, dict):
+                results.update(out)
+        except Exception as e:
+            errors[name] = f"{type(e).__name__}: {e}"
+
+    # 기본 세션 생성은 스레드 안전하지 않으므로 먼저 만든다
+    if boto3.DEFAULT_SESSION is None:
+        boto3.setup_default_session()
+
+    with ThreadPoolExecutor(max_workers=max(1, int(settings.WARMUP_CONCURRENCY))) as ex:
+        futs = [
+            ex.submit(step, "executors", _warm_executors),
+            ex.submit(step, "credentials", _warm_credentials),
+            ex.submit(step, "regions", _warm_regions),
+        ]
+        futs += [ex.submit(step, f"client:{s}", _warm_client, s) for s in services]
+        futs += [ex.submit(step, f"mapping:{fw}", _warm_mapping, fw) for fw in frameworks]
+        for f in futs:
+            f.result()
+
+    with _LOCK:
+        _STATE.update({
+            "status": "ready",
+            "seconds": round(time.time() - started, 3),
+            "services": len(services),
+            "frameworks": frameworks,
+            "errors": errors,
+            **results,
+        })
+    _READY.set()
+
+
+def start() -> Optional[threading.Thread]:
+    """WARMUP_ENABLED면 백그라운드 스레드로 run(). 아니면 즉시 준비 완료"""
+    if not settings.WARMUP_ENABLED:
+        with _LOCK:
+            _STATE.update({"status": "ready"})
+        _READY.set()
+        return None
+    with _LOCK:
+        _STATE.update({"status": "warming"})
+    t = threading.Thread(target=run, name="warmup", daemon=True)
+    t.start()
+    return t
+
+
+def is_ready() -> bool:
+    return _READY.is_set()
+
+
+def status() -> Dict[str, Any]:
+    with _LOCK:
+        return dict(_STATE)
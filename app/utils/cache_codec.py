@@ -0,0 +1,134 @@
+# app/utils/cache_codec.py
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from typing import Any, Optional
+
+from app.core.config import settings
+
+try:
+    import zstandard as _zstd  # type: ignore
+except Exception:
+    _zstd = None
+
+try:
+    import msgpack as _msgpack  # type: ignore
+except Exception:
+    _msgpack = None
+
+# 공유 캐시 값 봉투(envelope) 형식 — 버전/코덱/인코딩을 값 앞에 붙여 저장
+#   [0:4)  MAGIC b"\x00DSC" (첫 바이트 0x00 → 예전 평문 JSON 항목과 구분)
+#   [4]    version
+#   [5]    codec    0=none 1=zlib 2=zstd
+#   [6]    encoding 0=json(utf-8) 1=msgpack
+#   [7:9)  ETag 길이(u16) → 이어서 ETag(ascii), 그 뒤 압축된 payload
+# - 응답 캐시는 응답 본문(JSON 바이트)과 ETag를 그대로 보관 → 적중 시 파싱 없이 전송(코덱이 맞으면 압축 해제도 생략)
+# - 예전 평문 JSON 항목은 그대로 읽힌다
+
+MAGIC = b"\x00DSC"
+VERSION = 1
+_HDR = struct.Struct("<4sBBBH")
+
+NONE, ZLIB, ZSTD = 0, 1, 2
+JSON, MSGPACK = 0, 1
+
+# HTTP Content-Encoding 이름(압축된 payload를 그대로 내보낼 때)
+CONTENT_ENCODING = {ZLIB: "deflate", ZSTD: "zstd"}
+
+
+def _codec() -> int:
+    name = (settings.CACHE_CODEC or "auto").lower()
+    if name == "none":
+        return NONE
+    if name == "zstd" or (name == "auto" and _zstd is not None):
+        return ZSTD if _zstd is not None else ZLIB
+    return ZLIB
+
+
+def _encoding() -> int:
+    name = (settings.CACHE_ENCODING or "auto").lower()
+    if name in ("msgpack", "auto") and _msgpack is not None:
+        return MSGPACK
+    return JSON
+
+
+def _compress(codec: int, data: bytes) -> bytes:
+    if codec == ZSTD:
+        return _zstd.ZstdCompressor(level=3).compress(data)
+    if codec == ZLIB:
+        return zlib.compress(data, 6)
+    return data
+
+
+def _decompress(codec: int, data: bytes) -> bytes:
+    if codec == ZSTD:
+        if _zstd is None:
+            raise ValueError("zstd entry but zstandard is not installed")
+        return _zstd.ZstdDecompressor().decompress(data)
+    if codec == ZLIB:
+        return zlib.decompress(data)
+    return data
+
+
+class Envelope:
+    """디코딩된 봉투. 본문 압축 해제/값 파싱은 필요할 때만 수행"""
+    __slots__ = ("codec", "encoding", "etag", "payload", "_body")
+
+    def __init__(self, codec: int, encoding: int, etag: Optional[str], payload: bytes):
+        self.codec = codec
+        self.encoding = encoding
+        self.etag = etag
+        self.payload = payload  # 압축된 상태
+        self._body: Optional[bytes] = None
+
+    def body(self) -> bytes:
+        if self._body is None:
+            self._body = _decompress(self.codec, self.payload)
+        return self._body
+
+    def value(self) -> Any:
+        raw = self.body()
+        if self.encoding == MSGPACK:
+            if _msgpack is None:
+                raise ValueError("msgpack entry but msgpack is not installed")
+            return _msgpack.unpackb(raw, raw=False)
+        return json.loads(raw)
+
+    @property
+    def content_encoding(self) -> Optional[str]:
+        return CONTENT_ENCODING.get(self.codec)
+
+
+def _pack(codec: int, encoding: int, etag: Optional[str], data: bytes) -> bytes:
+    if len(data) < int(settings.CACHE_COMPRESS_MIN_BYTES):
+        codec = NONE
+    tag = (etag or "").encode("ascii")
+    return _HDR.pack(MAGIC, VERSION, codec, encoding, len(tag)) + tag + _compress(codec, data)
+
+
+def encode_value(value: Any) -> bytes:
+    enc = _encoding()
+    if enc == MSGPACK:
+        data = _msgpack.packb(value, use_bin_type=True, default=str)
+    else:
+        data = json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+    return _pack(_codec(), enc, None, data)
+
+
+def encode_body(body: bytes, etag: Optional[str]) -> bytes:
+    """이미 직렬화된 JSON 응답 본문(+ETag) 저장용"""
+    return _pack(_codec(), JSON, etag, body)
+
+
+def decode(blob: bytes) -> Envelope:
+    if not blob.startswith(MAGIC):
+        # 봉투 도입 전 평문 JSON 항목
+        return Envelope(NONE, JSON, None, bytes(blob))
+    _, version, codec, encoding, tag_len = _HDR.unpack_from(blob, 0)
+    if version != VERSION:
+        raise ValueError(f"unsupported cache envelope version: {version}")
+    off = _HDR.size
+    etag = blob[off: off + tag_len].decode("ascii") or None
+    return Envelope(codec, encoding, etag, bytes(blob[off + tag_len:]))
@@ -1,7 +1,15 @@
 from __future__ import annotations
-from typing import Any, Optional
+import asyncio
+import os
+import time
+from typing import Any, Callable, Optional
 from fastapi import Request, Response
-from .session_cache import make_cache_key, cache_get, cache_set, DEFAULT_TTL_SEC
+from starlette.concurrency import run_in_threadpool
+from app.core import metrics
+from app.core.config import settings
+from . import shared_backend
+from .cache_codec import Envelope
+from .session_cache import make_cache_key, cache_get_entry, cache_set, DEFAULT_TTL_SEC
 
 def _session_id_from(request: Request) -> Optional[str]:
     return request.headers.get("X-Session-Id") or request.cookies.get("sid")
@@ -17,23 +25,74 @@ def compute_request_cache_key(request: Request, *, session_id: Optional[str]) ->
         session_id=session_id,
     )
 
-async def maybe_return_cached(request: Request, response: Response, *, ttl: int = DEFAULT_TTL_SEC) -> Any | None:
-    if request.query_params.get("refresh") in ("1", "true", "True"):
+def wants_refresh(request: Optional[Request]) -> bool:
+    return request is not None and request.query_params.get("refresh") in ("1", "true", "True")
+
+async def maybe_return_cached(request: Request, response: Response, *, ttl: int = DEFAULT_TTL_SEC) -> Envelope | None:
+    """적중 시 저장된 응답 본문 봉투 반환(etag_response가 디코딩 없이 전송)"""
+    if wants_refresh(request):
         response.headers["X-Cache"] = "BYPASS"
+        metrics.CACHE_LOOKUPS.inc(cache="response", result="bypass")
         return None
     sid = _session_id_from(request)
     key = compute_request_cache_key(request, session_id=sid)
-    cached = cache_get(key)
+    cached = cache_get_entry(key)
     if cached is not None:
         response.headers["X-Cache"] = "HIT"
+        metrics.CACHE_LOOKUPS.inc(cache="response", result="hit")
         return cached
     request.state._cache_key = key
     request.state._cache_ttl = ttl
     response.headers["X-Cache"] = "MISS"
+    metrics.CACHE_LOOKUPS.inc(cache="response", result="miss")
     return None
 
-def store_response_to_cache(request: Request, payload: Any):
+def store_response_to_cache(request: Request, payload: Any) -> Envelope | None:
     key = getattr(request.state, "_cache_key", None)
     ttl = getattr(request.state, "_cache_ttl", DEFAULT_TTL_SEC)
     if key:
-        cache_set(key, payload, ttl=ttl)
+        return cache_set(key, payload, ttl=ttl)
+    return None
+
+_BUSY = object()  # 다른 실행이 잠금을 잡고 있음
+
+async def single_flight(request: Request, response: Response, compute: Callable[[], Any]) -> Any:
+    """
+    같은 캐시 키의 감사가 이미 (어느 워커에서든) 실행 중이면 다시 실행하지 않고 그 결과를 기다린다.
+    - 공유 저장소의 INFLIGHT:<key> 잠금(set-if-absent, TTL)으로 조정
+    - 실행한 쪽이 결과를 응답 캐시에 저장한 뒤 잠금 해제 → 대기 쪽은 캐시에서 읽음
+    - 대기 한도(INFLIGHT_WAIT_SECONDS) 초과 또는 잠금만 사라진 경우 직접 실행
+    - 감사 실행/직렬화/잠금 처리는 스레드풀에서 → 이벤트 루프(같은 키 대기자, /health)를 막지 않음
+    """
+    key = getattr(request.state, "_cache_key", None)
+    if not key:
+        return await run_in_threadpool(compute)
+    lock = "INFLIGHT:" + key
+    store = shared_backend.backend()
+    deadline = time.time() + float(settings.INFLIGHT_WAIT_SECONDS)
+
+    def compute_and_store() -> Any:
+        result = compute()
+        # 저장한 봉투를 그대로 응답(직렬화 1회)
+        return store_response_to_cache(request, result) or result
+
+    def locked() -> Any:
+        if not store.add(lock, str(os.getpid()).encode(), ttl=float(settings.INFLIGHT_LOCK_TTL_SECONDS)):
+            return _BUSY
+        try:
+            return compute_and_store()
+        finally:
+            store.delete(lock)
+
+    while True:
+        result = await run_in_threadpool(locked)
+        if result is not _BUSY:
+            return result
+        await asyncio.sleep(0.2)
+        cached = cache_get_entry(key)
+        if cached is not None:
+            response.headers["X-Cache"] = "COALESCED"
+            metrics.CACHE_LOOKUPS.inc(cache="response", result="coalesced")
+            return cached
+        if time.time() > deadline:
+            return await run_in_threadpool(compute_and_store)
@@ -11,6 +11,13 @@ from typing import Any
 from pydantic import BaseModel
 from starlette.responses import JSONResponse, Response
 
+from app.utils.cache_codec import Envelope
+
+# 호출자가 넘긴 response에 설정된 헤더 중 새 응답에도 옮길 것
+_PASSTHROUGH_HEADERS = ("X-Cache", "Server-Timing")
+# 감사 결과(AuditResult)에서 실행마다 바뀌는 필드 → ETag 계산에서 제외(실행 계측 wallMs/ms, 캐시 적중 표시)
+_VOLATILE_RESULT_FIELDS = ("timing",)
+
 
 def _to_jsonable(obj: Any) -> Any:
     """
@@ -47,8 +54,22 @@ def _stable_bytes(data: Any) -> bytes:
     ).encode("utf-8")
 
 
+def _without_volatile(obj: Any) -> Any:
+    """AuditResult 모양(mapping_code 포함) dict에서 _VOLATILE_RESULT_FIELDS 제거"""
+    if isinstance(obj, list):
+        return [_without_volatile(x) for x in obj]
+    if isinstance(obj, dict):
+        drop = _VOLATILE_RESULT_FIELDS if "mapping_code" in obj else ()
+        return {k: _without_volatile(v) for k, v in obj.items() if k not in drop}
+    return obj
+
+
 def _etag_for(data: Any) -> str:
-    return hashlib.sha256(_stable_bytes(data)).hexdigest()
+    """
+    본문과 같은 직렬화에서 실행 계측(timing)만 뺀 해시.
+    같은 감사 데이터면 새로 실행했든 캐시 적중이든 ETag가 같아 If-None-Match가 맞는다
+    """
+    return hashlib.sha256(_stable_bytes(_without_volatile(_to_jsonable(data)))).hexdigest()
 
 
 def etag_response(
@@ -60,9 +81,12 @@ def etag_response(
     """
     ETag 인식 JSON 응답 생성.
     - BaseModel/dataclass/datetime/Decimal 등 안전 직렬화
+    - 캐시 봉투(Envelope)면 저장된 본문/ETag를 그대로 사용(재직렬화 없음)
     - If-None-Match 일치 시 304 반환
     - Cache-Control/ETag 헤더 설정
     """
+    if isinstance(data, Envelope):
+        return _envelope_response(request, response, data, status_code)
     etag = _etag_for(data)
     inm = request.headers.get("if-none-match")
     if inm and inm.strip('"') == etag:
@@ -80,5 +104,52 @@ def etag_response(
     if response is not None:
         response.headers["ETag"] = f'"{etag}"'
         response.headers["Cache-Control"] = "private, max-age=0, must-revalidate"
+        # 캐시 상태(HIT/MISS/BYPASS/COALESCED), Server-Timing은 새 응답에도 전달
+        for h in _PASSTHROUGH_HEADERS:
+            if h in response.headers:
+                r.headers[h] = response.headers[h]
 
     return r
+
+
+def _accepts(header: str, coding: str) -> bool:
+    """
+    Accept-Encoding에서 coding의 q값이 0보다 큰지(RFC 9110 12.5.3).
+    토큰 단위로 비교(x-gzip 같은 부분 일치 없음), 명시가 없으면 "*"의 q값을 따름
+    """
+    q: dict = {}
+    for part in header.lower().split(","):
+        name, _, params = part.partition(";")
+        name = name.strip()
+        if not name:
+            continue
+        weight = 1.0
+        for p in params.split(";"):
+            k, _, v = p.strip().partition("=")
+            if k == "q":
+                try:
+                    weight = float(v)
+                except ValueError:
+                    weight = 0.0
+        q[name] = weight
+    weight = q.get(coding.lower(), q.get("*", 0.0))
+    return weight > 0
+
+
+def _envelope_response(request, response: Response | None, env: Envelope, status_code: int) -> Response:
+    etag = env.etag or hashlib.sha256(env.body()).hexdigest()
+    headers = {"ETag": f'"{etag}"', "Cache-Control": "private, max-age=0, must-revalidate", "Vary": "Accept-Encoding"}
+    if response is not None:
+        for h in _PASSTHROUGH_HEADERS:
+            if h in response.headers:
+                headers[h] = response.headers[h]
+    inm = request.headers.get("if-none-match")
+    if inm and inm.strip('"') == etag:
+        return Response(status_code=304, headers=headers)
+
+    # 클라이언트가 저장 코덱을 받을 수 있으면 압축된 채로 전송(압축 해제 생략)
+    ce = env.content_encoding
+    if ce and _accepts(request.headers.get("accept-encoding", ""), ce):
+        headers["Content-Encoding"] = ce
+        return Response(content=env.payload, status_code=status_code, media_type="application/json", headers=headers)
+    return Response(content=env.body(), status_code=status_code, media_type="application/json", headers=headers)
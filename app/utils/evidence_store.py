@@ -0,0 +1,125 @@
+# app/utils/evidence_store.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+# 콘텐츠 주소 기반 증거(evidence) 저장소
+# - AWS 원본 문서(버킷 암호화 설정, 배포 설정, 버킷 정책 등)를 sha256 해시로 한 번만 저장
+# - 평가(ServiceEvaluation.extra)에는 {"$ref": "sha256:<hex>"} 참조만 남김
+# - 저장 형식: <EVIDENCE_STORE_DIR>/<hex[:2]>/<hex[2:]>.json.z (zlib 압축된 정규화 JSON)
+
+REF_KEY = "$ref"
+_PREFIX = "sha256:"
+
+# 이미 디스크에 있는 것으로 확인된 해시(매번 stat 하지 않도록)
+_KNOWN_MAX = 4096
+_known: "OrderedDict[str, int]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {"puts": 0, "dedupHits": 0, "writes": 0, "bytesWritten": 0}
+
+
+def _strip_volatile(doc: Any) -> Any:
+    # ResponseMetadata(RequestId, date 헤더 등)는 호출마다 달라져 중복 제거를 방해하므로 제외
+    if isinstance(doc, dict):
+        return {k: v for k, v in doc.items() if k != "ResponseMetadata"}
+    return doc
+
+
+def _canonical_bytes(doc: Any) -> bytes:
+    return json.dumps(
+        _strip_volatile(doc),
+        ensure_ascii=False,
+        separators=(",", ":"),
+        sort_keys=True,
+        default=str,
+    ).encode("utf-8")
+
+
+def _path_for(hexdigest: str) -> str:
+    return os.path.join(settings.EVIDENCE_STORE_DIR, hexdigest[:2], hexdigest[2:] + ".json.z")
+
+
+def _remember(hexdigest: str, size: int):
+    _known[hexdigest] = size
+    _known.move_to_end(hexdigest)
+    while len(_known) > _KNOWN_MAX:
+        _known.popitem(last=False)
+
+
+def is_ref(value: Any) -> bool:
+    return isinstance(value, dict) and isinstance(value.get(REF_KEY), str) and value[REF_KEY].startswith(_PREFIX)
+
+
+def put_evidence(doc: Any) -> Any:
+    """
+    문서를 저장하고 참조를 반환.
+    저장소가 비활성화되어 있거나 쓰기에 실패하면 원본 문서를 그대로 반환(기존 동작 유지).
+    """
+    if not settings.EVIDENCE_STORE_ENABLED or doc is None or is_ref(doc):
+        return doc
+
+    raw = _canonical_bytes(doc)
+    hexdigest = hashlib.sha256(raw).hexdigest()
+    ref = {REF_KEY: _PREFIX + hexdigest, "size": len(raw)}
+
+    with _lock:
+        _stats["puts"] += 1
+        if hexdigest in _known:
+            _known.move_to_end(hexdigest)
+            _stats["dedupHits"] += 1
+            return ref
+
+    path = _path_for(hexdigest)
+    try:
+        if os.path.exists(path):
+            with _lock:
+                _stats["dedupHits"] += 1
+                _remember(hexdigest, len(raw))
+            return ref
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        blob = zlib.compress(raw, 6)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, path)  # 원자적 교체 → 동시 쓰기여도 내용은 동일
+        with _lock:
+            _stats["writes"] += 1
+            _stats["bytesWritten"] += len(blob)
+            _remember(hexdigest, len(raw))
+        return ref
+    except OSError:
+        return doc
+
+
+def get_evidence(digest: str) -> Optional[Any]:
+    """
+    "sha256:<hex>" 또는 "<hex>" 로 원본 문서를 조회. 없으면 None.
+    """
+    hexdigest = digest[len(_PREFIX):] if digest.startswith(_PREFIX) else digest
+    if len(hexdigest) != 64 or any(c not in "0123456789abcdef" for c in hexdigest):
+        return None
+    try:
+        with open(_path_for(hexdigest), "rb") as f:
+            return json.loads(zlib.decompress(f.read()).decode("utf-8"))
+    except (OSError, zlib.error, ValueError):
+        return None
+
+
+def evidence_stats() -> Dict[str, Any]:
+    """/health 노출용: 저장 요청/중복 제거 적중/실제 기록 수(워커별)"""
+    with _lock:
+        return {
+            "enabled": bool(settings.EVIDENCE_STORE_ENABLED),
+            **_stats,
+            "knownDigests": len(_known),
+            "dir": settings.EVIDENCE_STORE_DIR,
+        }
@@ -1,49 +1,14 @@
 from __future__ import annotations
-import os, time, threading, json, hashlib
-from typing import Any, Optional, Tuple
+import os, json, hashlib
+from typing import Any, Optional
 
-DEFAULT_TTL_SEC = int(os.getenv("SESSION_TTL_SEC", "600"))
-MAX_ITEMS = int(os.getenv("SESSION_CACHE_MAX", "512"))
-
-REDIS_URL = os.getenv("REDIS_URL")
-_r = None
-if REDIS_URL:
-    try:
-        import redis  # type: ignore
-        _r = redis.Redis.from_url(REDIS_URL, decode_responses=True)
-    except Exception:
-        _r = None
-
-class _TTLCache:
-    def __init__(self, ttl: int = DEFAULT_TTL_SEC, max_items: int = MAX_ITEMS):
-        self.ttl = ttl
-        self.max_items = max_items
-        self._store: dict[str, Tuple[float, Any]] = {}
-        self._lock = threading.RLock()
-
-    def _gc(self):
-        now = time.time()
-        for k, (exp, _) in list(self._store.items()):
-            if exp < now:
-                self._store.pop(k, None)
-        if len(self._store) > self.max_items:
-            items = sorted(self._store.items(), key=lambda kv: kv[1][0])
-            for k, _ in items[: len(self._store) - self.max_items]:
-                self._store.pop(k, None)
+from app.utils import cache_codec, shared_backend
+from app.utils.etag_utils import _etag_for, _stable_bytes
 
-    def get(self, key: str) -> Optional[Any]:
-        with self._lock:
-            self._gc()
-            v = self._store.get(key)
-            return None if not v else v[1]
-
-    def set(self, key: str, value: Any, ttl: Optional[int] = None):
-        ttl = self.ttl if ttl is None else ttl
-        with self._lock:
-            self._store[key] = (time.time() + ttl, value)
-            self._gc()
+DEFAULT_TTL_SEC = int(os.getenv("SESSION_TTL_SEC", "600"))
 
-_mem = _TTLCache()
+# 저장소는 app.utils.shared_backend (memory / shm / redis). REDIS_URL이 있으면 redis
+# 멀티 워커(WEB_CONCURRENCY>1)에서도 워커끼리 응답 캐시를 공유
 
 def make_cache_key(path: str, method: str, query: dict[str, Any], body: Any = None, session_id: str | None = None) -> str:
     payload = {
@@ -56,23 +21,25 @@ def make_cache_key(path: str, method: str, query: dict[str, Any], body: Any = No
     raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
     return "RESP:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
+def cache_get_entry(key: str) -> Optional[cache_codec.Envelope]:
+    """응답 본문 봉투(본문 바이트 + ETag). 파싱하지 않음"""
+    raw = shared_backend.backend().get(key)
+    return cache_codec.decode(raw) if raw else None
+
 def cache_get(key: str) -> Optional[Any]:
-    if _r:
-        raw = _r.get(key)
-        return json.loads(raw) if raw else None
-    return _mem.get(key)
+    env = cache_get_entry(key)
+    return env.value() if env is not None else None
 
-def cache_set(key: str, value: Any, ttl: Optional[int] = None):
+def cache_set(key: str, value: Any, ttl: Optional[int] = None) -> cache_codec.Envelope:
+    """응답과 같은 직렬화(정렬된 compact JSON)로 본문 저장 + ETag(실행 계측 제외, etag_utils._etag_for)"""
     ttl = DEFAULT_TTL_SEC if ttl is None else ttl
-    if _r:
-        _r.set(key, json.dumps(value, ensure_ascii=False), ex=ttl)
-    else:
-        _mem.set(key, value, ttl=ttl)
+    body = _stable_bytes(value)
+    etag = _etag_for(value)
+    blob = cache_codec.encode_body(body, etag)
+    shared_backend.backend().set(key, blob, ttl)
+    env = cache_codec.decode(blob)
+    env._body = body
+    return env
 
 def cache_clear(prefix: str | None = None):
-    if _r:
-        pat = (prefix or "RESP:") + "*"
-        for k in _r.scan_iter(pat):  # type: ignore[attr-defined]
-            _r.delete(k)
-    else:
-        _mem._store.clear()
+    shared_backend.backend().clear(prefix or "RESP:")
@@ -1,7 +1,7 @@
 # app/utils/session_introspect.py
 from __future__ import annotations
 from typing import Any, Dict, Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 
 # ⬇ 추가: 세션 프레임워크 사이드카 컨텍스트 합치기
 from app.utils.session_mark import get_session_context
@@ -10,6 +10,8 @@ def _to_iso(dt: Any) -> Optional[str]:
     try:
         if isinstance(dt, datetime):
             return dt.isoformat()
+        if isinstance(dt, (int, float)):
+            return datetime.fromtimestamp(dt, timezone.utc).isoformat()
         return getattr(dt, "isoformat")()
     except Exception:
         return None
@@ -47,6 +49,14 @@ def _session_to_dict(sobj: Any) -> Dict[str, Any]:
             except Exception:
                 pass
 
+    # 메모리/연결 집계(세션 객체가 제공하면)
+    st = getattr(sobj, "stats", None)
+    if callable(st):
+        try:
+            out["usage"] = st()
+        except Exception:
+            pass
+
     # ⬇ 사이드카에 있는 컨텍스트와 병합(객체에 없을 때 보강)
     sid = out.get("id")
     if sid:
@@ -89,16 +99,33 @@ def _get_registry_from_core() -> Optional[Dict[str, Any]]:
             return reg
     return None
 
+def _shared_sessions() -> Dict[str, Dict[str, Any]]:
+    try:
+        from app.core.session import shared_sessions
+        return shared_sessions()
+    except Exception:
+        return {}
+
+def _meta_to_dict(meta: Dict[str, Any]) -> Dict[str, Any]:
+    out = dict(meta)
+    for k in ("created_at", "last_used_at", "expires_at"):
+        if out.get(k) is not None:
+            out[k] = _to_iso(out[k])
+    ctx = get_session_context(str(out.get("id")))
+    if ctx:
+        out.setdefault("frameworks", ctx.get("frameworks"))
+        out.setdefault("last_framework", ctx.get("last_framework"))
+        out["framework_counts"] = ctx.get("counts")
+    return out
+
 def peek_session(session_id: str) -> Dict[str, Any]:
-    reg = _get_registry_from_core()
-    if not reg:
-        # 레지스트리가 없더라도 사이드카 컨텍스트만이라도 반환
-        ctx = get_session_context(session_id)
-        if ctx:
-            return {"exists": True, "session": {"id": session_id, **ctx}}
-        return {"exists": False}
+    reg = _get_registry_from_core() or {}
     sobj = reg.get(session_id)
     if not sobj:
+        # 다른 워커가 보유한 세션(공유 메타데이터)
+        meta = _shared_sessions().get(session_id)
+        if meta:
+            return {"exists": True, "session": _meta_to_dict(meta)}
         ctx = get_session_context(session_id)
         if ctx:
             return {"exists": True, "session": {"id": session_id, **ctx}}
@@ -106,12 +133,18 @@ def peek_session(session_id: str) -> Dict[str, Any]:
     return {"exists": True, "session": _session_to_dict(sobj)}
 
 def list_sessions() -> Dict[str, Any]:
-    reg = _get_registry_from_core()
-    if not reg:
-        return {"count": 0, "sessions": []}
+    reg = _get_registry_from_core() or {}
     items: List[Dict[str, Any]] = []
     for sid, sobj in reg.items():
         d = _session_to_dict(sobj)
         d["id"] = d.get("id") or sid
         items.append(d)
-    return {"count": len(items), "sessions": items}
+    for sid, meta in _shared_sessions().items():
+        if sid not in reg:
+            items.append(_meta_to_dict(meta))
+    try:
+        from app.core.config import settings
+        cap = int(settings.SESSION_MAX_COUNT)
+    except Exception:
+        cap = None
+    return {"count": len(items), "max": cap, "sessions": items}
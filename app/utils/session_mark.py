@@ -3,9 +3,15 @@ from __future__ import annotations
 from typing import Any, Dict, Optional
 from datetime import datetime, timezone
 
+from app.utils import shared_backend
+
 # 사이드카 저장소(세션 객체에 직접 속성 주입이 안될 때 대비)
 _SIDE_CAR: Dict[str, Dict[str, Any]] = {}
 
+# 워커 간 공유 사본(app.utils.shared_backend). 다른 워커가 처리한 프레임워크 이력도 합쳐서 보이도록
+_SHARED_PREFIX = "SESSION_CTX:"
+_SHARED_TTL = 86400
+
 def _sid_of(session_obj: Any) -> Optional[str]:
     sid = getattr(session_obj, "id", None) or getattr(session_obj, "session_id", None)
     return str(sid) if sid else None
@@ -31,7 +37,10 @@ def mark_session_framework(session_obj: Any, framework: str):
                 if framework not in seen:
                     seen.append(framework)
         setattr(session_obj, "last_framework", framework)
-        setattr(session_obj, "last_used_at", now)
+        # last_used_at은 AuditSession의 읽기 전용 속성 → touch()로 갱신
+        touch = getattr(session_obj, "touch", None)
+        if callable(touch):
+            touch()
     except Exception:
         pass
 
@@ -42,11 +51,49 @@ def mark_session_framework(session_obj: Any, framework: str):
         rec["counts"][framework] = rec["counts"].get(framework, 0) + 1
         rec["last_framework"] = framework
         rec["last_used_at"] = now
+        _publish(sid, framework, now)
+
+def _publish(sid: str, framework: str, now: datetime):
+    def merge(shared: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        shared = shared or {"frameworks": [], "counts": {}}
+        if framework not in shared["frameworks"]:
+            shared["frameworks"].append(framework)
+        shared["counts"][framework] = shared["counts"].get(framework, 0) + 1
+        shared["last_framework"] = framework
+        shared["last_used_at"] = now.isoformat()
+        return shared
+
+    try:
+        # 여러 워커가 같은 세션을 동시에 갱신해도 횟수가 유실되지 않도록 잠금 안에서 읽고-고쳐-쓰기
+        shared_backend.update_json(_SHARED_PREFIX + sid, merge, ttl=_SHARED_TTL)
+    except Exception:
+        pass
+
+def forget_session_context(session_id: str, shared: bool = False):
+    """세션 만료/축출 시 사이드카 정리(shared=True면 워커 공유 사본도 삭제)"""
+    _SIDE_CAR.pop(str(session_id), None)
+    if shared:
+        try:
+            shared_backend.backend().delete(_SHARED_PREFIX + str(session_id))
+        except Exception:
+            pass
 
 def get_session_context(session_id: str) -> Optional[Dict[str, Any]]:
     rec = _SIDE_CAR.get(session_id)
     if not rec:
-        return None
+        # 다른 워커에서 기록된 컨텍스트
+        try:
+            shared = shared_backend.get_json(_SHARED_PREFIX + session_id)
+        except Exception:
+            shared = None
+        if not shared:
+            return None
+        return {
+            "frameworks": sorted(shared.get("frameworks", [])),
+            "counts": dict(shared.get("counts", {})),
+            "last_framework": shared.get("last_framework"),
+            "last_used_at": shared.get("last_used_at"),
+        }
     # 직렬화 가능한 형태로 변환
     return {
         "frameworks": sorted(list(rec.get("frameworks", []))),
@@ -0,0 +1,614 @@
+# app/utils/shared_backend.py
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import queue
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
+
+from app.core import metrics
+from app.core.config import settings
+from app.utils import cache_codec
+
+# 워커(프로세스) 간 공유 저장소
+# - 응답 캐시, 매핑별 결과 캐시, 세션 메타데이터, 진행 중 감사 조정(single-flight 잠금)이 사용
+# - SHARED_BACKEND
+#     memory: 프로세스 로컬 dict (워커 1개)
+#     shm   : /dev/shm(공유 메모리 tmpfs)의 SQLite 파일 — 같은 호스트/컨테이너의 워커끼리 공유
+#     redis : REDIS_URL (redis 패키지 필요, 없으면 shm으로 대체)
+#     auto  : REDIS_URL이 있으면 redis, WEB_CONCURRENCY>1이면 shm, 아니면 memory
+# 값은 bytes. get_json/set_json은 app.utils.cache_codec 봉투(압축+인코딩)로 저장/복원
+#
+# 계층 캐시(TieredBackend): 응답/매핑 결과 키(CACHE_TIER_PREFIXES)는
+#   L1 프로세스 메모리(인코딩된 값, CACHE_L1_MAX_ITEMS) → L2 공유 저장소(redis/shm) → L3 로컬 디스크(CACHE_DISK_DIR, mmap)
+# 순으로 조회하고 아래 계층 적중은 위로 승격. 세션 메타/실행 잠금 등 나머지 키는 공유 저장소로 직행
+
+
+class SharedBackend(Protocol):
+    name: str
+    def get(self, key: str) -> Optional[bytes]: ...
+    def get_entry(self, key: str) -> Optional[Tuple[float, bytes]]: ...  # (만료 시각, 값)
+    def set(self, key: str, value: bytes, ttl: float) -> None: ...
+    def add(self, key: str, value: bytes, ttl: float) -> bool: ...
+    def delete(self, key: str) -> None: ...
+    def scan(self, prefix: str) -> Dict[str, bytes]: ...
+    def clear(self, prefix: str) -> None: ...
+
+
+# 용량 초과 축출 대상에서 빼는 키(single-flight/update_json 잠금)
+_PINNED_PREFIXES = ("INFLIGHT:", "LOCK:")
+
+
+class MemoryBackend:
+    name = "memory"
+
+    def __init__(self, max_items: int = 4096, tier: str = "memory"):
+        self.max_items = max_items
+        self.tier = tier  # 축출 메트릭 레이블
+        self._store: Dict[str, tuple] = {}  # key → (만료 시각, 값)
+        self._lock = threading.RLock()
+
+    def _gc(self):
+        now = time.time()
+        for k, (exp, _) in list(self._store.items()):
+            if exp < now:
+                self._store.pop(k, None)
+        if len(self._store) > self.max_items:
+            # 실행 잠금(INFLIGHT:/LOCK:)은 용량 때문에 축출하지 않음(TTL로만 만료)
+            items = sorted((kv for kv in self._store.items() if not kv[0].startswith(_PINNED_PREFIXES)), key=lambda kv: kv[1][0])
+            for k, _ in items[: len(self._store) - self.max_items]:
+                self._store.pop(k, None)
+                metrics.CACHE_EVICTIONS.inc(tier=self.tier)
+
+    def get(self, key: str) -> Optional[bytes]:
+        e = self.get_entry(key)
+        return e[1] if e else None
+
+    def get_entry(self, key: str) -> Optional[Tuple[float, bytes]]:
+        """(만료 시각, 값) — 승격 시 남은 TTL 계산용"""
+        with self._lock:
+            v = self._store.get(key)
+            if v is None or v[0] < time.time():
+                return None
+            return v
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._store[key] = (time.time() + ttl, value)
+            if len(self._store) > self.max_items:
+                self._gc()
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        with self._lock:
+            if self.get(key) is not None:
+                return False
+            self.set(key, value, ttl)
+            return True
+
+    def delete(self, key: str):
+        with self._lock:
+            self._store.pop(key, None)
+
+    def scan(self, prefix: str) -> Dict[str, bytes]:
+        now = time.time()
+        with self._lock:
+            return {k: v for k, (exp, v) in self._store.items() if k.startswith(prefix) and exp >= now}
+
+    def clear(self, prefix: str):
+        with self._lock:
+            for k in [k for k in self._store if k.startswith(prefix)]:
+                self._store.pop(k, None)
+
+
+class SqliteShmBackend:
+    """
+    여러 워커가 같은 SQLite 파일(WAL)을 공유. tmpfs(/dev/shm)에 두면 디스크 I/O 없이 동작.
+    add()는 INSERT OR IGNORE(만료 항목은 먼저 삭제)로 원자적 set-if-absent.
+    """
+    name = "shm"
+
+    def __init__(self, path: str):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as c:
+            c.execute("CREATE TABLE IF NOT EXISTS kv (k TEXT PRIMARY KEY, v BLOB NOT NULL, exp REAL NOT NULL)")
+        self._last_gc = 0.0
+
+    def _conn(self) -> sqlite3.Connection:
+        c = getattr(self._local, "conn", None)
+        if c is None:
+            c = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            c.execute("PRAGMA journal_mode=WAL")
+            c.execute("PRAGMA synchronous=OFF")
+            self._local.conn = c
+        return c
+
+    def _maybe_gc(self, now: float):
+        if now - self._last_gc > 60:
+            self._last_gc = now
+            self._conn().execute("DELETE FROM kv WHERE exp < ?", (now,))
+
+    def get(self, key: str) -> Optional[bytes]:
+        e = self.get_entry(key)
+        return e[1] if e else None
+
+    def get_entry(self, key: str) -> Optional[Tuple[float, bytes]]:
+        row = self._conn().execute("SELECT v, exp FROM kv WHERE k = ?", (key,)).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[1], bytes(row[0])
+
+    def set(self, key: str, value: bytes, ttl: float):
+        now = time.time()
+        self._conn().execute("INSERT OR REPLACE INTO kv (k, v, exp) VALUES (?, ?, ?)", (key, value, now + ttl))
+        self._maybe_gc(now)
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        now = time.time()
+        c = self._conn()
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            c.execute("DELETE FROM kv WHERE k = ? AND exp < ?", (key, now))
+            cur = c.execute("INSERT OR IGNORE INTO kv (k, v, exp) VALUES (?, ?, ?)", (key, value, now + ttl))
+            c.execute("COMMIT")
+        except Exception:
+            c.execute("ROLLBACK")
+            raise
+        return cur.rowcount == 1
+
+    def delete(self, key: str):
+        self._conn().execute("DELETE FROM kv WHERE k = ?", (key,))
+
+    def scan(self, prefix: str) -> Dict[str, bytes]:
+        rows = self._conn().execute(
+            "SELECT k, v FROM kv WHERE k >= ? AND k < ? AND exp >= ?", (prefix, prefix + "\uffff", time.time())
+        ).fetchall()
+        return {k: bytes(v) for k, v in rows}
+
+    def clear(self, prefix: str):
+        self._conn().execute("DELETE FROM kv WHERE k >= ? AND k < ?", (prefix, prefix + "\uffff"))
+
+
+class RedisBackend:
+    """
+    기동 시 PING으로 도달 확인(from_url은 지연 연결이라 생성만으로는 실패를 알 수 없음) → 실패하면 호출자가 shm으로 대체.
+    실행 중 Redis 장애는 캐시 미스로 처리(get/scan은 없음, set/delete는 무시, add는 잠금 없이 진행) → 감사는 계속 동작
+    """
+    name = "redis"
+
+    def __init__(self, url: str):
+        import redis  # type: ignore
+        self._r = redis.Redis.from_url(url, socket_connect_timeout=2.0, socket_timeout=2.0)
+        self._r.ping()
+        self._error = redis.RedisError
+        self.errors = 0
+
+    def _safe(self, default: Any, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        try:
+            return fn(*args, **kwargs)
+        except self._error:
+            self.errors += 1
+            return default
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._safe(None, self._r.get, key)
+
+    def get_entry(self, key: str) -> Optional[Tuple[float, bytes]]:
+        got = self._safe(None, lambda: self._r.pipeline().get(key).pttl(key).execute())
+        if got is None or got[0] is None:
+            return None
+        value, pttl = got
+        # 만료 없는 키(pttl < 0)는 만료 시각을 알 수 없음 → 무한대(L1 상한만 적용)
+        return (time.time() + pttl / 1000.0 if pttl >= 0 else float("inf")), value
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self._safe(None, self._r.set, key, value, px=max(1, int(ttl * 1000)))
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        return bool(self._safe(True, self._r.set, key, value, px=max(1, int(ttl * 1000)), nx=True))
+
+    def delete(self, key: str):
+        self._safe(None, self._r.delete, key)
+
+    def _scan(self, prefix: str) -> Dict[str, bytes]:
+        keys = list(self._r.scan_iter(prefix + "*"))
+        if not keys:
+            return {}
+        vals = self._r.mget(keys)
+        return {(k.decode() if isinstance(k, bytes) else k): v for k, v in zip(keys, vals) if v is not None}
+
+    def scan(self, prefix: str) -> Dict[str, bytes]:
+        return self._safe({}, self._scan, prefix)
+
+    def _clear(self, prefix: str):
+        for k in self._r.scan_iter(prefix + "*"):
+            self._r.delete(k)
+
+    def clear(self, prefix: str):
+        self._safe(None, self._clear, prefix)
+
+
+class DiskMmapBackend:
+    """
+    L3: 키별 파일(만료 시각 + 키 + 값). 읽기는 mmap, 쓰기는 임시 파일 작성 후 os.replace(원자적 교체).
+    재시작 후에도 남아 있어 Redis가 없을 때 결과 유실을 막음. 용량(CACHE_DISK_MAX_MB) 초과 시 만료/오래된 파일부터 삭제.
+    """
+    name = "disk"
+    _HDR = struct.Struct("<dH")  # 만료 시각, 키 길이
+
+    def __init__(self, directory: str, max_bytes: int):
+        os.makedirs(directory, exist_ok=True)
+        self.dir = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._last_gc = 0.0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".bin")
+
+    def _read(self, path: str) -> Optional[Tuple[float, str, bytes]]:
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                exp, klen = self._HDR.unpack_from(m, 0)
+                off = self._HDR.size
+                return exp, m[off: off + klen].decode("utf-8"), m[off + klen:]
+        except (OSError, ValueError, struct.error, UnicodeDecodeError):
+            return None
+
+    def get_entry(self, key: str) -> Optional[Tuple[float, bytes]]:
+        """(만료 시각, 값) — 승격 시 남은 TTL 계산용"""
+        path = self._path(key)
+        item = self._read(path)
+        if item is None or item[1] != key:
+            return None
+        if item[0] < time.time():
+            self._unlink(path)
+            return None
+        return item[0], item[2]
+
+    def get(self, key: str) -> Optional[bytes]:
+        e = self.get_entry(key)
+        return e[1] if e else None
+
+    def set(self, key: str, value: bytes, ttl: float):
+        k = key.encode("utf-8")
+        fd, tmp = tempfile.mkstemp(dir=self.dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._HDR.pack(time.time() + ttl, len(k)))
+                f.write(k)
+                f.write(value)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            self._unlink(tmp)
+            raise
+        self._maybe_gc()
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        # 로컬 계층 전용(잠금 용도 아님)
+        with self._lock:
+            if self.get(key) is not None:
+                return False
+            self.set(key, value, ttl)
+            return True
+
+    def delete(self, key: str):
+        self._unlink(self._path(key))
+
+    def _entries(self):
+        for name in os.listdir(self.dir):
+            if name.endswith(".bin"):
+                path = os.path.join(self.dir, name)
+                item = self._read(path)
+                if item is not None:
+                    yield path, item
+
+    def scan(self, prefix: str) -> Dict[str, bytes]:
+        now = time.time()
+        return {key: v for _, (exp, key, v) in self._entries() if key.startswith(prefix) and exp >= now}
+
+    def clear(self, prefix: str):
+        for path, (_, key, _) in list(self._entries()):
+            if key.startswith(prefix):
+                self._unlink(path)
+
+    @staticmethod
+    def _unlink(path: str):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def _maybe_gc(self):
+        now = time.time()
+        if now - self._last_gc < 60:
+            return
+        self._last_gc = now
+        files = []
+        for name in os.listdir(self.dir):
+            path = os.path.join(self.dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+        total = sum(f[1] for f in files)
+        # 만료 파일 먼저, 그다음 오래된 순
+        for _, size, path in sorted(files, key=lambda f: (not self._expired(f[2], now), f[0])):
+            if total <= self.max_bytes:
+                break
+            self._unlink(path)
+            metrics.CACHE_EVICTIONS.inc(tier="l3")
+            total -= size
+
+    def _expired(self, path: str, now: float) -> bool:
+        item = self._read(path)
+        return item is None or item[0] < now
+
+
+class TieredBackend:
+    """
+    L1(프로세스 메모리) → L2(공유 저장소) → L3(로컬 디스크) 계층 캐시.
+    - 계층 대상 키(CACHE_TIER_PREFIXES)만 L1/L3를 거치고, 나머지는 base(공유 저장소)로 직행
+    - 읽기: 위 계층부터 조회, 아래 계층 적중 시 위 계층에 승격(read-through)
+    - 쓰기: L1은 즉시, L2/L3는 백그라운드 스레드가 기록(write-behind)
+    - add/delete/clear는 대기 중인 쓰기를 먼저 비움 → 실행 잠금 해제 전에 결과가 L2에 반영(single-flight 순서 보장)
+    - L1이 공유 저장소 앞에 있을 때는 다른 워커의 갱신을 놓치지 않도록 L1 TTL을 CACHE_L1_TTL_SECONDS로 제한
+    """
+    name = "tiered"
+
+    def __init__(self, base: SharedBackend, disk: Optional[DiskMmapBackend], prefixes: Tuple[str, ...]):
+        self.base = base
+        self.prefixes = prefixes
+        # base가 프로세스 메모리면 그 자체가 L1
+        if isinstance(base, MemoryBackend):
+            self.l1: SharedBackend = base
+            self.l2: Optional[SharedBackend] = None
+            self.l1_ttl_cap: Optional[float] = None
+        else:
+            self.l1 = MemoryBackend(max_items=max(1, int(settings.CACHE_L1_MAX_ITEMS)), tier="l1")
+            self.l2 = base
+            self.l1_ttl_cap = float(settings.CACHE_L1_TTL_SECONDS)
+        self.l3 = disk
+        self.hits = {"l1": 0, "l2": 0, "l3": 0}
+        self.misses = 0
+        self.promotions = 0
+        self.write_errors = 0
+        self._q: "queue.Queue[Tuple[SharedBackend, str, bytes, float]]" = queue.Queue()
+        threading.Thread(target=self._writer, name="cache-write-behind", daemon=True).start()
+
+    def _tiered(self, key: str) -> bool:
+        return key.startswith(self.prefixes)
+
+    def _l1_ttl(self, ttl: float) -> float:
+        return min(ttl, self.l1_ttl_cap) if self.l1_ttl_cap is not None else ttl
+
+    def _writer(self):
+        while True:
+            tier, key, value, ttl = self._q.get()
+            try:
+                tier.set(key, value, ttl)
+            except Exception:
+                self.write_errors += 1
+            finally:
+                self._q.task_done()
+
+    def flush(self):
+        """대기 중인 write-behind 기록이 끝날 때까지 대기"""
+        self._q.join()
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self._tiered(key):
+            return self.base.get(key)
+        v = self.l1.get(key)
+        if v is not None:
+            self.hits["l1"] += 1
+            return v
+        if self.l2 is not None:
+            e = self.l2.get_entry(key)
+            if e is not None:
+                self.hits["l2"] += 1
+                self.promotions += 1
+                # L1 사본이 L2 원본보다 오래 살지 않도록 min(L1 상한, 남은 TTL)
+                self.l1.set(key, e[1], self._l1_ttl(max(0.001, e[0] - time.time())))
+                return e[1]
+        if self.l3 is not None:
+            e = self.l3.get_entry(key)
+            if e is not None:
+                self.hits["l3"] += 1
+                self.promotions += 1
+                remaining = max(1.0, e[0] - time.time())
+                self.l1.set(key, e[1], self._l1_ttl(remaining))
+                if self.l2 is not None:
+                    self._q.put((self.l2, key, e[1], remaining))
+                return e[1]
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: bytes, ttl: float):
+        if not self._tiered(key):
+            self.base.set(key, value, ttl)
+            return
+        self.l1.set(key, value, self._l1_ttl(ttl))
+        for tier in (self.l2, self.l3):
+            if tier is not None:
+                self._q.put((tier, key, value, ttl))
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        self.flush()
+        return self.base.add(key, value, ttl)
+
+    def _tiers(self) -> List[SharedBackend]:
+        return [t for t in (self.l1, self.l2, self.l3) if t is not None]
+
+    def delete(self, key: str):
+        self.flush()
+        for tier in self._tiers() if self._tiered(key) else [self.base]:
+            tier.delete(key)
+
+    def scan(self, prefix: str) -> Dict[str, bytes]:
+        if not self._tiered(prefix):
+            return self.base.scan(prefix)
+        self.flush()
+        out: Dict[str, bytes] = {}
+        for tier in reversed(self._tiers()):  # 위 계층 값 우선
+            out.update(tier.scan(prefix))
+        return out
+
+    def clear(self, prefix: str):
+        self.flush()
+        for tier in self._tiers():
+            tier.clear(prefix)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = sum(self.hits.values()) + self.misses
+        return {
+            "tiers": [n for n, t in (("l1", self.l1), ("l2", self.l2), ("l3", self.l3)) if t is not None],
+            "hits": dict(self.hits),
+            "misses": self.misses,
+            "hitRate": {n: round(h / lookups, 4) for n, h in self.hits.items()} if lookups else {},
+            "promotions": self.promotions,
+            "pendingWrites": self._q.qsize(),
+            "writeErrors": self.write_errors,
+        }
+
+
+def _shm_path() -> str:
+    if settings.SHARED_SHM_PATH:
+        return settings.SHARED_SHM_PATH
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "dspm-audit-shared.sqlite3")
+
+
+def _workers() -> int:
+    try:
+        return int(os.getenv("WEB_CONCURRENCY", "1"))
+    except ValueError:
+        return 1
+
+
+def _create_base() -> SharedBackend:
+    kind = (settings.SHARED_BACKEND or "auto").strip().lower()
+    redis_url = os.getenv("REDIS_URL")
+    if kind == "auto":
+        kind = "redis" if redis_url else ("shm" if _workers() > 1 else "memory")
+    if kind == "redis" and redis_url:
+        try:
+            return RedisBackend(redis_url)
+        except Exception:
+            kind = "shm"
+    if kind in ("shm", "redis"):
+        return SqliteShmBackend(_shm_path())
+    return MemoryBackend(max_items=int(os.getenv("SESSION_CACHE_MAX", "512")))
+
+
+def _create() -> SharedBackend:
+    base = _create_base()
+    disk = None
+    if settings.CACHE_DISK_DIR:
+        disk = DiskMmapBackend(settings.CACHE_DISK_DIR, int(settings.CACHE_DISK_MAX_MB) * 1024 * 1024)
+    # 프로세스 메모리 단독이면 계층을 더할 것이 없음
+    add_l1 = not isinstance(base, MemoryBackend) and int(settings.CACHE_L1_MAX_ITEMS) > 0
+    if disk is None and not add_l1:
+        return base
+    prefixes = tuple(p.strip() for p in settings.CACHE_TIER_PREFIXES.split(",") if p.strip())
+    return TieredBackend(base, disk, prefixes)
+
+
+_BACKEND: Optional[SharedBackend] = None
+_LOCK = threading.Lock()
+
+
+def backend() -> SharedBackend:
+    global _BACKEND
+    if _BACKEND is None:
+        with _LOCK:
+            if _BACKEND is None:
+                _BACKEND = _create()
+    return _BACKEND
+
+
+def flush():
+    """계층 캐시의 대기 중인 write-behind 기록 반영(종료 시)"""
+    if isinstance(_BACKEND, TieredBackend):
+        _BACKEND.flush()
+
+
+def get_json(key: str) -> Optional[Any]:
+    raw = backend().get(key)
+    return cache_codec.decode(raw).value() if raw else None
+
+
+def set_json(key: str, value: Any, ttl: float):
+    backend().set(key, cache_codec.encode_value(value), ttl)
+
+
+def update_json(key: str, fn: Callable[[Optional[Any]], Any], ttl: float, wait: float = 2.0) -> Any:
+    """
+    읽기 → fn(현재 값) → 쓰기를 워커 간 원자적으로(LOCK:<key> set-if-absent 잠금).
+    잠금을 wait초 안에 못 잡으면(잠금 보유 워커 비정상 종료 등) 그냥 진행, 잠금 자체는 TTL로 만료
+    """
+    store = backend()
+    lock = "LOCK:" + key
+    deadline = time.time() + wait
+    held = store.add(lock, b"1", ttl=max(1.0, wait * 2))
+    while not held and time.time() < deadline:
+        time.sleep(0.01)
+        held = store.add(lock, b"1", ttl=max(1.0, wait * 2))
+    try:
+        value = fn(get_json(key))
+        set_json(key, value, ttl)
+        return value
+    finally:
+        if held:
+            store.delete(lock)
+
+
+def scan_json(prefix: str) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for k, raw in backend().scan(prefix).items():
+        try:
+            out[k] = cache_codec.decode(raw).value()
+        except Exception:
+            continue
+    return out
+
+
+def _tier_samples():
+    b = _BACKEND
+    if not isinstance(b, TieredBackend):
+        return []
+    st = b.stats()
+    return [
+        ("cache_tier_hits_total", "counter", "Tiered cache hits per tier",
+         [({"tier": t}, float(n)) for t, n in st["hits"].items()]),
+        ("cache_tier_misses_total", "counter", "Tiered cache lookups that missed every tier", [({}, float(st["misses"]))]),
+        ("cache_tier_promotions_total", "counter", "Entries promoted to an upper tier", [({}, float(st["promotions"]))]),
+        ("cache_write_behind_pending", "gauge", "Pending write-behind writes", [({}, float(st["pendingWrites"]))]),
+    ]
+
+
+metrics.register_collector(_tier_samples)
+
+
+def describe() -> Dict[str, Any]:
+    b = backend()
+    out: Dict[str, Any] = {"backend": b.name, "workers": _workers()}
+    if isinstance(b, TieredBackend):
+        out["backend"] = b.base.name
+        out.update(b.stats())
+        b = b.base
+    if isinstance(b, SqliteShmBackend):
+        out["path"] = b.path
+    if isinstance(b, RedisBackend):
+        out["errors"] = b.errors
+    return out
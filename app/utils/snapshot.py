@@ -0,0 +1,368 @@
+# app/utils/snapshot.py
+from __future__ import annotations
+
+import base64
+import datetime as dt
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from botocore.awsrequest import AWSResponse
+
+from app.core.config import settings
+from app.core.aws_hooks import register_hook
+
+# 감사 실행 기록/재생(오프라인 재현)
+# - record: 감사 중 발생한 모든 AWS API 응답과 Collector/Mapping HTTP 응답을 스냅샷 파일로 저장
+# - replay: executor가 쓰는 클라이언트 계층(botocore before-call 훅, httpx 전송 계층)이 스냅샷에서 응답
+#
+# 파일 형식(mmap 가능, 항목별 지연 해제)
+#   [0:8)   MAGIC
+#   [8:16)  index offset (u64, little-endian)
+#   [16:24) index length (u64)
+#   [24: )  zlib 압축된 항목들 … + zlib 압축된 인덱스 JSON {"entries": {key: [offset, length]}, "meta": {...}}
+# 기록은 추가(append) 방식: flush마다 새 항목 + 새 인덱스를 파일 끝에 덧붙이고 마지막에 헤더만 갱신
+#   (이전 인덱스/덮어쓴 항목은 죽은 영역으로 남음, 헤더 갱신 전에 중단되면 직전 flush 상태 그대로)
+# 죽은 영역이 파일의 절반을 넘으면, 그리고 종료 시(close) 살아 있는 항목만 새 파일에 옮겨 적고 교체(압축)
+
+MAGIC = b"DSPMSNP1"
+_HEADER = struct.Struct("<8sQQ")
+
+
+# ── 직렬화(datetime/bytes 보존) ────────────────────────────────────────────
+def _encode(obj: Any) -> Any:
+    if isinstance(obj, dt.datetime):
+        return {"__dt__": obj.isoformat()}
+    if isinstance(obj, (bytes, bytearray)):
+        return {"__b64__": base64.b64encode(bytes(obj)).decode("ascii")}
+    if isinstance(obj, dict):
+        return {str(k): _encode(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_encode(v) for v in obj]
+    if isinstance(obj, (str, int, float, bool)) or obj is None:
+        return obj
+    return str(obj)
+
+
+def _decode_hook(d: Dict[str, Any]) -> Any:
+    if len(d) == 1:
+        if "__dt__" in d:
+            return dt.datetime.fromisoformat(d["__dt__"])
+        if "__b64__" in d:
+            return base64.b64decode(d["__b64__"])
+    return d
+
+
+def _dumps(obj: Any) -> bytes:
+    return json.dumps(_encode(obj), ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    return json.loads(raw.decode("utf-8"), object_hook=_decode_hook)
+
+
+# ── 파일 읽기/쓰기 ─────────────────────────────────────────────────────────
+class SnapshotWriter:
+    def __init__(self, path: str, meta: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.meta = dict(meta or {})
+        self._pending: Dict[str, bytes] = {}  # key → 아직 파일에 쓰지 않은 압축 레코드
+        self._index: Dict[str, Tuple[int, int]] = {}  # 파일에 쓴 항목 위치
+        self._end = 0  # 파일 끝 오프셋(0이면 이번 프로세스에서 아직 파일을 만들지 않음)
+        self._idx_len = 0  # 현재 인덱스 길이(다음 flush에서 죽은 영역이 됨)
+        self._dead = 0  # 이전 인덱스/덮어쓴 항목이 차지한 바이트
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+
+    def put(self, key: str, record: Any):
+        blob = zlib.compress(_dumps(record), 6)
+        with self._lock:
+            self._pending[key] = blob
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index) + sum(1 for k in self._pending if k not in self._index)
+
+    def save(self, compact: bool = False) -> bool:
+        """대기 중인 항목 기록. compact=True면 죽은 영역이 있을 때 살아 있는 항목만으로 파일을 다시 씀"""
+        with self._save_lock:
+            with self._lock:
+                if not self._pending and not (compact and self._dead):
+                    return False
+                pending, self._pending = self._pending, {}
+            try:
+                if self._end == 0 or (compact and self._dead) or 2 * self._dead_after(pending) > self._end:
+                    self._rewrite(pending)
+                else:
+                    self._append(pending)
+            except BaseException:
+                # 실패하면 다음 flush에서 다시 기록(그 사이 새로 기록된 키가 우선)
+                with self._lock:
+                    self._pending = {**pending, **self._pending}
+                raise
+            return True
+
+    def _dead_after(self, pending: Dict[str, bytes]) -> int:
+        # 이번에 덧붙이면 죽은 영역이 되는 바이트: 지금까지의 죽은 영역 + 현재 인덱스 + 덮어쓸 항목
+        return self._dead + self._idx_len + sum(self._index[k][1] for k in pending if k in self._index)
+
+    def _write_tail(self, f, pending: Dict[str, bytes], index: Dict[str, Tuple[int, int]], off: int):
+        for key, blob in pending.items():
+            f.write(blob)
+            index[key] = (off, len(blob))
+            off += len(blob)
+        idx = zlib.compress(_dumps({"entries": index, "meta": self.meta}), 6)
+        f.write(idx)
+        f.flush()
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, off, len(idx)))
+        return off + len(idx), len(idx)
+
+    def _rewrite(self, pending: Dict[str, bytes]):
+        # 새 파일에 살아 있는 항목 + pending을 쓰고 교체: 첫 기록(이전 실행의 스냅샷은 덮어씀) 또는 압축
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        target = f"{self.path}.{os.getpid()}.tmp"
+        index: Dict[str, Tuple[int, int]] = {}
+        with open(target, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, 0, 0))
+            off = _HEADER.size
+            if self._end:
+                with open(self.path, "rb") as src:
+                    for key, (o, n) in self._index.items():
+                        if key in pending:
+                            continue
+                        src.seek(o)
+                        f.write(src.read(n))
+                        index[key] = (off, n)
+                        off += n
+            end, idx_len = self._write_tail(f, pending, index, off)
+        os.replace(target, self.path)
+        self._index, self._end, self._idx_len, self._dead = index, end, idx_len, 0
+
+    def _append(self, pending: Dict[str, bytes]):
+        index = dict(self._index)
+        dead = self._dead_after(pending)
+        with open(self.path, "r+b") as f:
+            f.seek(self._end)
+            end, idx_len = self._write_tail(f, pending, index, self._end)
+        self._index, self._end, self._idx_len, self._dead = index, end, idx_len, dead
+
+
+class SnapshotReader:
+    def __init__(self, path: str):
+        self.path = path
+        self._f = open(path, "rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, idx_off, idx_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"not a snapshot file: {path}")
+        idx = _loads(zlib.decompress(self._mm[idx_off: idx_off + idx_len]))
+        self.meta: Dict[str, Any] = idx.get("meta") or {}
+        self._index: Dict[str, Tuple[int, int]] = {k: (v[0], v[1]) for k, v in idx["entries"].items()}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def keys(self):
+        return self._index.keys()
+
+    def get(self, key: str) -> Optional[Any]:
+        loc = self._index.get(key)
+        if loc is None:
+            return None
+        off, n = loc
+        return _loads(zlib.decompress(self._mm[off: off + n]))
+
+    def close(self):
+        try:
+            self._mm.close()
+        finally:
+            self._f.close()
+
+
+# ── 키 ─────────────────────────────────────────────────────────────────────
+def aws_key(service: str, region: Optional[str], operation: str, params: Dict[str, Any]) -> str:
+    return "aws|{}|{}|{}|{}".format(service, region or "", operation, _dumps(params).decode("utf-8"))
+
+
+def http_key(method: str, url: httpx.URL) -> str:
+    # 호스트는 제외(게이트웨이/로컬 주소가 달라도 재생 가능), 경로+쿼리만 사용
+    return "http|{}|{}".format(method.upper(), url.raw_path.decode("ascii"))
+
+
+# ── botocore 훅 ────────────────────────────────────────────────────────────
+def _on_params(params, model, context, **kwargs):
+    # before-parameter-build: 사용자 파라미터로 키를 만들어 요청 컨텍스트에 보관
+    context["snapshot_key"] = aws_key(
+        model.service_model.service_name, context.get("client_region"), model.name, params
+    )
+
+
+def _on_after_call(http_response, parsed, model, context, **kwargs):
+    key = context.get("snapshot_key")
+    if key is None or _WRITER is None:
+        return
+    _WRITER.put(key, {"status": getattr(http_response, "status_code", 200), "parsed": parsed})
+
+
+class _RawBody:
+    def __init__(self, body: bytes = b""):
+        self._body = body
+
+    def stream(self, *args, **kwargs):
+        yield self._body
+
+
+def _on_before_call(model, params, context, **kwargs):
+    key = context.get("snapshot_key")
+    rec = _READER.get(key) if (_READER is not None and key) else None
+    if rec is None:
+        rec = {
+            "status": 400,
+            "parsed": {
+                "Error": {"Code": "SnapshotMiss", "Message": f"no recorded response for {model.name}"},
+                "ResponseMetadata": {"HTTPStatusCode": 400},
+            },
+        }
+    context["snapshot_hit"] = True
+    http = AWSResponse(params.get("url", "snapshot://"), rec["status"], {}, _RawBody())
+    return http, rec["parsed"]
+
+
+# ── httpx 전송 계층 ────────────────────────────────────────────────────────
+def _record_http(request: httpx.Request, response: httpx.Response):
+    # 304(조건부 요청)은 본문이 없으므로 기존 200 기록을 덮어쓰지 않음
+    if _WRITER is not None and request.method == "GET" and response.status_code != 304:
+        _WRITER.put(http_key(request.method, request.url), {
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() in ("content-type", "etag", "last-modified")},
+            "body": response.content,
+        })
+
+
+def _replay_http(request: httpx.Request) -> httpx.Response:
+    rec = _READER.get(http_key(request.method, request.url)) if _READER is not None else None
+    if rec is None:
+        return httpx.Response(404, json={"detail": "no recorded response"}, request=request)
+    return httpx.Response(rec["status"], headers=rec.get("headers") or {}, content=rec["body"], request=request)
+
+
+class SnapshotTransport(httpx.BaseTransport):
+    def __init__(self, inner: Optional[httpx.BaseTransport] = None):
+        self.inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if _MODE == "replay":
+            return _replay_http(request)
+        response = self.inner.handle_request(request)
+        response.read()
+        _record_http(request, response)
+        return response
+
+    def close(self):
+        if self.inner is not None:
+            self.inner.close()
+
+
+class AsyncSnapshotTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if _MODE == "replay":
+            return _replay_http(request)
+        response = await self.inner.handle_async_request(request)
+        await response.aread()
+        _record_http(request, response)
+        return response
+
+    async def aclose(self):
+        if self.inner is not None:
+            await self.inner.aclose()
+
+
+def http_transport(limits: httpx.Limits) -> Optional[httpx.BaseTransport]:
+    """스냅샷 모드면 기록/재생 전송 계층, 아니면 None(기본 전송 사용)"""
+    if _MODE == "replay":
+        return SnapshotTransport()
+    if _MODE == "record":
+        return SnapshotTransport(httpx.HTTPTransport(limits=limits))
+    return None
+
+
+def async_http_transport(limits: httpx.Limits, http2: bool = False) -> Optional[httpx.AsyncBaseTransport]:
+    if _MODE == "replay":
+        return AsyncSnapshotTransport()
+    if _MODE == "record":
+        return AsyncSnapshotTransport(httpx.AsyncHTTPTransport(limits=limits, http2=http2))
+    return None
+
+
+# ── 활성화 ─────────────────────────────────────────────────────────────────
+_MODE: str = ""
+_WRITER: Optional[SnapshotWriter] = None
+_READER: Optional[SnapshotReader] = None
+
+
+def mode() -> str:
+    return _MODE
+
+
+def activate(mode_: Optional[str] = None, path: Optional[str] = None):
+    """
+    SNAPSHOT_MODE(record|replay)에 따라 훅 등록. 앱 기동 시 1회 호출.
+    replay에서는 자격 증명/네트워크 없이 동작하도록 기본 세션에 더미 자격 증명을 넣는다.
+    """
+    global _MODE, _WRITER, _READER
+    m = (mode_ if mode_ is not None else settings.SNAPSHOT_MODE or "").strip().lower()
+    p = path or settings.SNAPSHOT_PATH
+    if m not in ("record", "replay"):
+        return
+
+    if m == "record":
+        region = os.getenv("AWS_DEFAULT_REGION") or os.getenv("AWS_REGION") or settings.AWS_REGION
+        _WRITER = SnapshotWriter(p, meta={"region": region, "recorded_at": dt.datetime.utcnow().isoformat()})
+        register_hook("before-parameter-build", _on_params, "snapshot-key")
+        register_hook("after-call", _on_after_call, "snapshot-record")
+    else:
+        _READER = SnapshotReader(p)
+        # 자격 증명 체인이 IMDS 등 네트워크를 타지 않도록 더미 키/리전을 환경변수로 주입
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "replay")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "replay")
+        os.environ.setdefault("AWS_EC2_METADATA_DISABLED", "true")
+        os.environ.setdefault("AWS_DEFAULT_REGION", _READER.meta.get("region") or settings.AWS_REGION)
+        register_hook("before-parameter-build", _on_params, "snapshot-key")
+        register_hook("before-call", _on_before_call, "snapshot-replay")
+    _MODE = m
+
+
+def flush() -> bool:
+    """record 모드에서 지금까지의 응답을 파일로 저장"""
+    if _WRITER is not None:
+        return _WRITER.save()
+    return False
+
+
+def close() -> bool:
+    """종료 시: 남은 응답을 저장하고 죽은 영역(이전 인덱스/덮어쓴 항목)을 정리"""
+    if _WRITER is not None:
+        return _WRITER.save(compact=True)
+    return False
+
+
+def status() -> Dict[str, Any]:
+    if _MODE == "record" and _WRITER is not None:
+        return {"mode": _MODE, "path": _WRITER.path, "entries": len(_WRITER)}
+    if _MODE == "replay" and _READER is not None:
+        return {"mode": _MODE, "path": _READER.path, "entries": len(_READER), "meta": _READER.meta}
+    return {"mode": "off"}
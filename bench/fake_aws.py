@@ -0,0 +1,225 @@
+# bench/fake_aws.py
+from __future__ import annotations
+
+import copy
+import datetime as dt
+import hashlib
+import json
+import random
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+import botocore.session
+from botocore.awsrequest import AWSResponse
+
+from app.core.aws_hooks import register_hook, unregister_hook
+
+# 프로세스 내 가짜 AWS (벤치마크 전용)
+# - botocore before-call 훅에서 네트워크 없이 (http, parsed) 응답을 돌려줌 → executor/boto3 코드는 그대로
+# - 응답은 오퍼레이션의 출력 shape(서비스 모델)으로부터 seed 기반 결정적으로 생성 → 모든 서비스/오퍼레이션 지원
+# - 페이지네이터 모델이 있는 오퍼레이션은 실제처럼 페이지 단위로 응답(NextToken 등) → 호출 수가 규모에 비례
+# - 목록 크기는 Scale.counts("service.Operation" → 전체 항목 수), 없으면 Scale.default_list
+
+_TS = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+_POLICY = json.dumps({
+    "Version": "2012-10-17",
+    "Statement": [{"Effect": "Deny", "Principal": "*", "Action": "s3:*", "Resource": "*",
+                   "Condition": {"Bool": {"aws:SecureTransport": "false"}}}],
+})
+
+
+@dataclass
+class Scale:
+    name: str
+    default_list: int
+    counts: Dict[str, int] = field(default_factory=dict)
+    page_size: int = 100
+
+
+SCALES: Dict[str, Scale] = {
+    "small": Scale("small", 3, {
+        "s3.ListBuckets": 10, "logs.DescribeLogGroups": 100, "kms.ListKeys": 20, "kms.ListAliases": 20,
+        "glue.GetTables": 20, "glue.GetDatabases": 2,
+    }),
+    "medium": Scale("medium", 20, {
+        "s3.ListBuckets": 1_000, "logs.DescribeLogGroups": 10_000, "kms.ListKeys": 500, "kms.ListAliases": 500,
+        "glue.GetTables": 200, "glue.GetDatabases": 10,
+    }),
+    "large": Scale("large", 100, {
+        "s3.ListBuckets": 10_000, "logs.DescribeLogGroups": 100_000, "kms.ListKeys": 5_000, "kms.ListAliases": 5_000,
+        "glue.GetTables": 2_000, "glue.GetDatabases": 20,
+    }),
+}
+
+_MAX_DEPTH = 5
+
+# 한도 파라미터가 없으면 한 번에 전부 돌려주는 오퍼레이션(실제 AWS 동작)
+_UNPAGED_BY_DEFAULT = {"s3.ListBuckets"}
+
+
+class _Body:
+    def stream(self, *args, **kwargs):
+        yield b""
+
+
+class FakeAWS:
+    def __init__(self, scale: Scale, seed: int = 0):
+        self.scale = scale
+        self.seed = seed
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+        self._templates: Dict[Tuple[str, str], Any] = {}
+        self._paginators: Dict[str, Any] = {}
+        self._bs = botocore.session.get_session()
+
+    # ── 값 생성 ──────────────────────────────────────────────────────────
+    def _rng(self, *parts: Any) -> random.Random:
+        h = hashlib.sha256("|".join(map(str, (self.seed,) + parts)).encode()).digest()
+        return random.Random(int.from_bytes(h[:8], "big"))
+
+    def _string(self, shape, name: str, idx: int, rng: random.Random, service: str) -> str:
+        if shape.enum:
+            return rng.choice(shape.enum)
+        lname = name.lower()
+        if "policy" in lname or "document" in lname:
+            return _POLICY
+        if lname.endswith("arn"):
+            return f"arn:aws:{service}:us-east-1:123456789012:{lname[:-3] or 'res'}/{idx:06d}"
+        if lname.endswith("id"):
+            return f"{lname[:-2] or 'id'}-{idx:06d}"
+        if "region" in lname:
+            return "us-east-1"
+        return f"{service}-{lname or 'v'}-{idx:06d}"
+
+    def _value(self, shape, name: str, idx: int, rng: random.Random, service: str, depth: int, skip=()):
+        t = shape.type_name
+        if t == "structure":
+            if depth > _MAX_DEPTH:
+                return {}
+            out = {}
+            for mname, mshape in shape.members.items():
+                if mname in skip or "Token" in mname or "Marker" in mname:
+                    continue
+                if mname == "IsTruncated":
+                    out[mname] = False
+                    continue
+                out[mname] = self._value(mshape, mname, idx, rng, service, depth + 1)
+            return out
+        if t == "list":
+            if depth > _MAX_DEPTH:
+                return []
+            return [self._value(shape.member, name, idx * 10 + i, rng, service, depth + 1) for i in range(rng.randint(1, 2))]
+        if t == "map":
+            return {f"k{i}": self._value(shape.value, name, idx, rng, service, depth + 1) for i in range(rng.randint(0, 2))}
+        if t == "string":
+            return self._string(shape, name, idx, rng, service)
+        if t == "boolean":
+            return rng.random() < 0.5
+        if t in ("integer", "long"):
+            return rng.randint(1, 400)
+        if t in ("float", "double"):
+            return round(rng.random() * 100, 2)
+        if t == "timestamp":
+            return _TS + dt.timedelta(days=rng.randint(0, 700))
+        if t == "blob":
+            return b""
+        return None
+
+    # ── 페이지네이션 ──────────────────────────────────────────────────────
+    def _raw_paginator(self, service: str, op: str) -> Optional[Dict[str, Any]]:
+        if service not in self._paginators:
+            try:
+                self._paginators[service] = self._bs.get_paginator_model(service)
+            except Exception:
+                self._paginators[service] = None
+        model = self._paginators[service]
+        if model is None:
+            return None
+        try:
+            return model.get_paginator(op)
+        except ValueError:
+            return None
+
+    def _paginator(self, service: str, op: str) -> Optional[Dict[str, Any]]:
+        cfg = self._raw_paginator(service, op)
+        if cfg is None:
+            return None
+        # 단순 형태(토큰/결과 키 1개)만 페이지 단위로 흉내
+        if not all(isinstance(cfg.get(k), str) for k in ("input_token", "output_token", "result_key")):
+            return None
+        if "." in cfg["result_key"] or "." in cfg["output_token"]:
+            return None
+        return cfg
+
+    def _list_count(self, key: str) -> int:
+        return self.scale.counts.get(key, self.scale.default_list)
+
+    def respond(self, model, params: Dict[str, Any]) -> Dict[str, Any]:
+        service = model.service_model.service_name
+        op = model.name
+        key = f"{service}.{op}"
+        with self._lock:
+            self.calls[key] += 1
+        out_shape = model.output_shape
+        if out_shape is None:
+            return {"ResponseMetadata": {"HTTPStatusCode": 200, "RetryAttempts": 0}}
+
+        cfg = self._paginator(service, op)
+        # 출력 토큰은 페이지가 남았을 때만 채움(항상 채우면 페이지네이터가 끝나지 않음)
+        raw = self._raw_paginator(service, op) or {}
+        tokens = raw.get("output_token") or []
+        tokens = [tokens] if isinstance(tokens, str) else list(tokens)
+        tokens = tuple(t.split(".")[0] for t in tokens)
+        list_member = cfg["result_key"] if cfg else next(
+            (m for m, s in out_shape.members.items() if s.type_name == "list"), None
+        )
+        # 목록 외 필드는 오퍼레이션별 템플릿(seed 결정적) 재사용
+        tkey = (service, op)
+        if tkey not in self._templates:
+            self._templates[tkey] = self._value(
+                out_shape, op, 0, self._rng(key), service, 0, skip=tokens + ((list_member,) if list_member else ())
+            )
+        parsed = copy.deepcopy(self._templates[tkey])
+
+        if list_member and list_member in out_shape.members:
+            total = self._list_count(key)
+            start = 0
+            end = total
+            if cfg:
+                try:
+                    start = int(params.get(cfg["input_token"]) or 0)
+                except (TypeError, ValueError):
+                    start = 0
+                limit = params.get(cfg.get("limit_key")) if isinstance(cfg.get("limit_key"), str) else None
+                if limit or key not in _UNPAGED_BY_DEFAULT:
+                    end = min(total, start + int(limit or self.scale.page_size))
+                if end < total:
+                    parsed[cfg["output_token"]] = str(end)
+                if isinstance(cfg.get("more_results"), str):
+                    parsed[cfg["more_results"]] = end < total
+            member = out_shape.members[list_member].member
+            parsed[list_member] = [
+                self._value(member, list_member, i, self._rng(key, i), service, 1) for i in range(start, end)
+            ]
+        parsed["ResponseMetadata"] = {"HTTPStatusCode": 200, "RetryAttempts": 0}
+        return parsed
+
+    # ── botocore 훅 ──────────────────────────────────────────────────────
+    def _on_before_call(self, model, params, context, **kwargs):
+        parsed = self.respond(model, context.get("bench_api_params") or {})
+        return AWSResponse(params.get("url", "fake-aws://"), 200, {}, _Body()), parsed
+
+    def _on_params(self, params, context, **kwargs):
+        # 직렬화 전 사용자 파라미터(페이지 토큰 포함)를 컨텍스트에 보관
+        context["bench_api_params"] = dict(params)
+
+    def install(self):
+        """앱 기동(lifespan) 뒤에 호출 → 계측/사실 캐시 훅 다음에 실행"""
+        register_hook("before-parameter-build", self._on_params, "bench-fake-aws-params")
+        register_hook("before-call", self._on_before_call, "bench-fake-aws")
+
+    def uninstall(self):
+        unregister_hook("bench-fake-aws")
+        unregister_hook("bench-fake-aws-params")
@@ -0,0 +1,126 @@
+# bench/fake_mapping.py
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+
+from app.services.registry import EXECUTOR_MODULES
+
+# 가짜 Compliance Mapping API (벤치마크/부하 테스트 전용)
+# - 프레임워크 하나(기본 BENCH)에 요건 N개, 요건마다 구현된 매핑 코드 1~3개(seed 결정적)
+# - 모든 executor가 최소 한 번씩 실행되도록 코드 전체를 먼저 한 바퀴 배정
+# - ETag/If-None-Match 지원(미러 조건부 동기화 경로 그대로)
+# - latency_ms로 업스트림 지연 흉내
+
+
+def build_catalog(seed: int = 0, requirements: Optional[int] = None, framework: str = "BENCH") -> Dict[int, Dict[str, Any]]:
+    rng = random.Random(seed)
+    codes = sorted(EXECUTOR_MODULES)
+    n = requirements or max(1, len(codes) // 2)
+    pool = list(codes)
+    rng.shuffle(pool)
+    out: Dict[int, Dict[str, Any]] = {}
+    for rid in range(1, n + 1):
+        k = rng.randint(1, 3)
+        picked = [pool.pop() for _ in range(min(k, len(pool)))] or rng.sample(codes, k)
+        out[rid] = {
+            "framework": framework,
+            "requirement": {"id": rid, "item_code": f"B-{rid:03d}", "title": f"bench requirement {rid}", "mapping_status": "mapped"},
+            "mappings": [{"code": c, "service": "bench"} for c in dict.fromkeys(picked)],
+        }
+    # 남은 코드는 마지막 요건에 몰아서 배정
+    if pool:
+        out[n]["mappings"].extend({"code": c, "service": "bench"} for c in pool)
+    return out
+
+
+def create_app(seed: int = 0, requirements: Optional[int] = None, latency_ms: float = 0.0) -> FastAPI:
+    app = FastAPI(title="fake mapping api")
+    catalogs: Dict[str, Dict[int, Dict[str, Any]]] = {}
+
+    def catalog(fw: str) -> Dict[int, Dict[str, Any]]:
+        if fw not in catalogs:
+            catalogs[fw] = build_catalog(seed, requirements, fw)
+        return catalogs[fw]
+
+    def reply(request: Request, payload: Any) -> Response:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+    @app.get("/compliance/{fw}/requirements")
+    def requirements_(fw: str, request: Request):
+        if latency_ms:
+            time.sleep(latency_ms / 1000.0)
+        return reply(request, [d["requirement"] for d in catalog(fw).values()])
+
+    @app.get("/compliance/{fw}/requirements/{rid}/mappings")
+    def mappings_(fw: str, rid: int, request: Request):
+        if latency_ms:
+            time.sleep(latency_ms / 1000.0)
+        d = catalog(fw).get(rid)
+        if d is None:
+            return Response(status_code=404)
+        return reply(request, d)
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class FakeMappingServer:
+    """백그라운드 스레드의 uvicorn 서버. with 문으로 사용"""
+
+    def __init__(self, seed: int = 0, requirements: Optional[int] = None, latency_ms: float = 0.0, port: int = 0):
+        self.port = port or free_port()
+        config = uvicorn.Config(
+            create_app(seed, requirements, latency_ms), host="127.0.0.1", port=self.port, log_level="warning"
+        )
+        self.server = uvicorn.Server(config)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> "FakeMappingServer":
+        self._thread = threading.Thread(target=self.server.run, name="fake-mapping", daemon=True)
+        self._thread.start()
+        deadline = time.time() + 10
+        while not self.server.started and time.time() < deadline:
+            time.sleep(0.02)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    p = argparse.ArgumentParser(description="fake Compliance Mapping API")
+    p.add_argument("--port", type=int, default=8931)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--requirements", type=int, default=None)
+    p.add_argument("--latency-ms", type=float, default=0.0)
+    a = p.parse_args(argv)
+    uvicorn.run(create_app(a.seed, a.requirements, a.latency_ms), host="127.0.0.1", port=a.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
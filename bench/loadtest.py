@@ -0,0 +1,242 @@
+# bench/loadtest.py
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+# 감사 API HTTP 부하 테스트
+#   python -m bench.serve --scale small --port 8103 &
+#   python -m bench.loadtest --url http://127.0.0.1:8103 --concurrency 20 --duration 60 --cache warm
+#
+# - 요청 종류(--mix 가중치): all(_all), stream(_all?stream=true), requirement(단건), session(GET /audit/session)
+# - --cache cold: 모든 요청에 refresh=1(캐시 우회) / warm: 측정 전 요청 종류별로 한 번씩 미리 실행
+# - 보고: 처리량, 종류별 p50/p95/p99 지연(stream은 첫 바이트 시간도), 상태 코드, X-Cache 비율,
+#         서버 이벤트 루프 지연(/metrics dspm_audit_event_loop_lag_observed_seconds 측정 구간 증분)
+
+KINDS = ("all", "stream", "requirement", "session")
+
+
+def _pct(values: List[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    s = sorted(values)
+    k = min(len(s) - 1, max(0, int(round(p / 100.0 * (len(s) - 1)))))
+    return round(s[k] * 1000.0, 1)
+
+
+def _parse_mix(raw: str) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for part in raw.split(","):
+        if "=" in part:
+            k, v = part.split("=", 1)
+            if k.strip() in KINDS and float(v) > 0:
+                out[k.strip()] = float(v)
+    if not out:
+        raise SystemExit(f"--mix: 종류는 {', '.join(KINDS)}")
+    return out
+
+
+def _parse_ids(raw: str) -> List[int]:
+    ids: List[int] = []
+    for part in raw.split(","):
+        if "-" in part:
+            a, b = part.split("-", 1)
+            ids.extend(range(int(a), int(b) + 1))
+        elif part.strip():
+            ids.append(int(part))
+    return ids
+
+
+_LAG_RE = re.compile(r'^dspm_audit_event_loop_lag_observed_seconds_bucket\{worker="[^"]*",le="([^"]+)"\} (\S+)$')
+
+
+async def _lag_histogram(client: httpx.AsyncClient) -> Dict[str, float]:
+    try:
+        r = await client.get("/metrics", timeout=10)
+    except httpx.HTTPError:
+        return {}
+    out: Dict[str, float] = {}
+    for line in r.text.splitlines():
+        m = _LAG_RE.match(line)
+        if m:
+            out[m.group(1)] = float(m.group(2))
+    return out
+
+
+def _lag_summary(before: Dict[str, float], after: Dict[str, float]) -> Dict[str, Any]:
+    """측정 구간 동안의 이벤트 루프 지연 샘플 분포(누적 버킷 증분)"""
+    if not after:
+        return {}
+    delta = {le: after.get(le, 0.0) - before.get(le, 0.0) for le in after}
+    total = delta.get("+Inf", 0.0)
+    if not total:
+        return {"samples": 0}
+    bounds = sorted(((float("inf") if le == "+Inf" else float(le)), n) for le, n in delta.items())
+
+    def quantile(q: float) -> str:
+        for le, n in bounds:
+            if n >= q * total:
+                return "+Inf" if le == float("inf") else f"<= {le}s"
+        return "+Inf"
+
+    over_100ms = total - next((n for le, n in bounds if le >= 0.1), total)
+    return {
+        "samples": int(total),
+        "p50": quantile(0.5),
+        "p99": quantile(0.99),
+        "samplesOver100ms": int(over_100ms),
+    }
+
+
+class Runner:
+    def __init__(self, a: argparse.Namespace):
+        self.a = a
+        self.mix = _parse_mix(a.mix)
+        self.req_ids = _parse_ids(a.req_ids)
+        self.latency: Dict[str, List[float]] = defaultdict(list)
+        self.ttfb: List[float] = []
+        self.status: Dict[str, Counter] = defaultdict(Counter)
+        self.xcache: Dict[str, Counter] = defaultdict(Counter)
+        self.errors: Counter = Counter()
+        self.rng = random.Random(a.seed)
+
+    def _request(self, kind: str) -> Tuple[str, str, Dict[str, str]]:
+        fw = self.a.framework
+        params: Dict[str, str] = {}
+        if self.a.cache == "cold" and kind != "session":
+            params["refresh"] = "1"
+        if self.a.sessions and kind != "session":
+            params["session_id"] = f"load-{self.rng.randrange(self.a.sessions)}"
+        if kind == "all":
+            return "POST", f"/audit/{fw}/_all", params
+        if kind == "stream":
+            params["stream"] = "true"
+            return "POST", f"/audit/{fw}/_all", params
+        if kind == "requirement":
+            return "POST", f"/audit/audit/{fw}/{self.rng.choice(self.req_ids)}", params
+        return "GET", "/audit/session", params
+
+    async def one(self, client: httpx.AsyncClient, kind: str, record: bool = True):
+        method, path, params = self._request(kind)
+        t0 = time.perf_counter()
+        try:
+            async with client.stream(method, path, params=params) as r:
+                first = None
+                async for _ in r.aiter_raw():
+                    if first is None:
+                        first = time.perf_counter() - t0
+                elapsed = time.perf_counter() - t0
+        except httpx.HTTPError as e:
+            if record:
+                self.errors[f"{kind}:{type(e).__name__}"] += 1
+            return
+        if not record:
+            return
+        self.latency[kind].append(elapsed)
+        self.status[kind][r.status_code] += 1
+        self.xcache[kind][r.headers.get("x-cache", "-")] += 1
+        if kind == "stream" and first is not None:
+            self.ttfb.append(first)
+
+    def pick(self) -> str:
+        kinds = list(self.mix)
+        return self.rng.choices(kinds, weights=[self.mix[k] for k in kinds])[0]
+
+    async def worker(self, client: httpx.AsyncClient, deadline: float, budget: List[int]):
+        while time.perf_counter() < deadline:
+            if budget[0] <= 0:
+                return
+            budget[0] -= 1
+            await self.one(client, self.pick())
+
+    async def run(self) -> Dict[str, Any]:
+        a = self.a
+        limits = httpx.Limits(max_connections=a.concurrency, max_keepalive_connections=a.concurrency)
+        async with httpx.AsyncClient(base_url=a.url, timeout=a.timeout, limits=limits) as client:
+            if a.cache == "warm":
+                # 요청 종류/요건별로 한 번씩 실행해 응답 캐시를 채움
+                for kind in self.mix:
+                    if kind == "requirement":
+                        for rid in self.req_ids:
+                            m, p, params = self._request(kind)
+                            await client.post(p.rsplit("/", 1)[0] + f"/{rid}", params=params)
+                    else:
+                        await self.one(client, kind, record=False)
+            lag_before = await _lag_histogram(client)
+            started = time.perf_counter()
+            deadline = started + a.duration if a.duration else float("inf")
+            budget = [a.requests if a.requests else 1 << 62]
+            await asyncio.gather(*(self.worker(client, deadline, budget) for _ in range(a.concurrency)))
+            wall = time.perf_counter() - started
+            lag_after = await _lag_histogram(client)
+
+        total = sum(len(v) for v in self.latency.values())
+        report: Dict[str, Any] = {
+            "config": {k: getattr(a, k) for k in ("url", "framework", "concurrency", "duration", "requests", "cache", "mix", "sessions", "seed")},
+            "wallSeconds": round(wall, 2),
+            "requests": total,
+            "throughputRps": round(total / wall, 2) if wall else None,
+            "errors": dict(self.errors),
+            "endpoints": {},
+            "serverEventLoopLag": _lag_summary(lag_before, lag_after),
+        }
+        for kind, values in sorted(self.latency.items()):
+            xc = self.xcache[kind]
+            n = sum(xc.values())
+            hits = xc.get("HIT", 0) + xc.get("COALESCED", 0)
+            entry = {
+                "count": len(values),
+                "p50Ms": _pct(values, 50),
+                "p95Ms": _pct(values, 95),
+                "p99Ms": _pct(values, 99),
+                "maxMs": round(max(values) * 1000.0, 1),
+                "status": {str(k): v for k, v in sorted(self.status[kind].items())},
+                "xCache": dict(xc),
+                "cacheHitRatio": round(hits / n, 3) if n and kind not in ("stream", "session") else None,
+            }
+            if kind == "stream":
+                entry["ttfbP50Ms"] = _pct(self.ttfb, 50)
+                entry["ttfbP95Ms"] = _pct(self.ttfb, 95)
+            report["endpoints"][kind] = entry
+        return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="audit API load test")
+    p.add_argument("--url", default="http://127.0.0.1:8103")
+    p.add_argument("--framework", default="BENCH")
+    p.add_argument("--concurrency", type=int, default=10)
+    p.add_argument("--duration", type=float, default=30.0, help="측정 시간(초), 0이면 --requests까지")
+    p.add_argument("--requests", type=int, default=0, help="총 요청 수 상한(0이면 무제한)")
+    p.add_argument("--mix", default="all=1,stream=1,requirement=4,session=2", help="종류별 가중치")
+    p.add_argument("--req-ids", default="1-20", help="단건 감사 요건 ID(예: 1-20,25)")
+    p.add_argument("--cache", choices=("warm", "cold"), default="warm")
+    p.add_argument("--sessions", type=int, default=0, help="session_id 개수(0이면 세션 없이)")
+    p.add_argument("--timeout", type=float, default=600.0)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", default=None, help="결과 JSON 경로(기본: 표준 출력)")
+    a = p.parse_args(argv)
+    if not a.duration and not a.requests:
+        p.error("--duration 또는 --requests 중 하나는 필요")
+
+    report = asyncio.run(Runner(a).run())
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if a.out:
+        with open(a.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+# bench/run.py
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+# 합성 대규모 계정 벤치마크
+#   python -m bench.run --scale small,medium,large --seed 7 --out bench/results/latest.json
+#   python -m bench.run --scale medium --baseline bench/results/prev.json   # 회귀 시 종료 코드 1
+#
+# - 규모마다 별도 프로세스로 실행(최대 RSS를 규모별로 분리 측정)
+# - AWS: bench.fake_aws(프로세스 내 botocore 훅), Mapping API: bench.fake_mapping(로컬 uvicorn)
+# - 측정: /audit/{framework}/_all 종단 지연, AWS 호출 수(오퍼레이션별), 최대 RSS, executor별 시간/호출 수
+# - 결과는 JSON(비교 가능한 기계 판독 형식)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _peak_rss_mb() -> float:
+    kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # Linux: KB
+    return round(kb / 1024.0, 1)
+
+
+def _bench_env(port: int, workdir: str) -> Dict[str, str]:
+    return {
+        "MAPPING_BASE_URL": f"http://127.0.0.1:{port}",
+        "MAPPING_MIRROR_PATH": os.path.join(workdir, "mapping.sqlite3"),
+        "DATA_SOURCE": "sdk",
+        "SNAPSHOT_MODE": "",
+        "WARMUP_ENABLED": "false",
+        "AWS_RATE_LIMIT_ENABLED": "false",
+        "MAPPING_RESULT_TTL_SECONDS": "0",
+        "SHARED_BACKEND": "memory",
+        "AWS_ACCESS_KEY_ID": "bench",
+        "AWS_SECRET_ACCESS_KEY": "bench",
+        "AWS_DEFAULT_REGION": "us-east-1",
+        "AWS_EC2_METADATA_DISABLED": "true",
+    }
+
+
+def run_child(scale: str, seed: int, framework: str, requirements: Optional[int], repeat: int) -> Dict[str, Any]:
+    workdir = tempfile.mkdtemp(prefix="dspm-bench-")
+    port = _free_port()
+    # 설정(app.core.config)은 import 시점에 환경 변수를 읽으므로 먼저 지정
+    os.environ.update(_bench_env(port, workdir))
+
+    from fastapi.testclient import TestClient
+    from bench.fake_aws import FakeAWS, SCALES
+    from bench.fake_mapping import FakeMappingServer
+    from app.main import app
+
+    rss_before = _peak_rss_mb()
+    fake = FakeAWS(SCALES[scale], seed=seed)
+    latencies: List[float] = []
+    body: Dict[str, Any] = {}
+    with FakeMappingServer(seed=seed, requirements=requirements, port=port), TestClient(app) as client:
+        fake.install()
+        for i in range(repeat):
+            fake.calls.clear()
+            t0 = time.perf_counter()
+            r = client.post(f"/audit/{framework}/_all", params={"refresh": "1"} if i else None)
+            latencies.append(time.perf_counter() - t0)
+            r.raise_for_status()
+            body = r.json()
+        fake.uninstall()
+
+    executors: Dict[str, Dict[str, Any]] = {}
+    statuses: Dict[str, int] = {}
+    for req in body.get("results", []):
+        for res in req.get("results", []):
+            statuses[res["status"]] = statuses.get(res["status"], 0) + 1
+            t = res.get("timing") or {}
+            executors[res["mapping_code"]] = {
+                "status": res["status"],
+                "wallMs": t.get("wallMs"),
+                "awsCalls": t.get("awsCalls"),
+                "evaluations": t.get("evaluations", len(res.get("evaluations") or [])),
+            }
+    return {
+        "scale": scale,
+        "seed": seed,
+        "framework": framework,
+        "requirements": body.get("total_requirements"),
+        "latencySeconds": {
+            "runs": [round(x, 3) for x in latencies],
+            "min": round(min(latencies), 3),
+            "median": round(statistics.median(latencies), 3),
+        },
+        "awsCalls": sum(fake.calls.values()),
+        "awsCallsByOperation": dict(sorted(fake.calls.items())),
+        "peakRssMb": _peak_rss_mb(),
+        "baseRssMb": rss_before,
+        "statuses": statuses,
+        "executors": dict(sorted(executors.items())),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """규모별 지연(median)/AWS 호출 수/최대 RSS가 threshold 비율 이상 나빠진 항목"""
+    base = {r["scale"]: r for r in baseline.get("runs", [])}
+    out: List[str] = []
+    for run in current.get("runs", []):
+        old = base.get(run["scale"])
+        if old is None:
+            continue
+        for label, new_v, old_v in (
+            ("latency median", run["latencySeconds"]["median"], old["latencySeconds"]["median"]),
+            ("aws calls", run["awsCalls"], old["awsCalls"]),
+            ("peak rss", run["peakRssMb"], old["peakRssMb"]),
+        ):
+            if old_v and new_v > old_v * (1 + threshold):
+                out.append(f"{run['scale']}: {label} {old_v} → {new_v} (+{(new_v / old_v - 1) * 100:.0f}%)")
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="synthetic large-account benchmark")
+    p.add_argument("--scale", default="small", help="쉼표 구분: small,medium,large")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--framework", default="BENCH")
+    p.add_argument("--requirements", type=int, default=None, help="요건 수(기본: 매핑 코드 수의 절반)")
+    p.add_argument("--repeat", type=int, default=1, help="규모별 반복 횟수(2회차부터 refresh=1)")
+    p.add_argument("--out", default=None, help="결과 JSON 경로(기본: 표준 출력)")
+    p.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    p.add_argument("--threshold", type=float, default=0.2, help="회귀 판정 비율(기본 0.2 = 20%%)")
+    p.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    a = p.parse_args(argv)
+
+    if a.child:
+        print(json.dumps(run_child(a.scale, a.seed, a.framework, a.requirements, max(1, a.repeat)), default=str))
+        return 0
+
+    runs = []
+    for scale in [s.strip() for s in a.scale.split(",") if s.strip()]:
+        cmd = [sys.executable, "-m", "bench.run", "--child", "--scale", scale, "--seed", str(a.seed),
+               "--framework", a.framework, "--repeat", str(a.repeat)]
+        if a.requirements:
+            cmd += ["--requirements", str(a.requirements)]
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode != 0:
+            sys.stderr.write(proc.stderr)
+            return proc.returncode
+        run = json.loads(proc.stdout.strip().splitlines()[-1])
+        runs.append(run)
+        sys.stderr.write(
+            f"[{scale}] median {run['latencySeconds']['median']}s, aws calls {run['awsCalls']}, "
+            f"peak rss {run['peakRssMb']}MB\n"
+        )
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": dt.datetime.now(dt.timezone.utc).isoformat(),
+            "seed": a.seed,
+        },
+        "runs": runs,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if a.out:
+        os.makedirs(os.path.dirname(a.out) or ".", exist_ok=True)
+        with open(a.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if a.baseline:
+        with open(a.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), a.threshold)
+        for line in regressions:
+            sys.stderr.write(f"REGRESSION {line}\n")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+# bench/serve.py
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+# 부하 테스트용 로컬 서버: 감사 API + 가짜 AWS(프로세스 내) + 가짜 Mapping API(백그라운드 스레드)
+#   python -m bench.serve --scale medium --port 8103
+#   python -m bench.loadtest --url http://127.0.0.1:8103 --concurrency 20 --duration 60
+
+
+def main(argv: Optional[List[str]] = None):
+    p = argparse.ArgumentParser(description="audit API backed by fake AWS / Mapping API")
+    p.add_argument("--scale", default="small")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--port", type=int, default=8103)
+    p.add_argument("--mapping-latency-ms", type=float, default=0.0)
+    p.add_argument("--requirements", type=int, default=None)
+    a = p.parse_args(argv)
+
+    from bench.run import _bench_env, _free_port
+    mapping_port = _free_port()
+    env = _bench_env(mapping_port, tempfile.mkdtemp(prefix="dspm-serve-"))
+    # 부하 테스트는 실제 운영 설정으로: 결과 캐시 유지, 호출자가 지정한 값은 존중
+    env.pop("MAPPING_RESULT_TTL_SECONDS")
+    for k, v in env.items():
+        os.environ.setdefault(k, v)
+
+    import uvicorn
+    from bench.fake_aws import FakeAWS, SCALES
+    from bench.fake_mapping import FakeMappingServer
+    from app.main import app
+
+    fake = FakeAWS(SCALES[a.scale], seed=a.seed)
+    inner = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(application):
+        async with inner(application) as state:
+            # 앱의 훅(계측/사실 캐시 등) 등록 뒤에 설치
+            fake.install()
+            yield state
+
+    app.router.lifespan_context = lifespan
+    with FakeMappingServer(seed=a.seed, requirements=a.requirements, latency_ms=a.mapping_latency_ms, port=mapping_port):
+        uvicorn.run(app, host="127.0.0.1", port=a.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# tests/test_budget.py
+import time
+
+import pytest
+
+from app.core import budget
+from app.core.budget import BudgetExceeded, ExecutorBudget
+from app.core.config import settings
+from app.models.schemas import AuditResult, ServiceEvaluation
+from app.services.audit_service import AuditService
+
+
+@pytest.fixture(autouse=True)
+def no_limits(monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_RUN_DEADLINE_SECONDS", 0.0)
+    monkeypatch.setattr(settings, "EXECUTOR_TIMEOUT_SECONDS", 0.0)
+    monkeypatch.setattr(settings, "EXECUTOR_MAX_AWS_CALLS", 0)
+
+
+def test_max_calls_trips_and_keeps_blocking(monkeypatch):
+    monkeypatch.setattr(settings, "EXECUTOR_MAX_AWS_CALLS", 2)
+    b = ExecutorBudget("1.0-01")
+    b.check("ListBuckets")
+    b.check("GetBucketEncryption")
+    for _ in range(3):
+        with pytest.raises(BudgetExceeded) as ei:
+            b.check("GetBucketEncryption")
+    assert ei.value.reason == "max_calls"
+    assert ei.value.response["Error"]["Code"] == budget.MARKER
+    assert b.calls == 2 and b.blocked == 3
+    s = b.summary(dropped=4)
+    assert s["reason"] == "max_calls" and s["limit"] == 2 and s["droppedEvaluations"] == 4
+
+
+def test_executor_timeout_tighter_than_run_deadline(monkeypatch):
+    monkeypatch.setattr(settings, "EXECUTOR_TIMEOUT_SECONDS", 0.05)
+    b = ExecutorBudget("1.0-01", run_deadline=time.monotonic() + 60)
+    b.check("ListBuckets")
+    time.sleep(0.06)
+    with pytest.raises(BudgetExceeded):
+        b.check("ListBuckets")
+    assert b.tripped == "timeout"
+
+
+def test_run_deadline_and_expired(monkeypatch):
+    assert budget.run_deadline() is None and not budget.expired(None)
+    monkeypatch.setattr(settings, "AUDIT_RUN_DEADLINE_SECONDS", 0.05)
+    d = budget.run_deadline()
+    assert not budget.expired(d)
+    time.sleep(0.06)
+    assert budget.expired(d)
+
+
+def test_limit_sets_and_resets_current_budget():
+    assert budget.CURRENT_BUDGET.get() is None
+    with budget.limit("1.0-01") as b:
+        assert budget.CURRENT_BUDGET.get() is b
+    assert budget.CURRENT_BUDGET.get() is None
+
+
+def _ev(status, **kw):
+    return ServiceEvaluation(service="s3", checked_field="x", status=status, source="aws-sdk", **kw)
+
+
+def _tripped_budget():
+    b = ExecutorBudget("1.0-01")
+    b.tripped = "max_calls"
+    return b
+
+
+@pytest.mark.parametrize("kept_status, expected", [("NON_COMPLIANT", "NON_COMPLIANT"), ("COMPLIANT", "ERROR")])
+def test_truncate_drops_blocked_evaluations(kept_status, expected):
+    blocked = f"ClientError: An error occurred ({budget.MARKER})"
+    result = AuditResult(
+        mapping_code="1.0-01",
+        status="COMPLIANT",
+        evaluations=[
+            _ev(kept_status),
+            _ev("ERROR", extra={"error": blocked}),
+            _ev("SKIPPED", decision=blocked),
+        ],
+    )
+    AuditService._truncate("1.0-01", result, _tripped_budget())
+    assert [ev.status for ev in result.evaluations] == [kept_status]
+    assert result.status == expected
+    assert result.truncated["droppedEvaluations"] == 2
+    assert result.truncated["reason"] == "max_calls"
+
+
+def test_bounded_skips_executors_after_deadline(monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_RUN_DEADLINE_SECONDS", 1.0)
+
+    class Executor:
+        title = "t"
+
+        def audit(self):
+            raise AssertionError("must not run")
+
+    svc = AuditService(mapping_client=object())
+    svc.deadline = time.monotonic() - 1
+    result = svc._bounded("1.0-01", Executor())
+    assert result.status == "ERROR"
+    assert result.truncated["started"] is False
@@ -0,0 +1,70 @@
+# tests/test_cache_codec.py
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.utils import cache_codec
+
+
+def test_decode_plain_json_entry():
+    # 봉투 도입 전 평문 JSON 항목
+    raw = json.dumps({"framework": "ISMS-P", "results": [1, 2]}).encode("utf-8")
+    env = cache_codec.decode(raw)
+    assert env.codec == cache_codec.NONE
+    assert env.encoding == cache_codec.JSON
+    assert env.etag is None
+    assert env.content_encoding is None
+    assert env.body() == raw
+    assert env.value() == {"framework": "ISMS-P", "results": [1, 2]}
+
+
+def test_decode_plain_json_list_entry():
+    assert cache_codec.decode(b'[1,"a"]').value() == [1, "a"]
+
+
+@pytest.mark.parametrize("codec", ["none", "zlib"])
+def test_encode_body_roundtrip(monkeypatch, codec):
+    monkeypatch.setattr(settings, "CACHE_CODEC", codec)
+    monkeypatch.setattr(settings, "CACHE_COMPRESS_MIN_BYTES", 0)
+    body = json.dumps({"x": "가" * 100}, ensure_ascii=False).encode("utf-8")
+    env = cache_codec.decode(cache_codec.encode_body(body, "abc"))
+    assert env.etag == "abc"
+    assert env.body() == body
+    assert env.content_encoding == ("deflate" if codec == "zlib" else None)
+
+
+def test_encode_value_roundtrip(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_ENCODING", "json")
+    value = {"a": [1, 2, {"b": None}]}
+    env = cache_codec.decode(cache_codec.encode_value(value))
+    assert env.etag is None
+    assert env.value() == value
+
+
+def test_small_bodies_are_not_compressed(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_CODEC", "zlib")
+    monkeypatch.setattr(settings, "CACHE_COMPRESS_MIN_BYTES", 1024)
+    env = cache_codec.decode(cache_codec.encode_body(b"{}", None))
+    assert env.codec == cache_codec.NONE
+
+
+def test_unknown_envelope_version_rejected():
+    blob = cache_codec._HDR.pack(cache_codec.MAGIC, 99, 0, 0, 0) + b"{}"
+    with pytest.raises(ValueError):
+        cache_codec.decode(blob)
+
+
+@pytest.mark.parametrize("header, coding, ok", [
+    ("gzip, deflate, br", "deflate", True),
+    ("deflate;q=0", "deflate", False),
+    ("gzip;q=1.0, deflate; q=0.000", "deflate", False),
+    ("x-deflate, gzip", "deflate", False),
+    ("zstd;q=0.5", "zstd", True),
+    ("*", "zstd", True),
+    ("*;q=0.3, zstd;q=0", "zstd", False),
+    ("", "deflate", False),
+])
+def test_accept_encoding_q_values(header, coding, ok):
+    from app.utils.etag_utils import _accepts
+    assert _accepts(header, coding) is ok
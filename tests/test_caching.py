@@ -0,0 +1,80 @@
+# tests/test_caching.py
+import asyncio
+import time
+import types
+
+import pytest
+
+from app.utils import caching, shared_backend
+from app.utils.shared_backend import SqliteShmBackend, TieredBackend
+
+
+class SlowShared(SqliteShmBackend):
+    """write-behind가 늦게 끝나는 L2. 잠금 해제 시점에 결과가 L2에 있었는지 기록"""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.seen_at_unlock = {}
+
+    def set(self, key, value, ttl):
+        if key.startswith("RESP:"):
+            time.sleep(0.2)
+        super().set(key, value, ttl)
+
+    def delete(self, key):
+        if key.startswith("INFLIGHT:"):
+            resp = key[len("INFLIGHT:"):]
+            self.seen_at_unlock[resp] = self.get(resp) is not None
+        super().delete(key)
+
+
+@pytest.fixture
+def slow_backend(tmp_path, monkeypatch):
+    base = SlowShared(str(tmp_path / "kv.sqlite3"))
+    tb = TieredBackend(base, None, ("RESP:", "RESULT:"))
+    monkeypatch.setattr(shared_backend, "_BACKEND", tb)
+    return base
+
+
+def _request(key: str):
+    return types.SimpleNamespace(state=types.SimpleNamespace(_cache_key=key, _cache_ttl=60))
+
+
+def test_single_flight_flushes_result_before_unlock(slow_backend):
+    key = "RESP:flush-order"
+    out = asyncio.run(caching.single_flight(_request(key), types.SimpleNamespace(headers={}), lambda: {"ok": True}))
+    assert out.value() == {"ok": True}
+    # 다른 워커가 잠금 해제를 보고 L2를 읽으면 결과가 이미 있어야 함
+    assert slow_backend.seen_at_unlock[key] is True
+    assert slow_backend.get("INFLIGHT:" + key) is None
+
+
+def test_single_flight_coalesces_without_blocking_loop(slow_backend):
+    key = "RESP:coalesce"
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.5)
+        return {"n": len(calls)}
+
+    async def ticks():
+        n, started = 0, time.time()
+        while time.time() - started < 0.5:
+            await asyncio.sleep(0.05)
+            n += 1
+        return n
+
+    async def main():
+        waiter = types.SimpleNamespace(headers={})
+        first = caching.single_flight(_request(key), types.SimpleNamespace(headers={}), compute)
+        second = caching.single_flight(_request(key), waiter, compute)
+        a, b, n = await asyncio.gather(first, second, ticks())
+        return a, b, n, waiter
+
+    a, b, n, waiter = asyncio.run(main())
+    assert len(calls) == 1
+    assert a.value() == b.value() == {"n": 1}
+    assert waiter.headers["X-Cache"] == "COALESCED"
+    # compute가 이벤트 루프를 막지 않음
+    assert n >= 5
@@ -0,0 +1,79 @@
+# tests/test_rate_limit.py
+import time
+
+import pytest
+
+from app.core import rate_limit
+from app.core.config import settings
+from app.core.rate_limit import AdaptiveBucket
+
+
+@pytest.fixture(autouse=True)
+def aimd(monkeypatch):
+    monkeypatch.setattr(settings, "AWS_RATE_INCREASE", 1.0)
+    monkeypatch.setattr(settings, "AWS_RATE_DECREASE", 0.5)
+
+
+def test_unbounded_until_first_throttle():
+    b = AdaptiveBucket(None, min_rate=0.5, max_rate=None)
+    started = time.monotonic()
+    for _ in range(1000):
+        b.acquire()
+    assert time.monotonic() - started < 0.5
+    assert b.calls == 1000 and b.waited == 0.0
+    assert b.snapshot()["rate"] is None
+
+
+def test_first_throttle_starts_from_observed_rate():
+    b = AdaptiveBucket(None, min_rate=0.5, max_rate=None)
+    for _ in range(40):
+        b.acquire()
+    time.sleep(0.2)
+    b.on_throttle()
+    # 0.2초 동안 40건 → 관측 약 200/s → 절반
+    assert 50 <= b.rate <= 110
+    assert b.tokens == 0.0 and b.throttled == 1
+
+
+def test_throttle_respects_min_rate():
+    b = AdaptiveBucket(2.0, min_rate=1.5, max_rate=None)
+    b.on_throttle()
+    b.on_throttle()
+    assert b.rate == 1.5
+
+
+def test_additive_increase_releases_at_ceiling():
+    b = AdaptiveBucket(8.0, min_rate=0.5, max_rate=10.0)
+    b.on_success()
+    assert b.rate == 9.0
+    b.on_success()
+    assert b.rate is None
+
+
+def test_limited_bucket_paces_calls():
+    b = AdaptiveBucket(20.0, min_rate=0.5, max_rate=None)
+    b.tokens = 0.0
+    b.updated = time.monotonic()
+    started = time.monotonic()
+    for _ in range(4):
+        b.acquire()
+    assert time.monotonic() - started >= 0.15
+
+
+class _Http:
+    def __init__(self, status):
+        self.status_code = status
+
+
+def test_needs_retry_only_lowers_rate(monkeypatch):
+    key = ("acct", "us-east-1", "s3", "GetBucketEncryption")
+    b = AdaptiveBucket(1.0, min_rate=0.5, max_rate=None)
+    monkeypatch.setitem(rate_limit._BUCKETS, key, b)
+    throttle = (_Http(400), {"Error": {"Code": "SlowDown"}})
+    started = time.monotonic()
+    rate_limit._on_needs_retry(response=throttle, request_dict={"context": {"rate_limit_key": key}})
+    # 토큰을 기다리지 않음(재시도 대기는 botocore 백오프 + 다음 before-call)
+    assert time.monotonic() - started < 0.1
+    assert b.rate == 0.5 and b.calls == 0
+    rate_limit._on_needs_retry(response=(_Http(200), {}), request_dict={"context": {"rate_limit_key": key}})
+    assert b.rate == 1.5
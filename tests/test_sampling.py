@@ -0,0 +1,79 @@
+# tests/test_sampling.py
+import types
+
+import pytest
+
+from app.core import sampling
+from app.core.sampling import SampleState, wilson
+from app.services.executors import map_5_0_06_glue_catalog_schema as glue_exec
+
+
+def test_wilson_interval():
+    lo, hi = wilson(0, 50, 0.95)
+    assert lo == 0.0 and 0.05 < hi < 0.08
+    lo, hi = wilson(25, 50, 0.95)
+    assert lo == pytest.approx(0.3664, abs=1e-3) and hi == pytest.approx(0.6336, abs=1e-3)
+    assert wilson(50, 50)[1] == 1.0
+
+
+def test_choose_is_reproducible_and_order_independent():
+    items = [f"r{i}" for i in range(100)]
+    a = SampleState(10, seed=7).choose(items, key=str)
+    b = SampleState(10, seed=7).choose(list(reversed(items)), key=str)
+    assert len(a) == 10 and set(a) == set(b)
+    assert set(SampleState(10, seed=8).choose(items, key=str)) != set(a)
+
+
+def test_choose_records_population_and_keeps_small_lists():
+    s = SampleState(5, seed=1)
+    assert s.choose(["a", "b"], key=str) == ["a", "b"]
+    s.choose([f"x{i}" for i in range(20)], key=str)
+    assert s.population == 22
+    assert len(s.chosen) == 7
+
+
+def test_module_choose_passthrough_without_sample():
+    assert sampling.choose([3, 1, 2], key=str) == [3, 1, 2]
+    with sampling.use(1, 0) as state:
+        assert len(sampling.choose([3, 1, 2], key=str)) == 1
+    assert state.population == 3
+
+
+class _Glue:
+    def __init__(self):
+        self.calls = []
+
+    def get_databases(self, **kw):
+        return {"DatabaseList": [{"Name": "db1"}, {"Name": "db2"}]}
+
+    def get_tables(self, DatabaseName, **kw):
+        self.calls.append(("get_tables", DatabaseName))
+        return {"TableList": [{"Name": f"t{i}"} for i in range(3)]}
+
+    def get_table(self, DatabaseName, Name):
+        self.calls.append(("get_table", DatabaseName))
+        return {"Table": {"StorageDescriptor": {"Columns": [{"Name": "c", "Type": "string"}]}}}
+
+
+@pytest.fixture
+def glue(monkeypatch):
+    client = _Glue()
+    monkeypatch.setattr(glue_exec, "boto3", types.SimpleNamespace(client=lambda name: client))
+    return client
+
+
+def test_glue_streams_tables_per_database(glue):
+    result = glue_exec.Exec_5_0_06().audit()
+    assert result.status == "COMPLIANT"
+    assert result.evidence["tablesChecked"] == 6
+    # 표본 모드가 아니면 DB별로 목록 → GetTable 순서(목록을 먼저 다 모으지 않음)
+    assert glue.calls[:5] == [("get_tables", "db1")] + [("get_table", "db1")] * 3 + [("get_tables", "db2")]
+
+
+def test_glue_sample_mode_reads_only_sampled_tables(glue):
+    with sampling.use(2, 0) as state:
+        result = glue_exec.Exec_5_0_06().audit()
+    assert result.evidence["tablesChecked"] == 2
+    assert state.population == 6
+    summary = state.summary(result.evaluations)
+    assert summary["evaluated"] == 2 and summary["method"] == "wilson"
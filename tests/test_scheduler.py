@@ -0,0 +1,57 @@
+# tests/test_scheduler.py
+import threading
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services import scheduler
+
+EST = {"a": 5.0, "b": 0.1, "c": 2.0, "d": 0.3, "e": 9.0}
+
+
+@pytest.fixture(autouse=True)
+def estimates(monkeypatch):
+    monkeypatch.setattr(scheduler, "estimate", lambda account, code: (EST[code], "test"))
+    monkeypatch.setattr(settings, "AUDIT_FAST_LANE_MAX_SECONDS", 0.5)
+
+
+def test_makespan_runs_longest_first():
+    lane, heavy = scheduler.plan_order(list(EST), "acct", "makespan")
+    assert not lane
+    assert list(heavy) == ["e", "a", "c", "d", "b"]
+
+
+def test_fast_lane_splits_cheap_executors():
+    lane, heavy = scheduler.plan_order(list(EST), "acct", "fast-lane")
+    assert list(lane) == ["b", "d"]
+    assert list(heavy) == ["e", "a", "c"]
+
+
+def test_run_returns_every_result_and_exceptions():
+    def fn(code):
+        if code == "c":
+            raise RuntimeError("boom")
+        return code.upper()
+
+    out = dict(scheduler.run(list(EST), fn, mode="fast-lane", account="acct", concurrency=3))
+    assert set(out) == set(EST)
+    assert isinstance(out["c"], RuntimeError)
+    assert out["a"] == "A" and out["b"] == "B"
+
+
+def test_run_stops_starting_work_when_consumer_closes():
+    started = []
+    lock = threading.Lock()
+
+    def fn(code):
+        with lock:
+            started.append(code)
+        time.sleep(0.05)
+        return code
+
+    gen = scheduler.run(list(EST), fn, mode="makespan", account="acct", concurrency=1)
+    assert next(gen)[0] == "e"
+    gen.close()
+    # 진행 중이던 1건까지만 시작되고 나머지는 실행되지 않음
+    assert len(started) <= 2
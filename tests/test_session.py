@@ -0,0 +1,64 @@
+# tests/test_session.py
+import threading
+
+import pytest
+
+from app.core import session as session_mod
+from app.core.config import settings
+from app.core.session import AuditSession, create_session, ensure_session, use_session
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    monkeypatch.setattr(session_mod, "_SESSIONS", session_mod.OrderedDict())
+    closed = []
+    orig = AuditSession.close
+
+    def close(self):
+        closed.append(self)
+        orig(self)
+
+    monkeypatch.setattr(AuditSession, "close", close)
+    return closed
+
+
+def _ensure(sid):
+    return ensure_session(sid, region="us-east-1", profile=None, ttl_seconds=600)
+
+
+def test_cap_never_evicts_the_new_session(monkeypatch, registry):
+    monkeypatch.setattr(settings, "SESSION_MAX_COUNT", 1)
+    busy = _ensure("busy")
+    with use_session(busy):
+        s = _ensure("new")
+        assert s not in registry
+        assert session_mod.get_session("new") is s
+    assert busy not in registry
+
+
+def test_concurrent_first_requests_share_one_session(registry):
+    got = []
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        got.append(_ensure("same"))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    winner = session_mod.get_session("same")
+    assert all(s is winner for s in got)
+    assert winner not in registry
+
+
+def test_replace_does_not_close_session_in_use(registry):
+    old = _ensure("r")
+    with use_session(old):
+        new = create_session("r", region="us-east-1", profile=None)
+        assert new is not old
+        assert old not in registry
+    idle = create_session("r", region="us-east-1", profile=None)
+    assert new in registry and idle is not new
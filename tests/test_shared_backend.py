@@ -0,0 +1,61 @@
+# tests/test_shared_backend.py
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.utils.shared_backend import DiskMmapBackend, MemoryBackend, SqliteShmBackend, TieredBackend
+
+
+@pytest.fixture
+def tiered(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_L1_TTL_SECONDS", 30.0)
+    base = SqliteShmBackend(str(tmp_path / "kv.sqlite3"))
+    disk = DiskMmapBackend(str(tmp_path / "disk"), max_bytes=1 << 20)
+    return TieredBackend(base, disk, ("RESP:", "RESULT:"))
+
+
+def _l1_remaining(tb: TieredBackend, key: str) -> float:
+    exp, _ = tb.l1.get_entry(key)
+    return exp - time.time()
+
+
+def test_l2_promotion_keeps_remaining_ttl(tiered):
+    # L2에 곧 만료될 항목 → L1 사본도 그 전에 만료
+    tiered.l2.set("RESP:short", b"v", 2.0)
+    assert tiered.get("RESP:short") == b"v"
+    assert tiered.hits["l2"] == 1
+    assert 0 < _l1_remaining(tiered, "RESP:short") <= 2.0
+
+
+def test_l2_promotion_capped_by_l1_ttl(tiered):
+    tiered.l2.set("RESP:long", b"v", 3600.0)
+    assert tiered.get("RESP:long") == b"v"
+    assert 29.0 < _l1_remaining(tiered, "RESP:long") <= 30.0
+
+
+def test_l3_promotion_keeps_remaining_ttl(tiered):
+    tiered.l3.set("RESULT:x", b"v", 2.0)
+    assert tiered.get("RESULT:x") == b"v"
+    assert tiered.hits["l3"] == 1
+    assert 0 < _l1_remaining(tiered, "RESULT:x") <= 2.0
+
+
+def test_promoted_entry_expires_with_l2(tiered):
+    tiered.l2.set("RESP:gone", b"v", 0.2)
+    assert tiered.get("RESP:gone") == b"v"
+    time.sleep(0.3)
+    assert tiered.l1.get("RESP:gone") is None
+
+
+def test_untiered_keys_bypass_l1(tiered):
+    tiered.set("SESSION_CTX:a", b"v", 60.0)
+    assert tiered.l1.get("SESSION_CTX:a") is None
+    assert tiered.base.get("SESSION_CTX:a") == b"v"
+
+
+def test_memory_base_is_l1():
+    tb = TieredBackend(MemoryBackend(), None, ("RESP:",))
+    assert tb.l2 is None and tb.l1_ttl_cap is None
+    tb.set("RESP:a", b"v", 600.0)
+    assert tb.get("RESP:a") == b"v"
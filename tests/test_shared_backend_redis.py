@@ -0,0 +1,70 @@
+# tests/test_shared_backend_redis.py
+import sys
+import types
+
+import pytest
+
+from app.core.config import settings
+from app.utils import shared_backend
+from app.utils.shared_backend import MemoryBackend, RedisBackend, SqliteShmBackend
+
+
+class _RedisError(Exception):
+    pass
+
+
+class _DownRedis:
+    """연결할 수 없는 Redis: 모든 명령이 ConnectionError"""
+
+    def __init__(self, reachable: bool):
+        self.reachable = reachable
+
+    def ping(self):
+        if not self.reachable:
+            raise _RedisError("connection refused")
+        return True
+
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise _RedisError("connection refused")
+        return fail
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    state = {"reachable": False}
+    mod = types.ModuleType("redis")
+    mod.RedisError = _RedisError
+    mod.Redis = types.SimpleNamespace(from_url=lambda url, **kw: _DownRedis(state["reachable"]))
+    monkeypatch.setitem(sys.modules, "redis", mod)
+    return state
+
+
+def test_unreachable_redis_falls_back_to_shm(fake_redis, tmp_path, monkeypatch):
+    monkeypatch.setenv("REDIS_URL", "redis://127.0.0.1:1/0")
+    monkeypatch.setattr(settings, "SHARED_BACKEND", "redis")
+    monkeypatch.setattr(settings, "SHARED_SHM_PATH", str(tmp_path / "kv.sqlite3"))
+    assert isinstance(shared_backend._create_base(), SqliteShmBackend)
+
+
+def test_redis_outage_degrades_to_cache_miss(fake_redis):
+    fake_redis["reachable"] = True
+    b = RedisBackend("redis://cache:6379/0")
+    b.set("RESULT:x", b"v", 60)
+    assert b.get("RESULT:x") is None
+    assert b.get_entry("RESULT:x") is None
+    assert b.scan("RESULT:") == {}
+    # 잠금을 조정할 수 없으면 직접 실행하도록 획득한 것으로 처리
+    assert b.add("INFLIGHT:x", b"1", 60) is True
+    b.delete("INFLIGHT:x")
+    assert b.errors == 6
+
+
+def test_memory_capacity_eviction_keeps_lock_keys():
+    m = MemoryBackend(max_items=3)
+    m.set("INFLIGHT:a", b"1", 5)
+    m.set("LOCK:b", b"1", 5)
+    for i in range(10):
+        m.set(f"RESP:{i}", b"v", 600)
+    assert m.get("INFLIGHT:a") == b"1"
+    assert m.get("LOCK:b") == b"1"
@@ -0,0 +1,67 @@
+# tests/test_snapshot.py
+import datetime as dt
+import os
+
+from app.utils.snapshot import SnapshotReader, SnapshotWriter
+
+
+def _read(path):
+    r = SnapshotReader(path)
+    try:
+        return {k: r.get(k) for k in r.keys()}, r.meta
+    finally:
+        r.close()
+
+
+def test_roundtrip_preserves_types(tmp_path):
+    path = str(tmp_path / "a.snap")
+    w = SnapshotWriter(path, meta={"region": "ap-northeast-2"})
+    rec = {"when": dt.datetime(2024, 1, 2, 3, 4, 5), "body": b"\x00\x01", "items": [1, "가"]}
+    w.put("k", rec)
+    assert w.save()
+    assert not w.save()
+    data, meta = _read(path)
+    assert data == {"k": rec}
+    assert meta == {"region": "ap-northeast-2"}
+
+
+def test_append_across_flushes_latest_wins(tmp_path):
+    path = str(tmp_path / "a.snap")
+    w = SnapshotWriter(path)
+    w.put("a", 1)
+    w.put("b", 2)
+    w.save()
+    w.put("b", 3)
+    w.put("c", 4)
+    w.save()
+    assert len(w) == 3
+    assert _read(path)[0] == {"a": 1, "b": 3, "c": 4}
+
+
+def test_repeated_flushes_do_not_grow_unbounded(tmp_path):
+    path = str(tmp_path / "a.snap")
+    w = SnapshotWriter(path)
+    for i in range(50):
+        w.put(f"k{i % 5}", {"i": i, "pad": "x" * 200})
+        w.save()
+    size = os.path.getsize(path)
+    # 살아 있는 항목은 5개: 죽은 영역이 절반을 넘기 전에 압축
+    w.save(compact=True)
+    compact = os.path.getsize(path)
+    assert size <= 2 * compact + 512
+    assert _read(path)[0] == {f"k{j}": {"i": 45 + j, "pad": "x" * 200} for j in range(5)}
+
+
+def test_compact_reclaims_dead_space(tmp_path):
+    path = str(tmp_path / "a.snap")
+    w = SnapshotWriter(path)
+    w.put("a", "x" * 1000)
+    w.put("b", "y" * 1000)
+    w.save()
+    w.put("c", 1)
+    w.save()
+    before = os.path.getsize(path)
+    assert w.save(compact=True)
+    assert os.path.getsize(path) < before
+    assert not w.save(compact=True)
+    assert _read(path)[0] == {"a": "x" * 1000, "b": "y" * 1000, "c": 1}
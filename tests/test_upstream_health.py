@@ -0,0 +1,113 @@
+# tests/test_upstream_health.py
+import time
+
+import httpx
+import pytest
+
+from app.clients.upstream_health import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    BreakerTransport,
+    CircuitBreaker,
+    UpstreamUnavailable,
+)
+
+
+def _breaker(**kw):
+    opts = dict(failure_threshold=2, open_seconds=0.1, max_open_seconds=0.3)
+    opts.update(kw)
+    return CircuitBreaker("http://upstream", **opts)
+
+
+def test_opens_after_threshold_and_fast_fails():
+    b = _breaker()
+    b.record_failure("e1")
+    assert b.state == CLOSED and b.allow()
+    b.record_failure("e2")
+    assert b.state == OPEN
+    assert not b.allow()
+    assert b.fast_failed == 1
+    assert b.snapshot()["retryInSeconds"] <= 0.1
+
+
+def test_half_open_lets_one_probe_through():
+    b = _breaker()
+    b._open()
+    time.sleep(0.12)
+    assert b.allow()
+    assert b.state == HALF_OPEN
+    assert not b.allow()
+    b.record_success()
+    assert b.state == CLOSED and b.failures == 0
+    assert b.allow()
+
+
+def test_failed_probe_doubles_open_time_up_to_cap():
+    b = _breaker()
+    b._open()
+    for expected in (0.2, 0.3, 0.3):
+        b.opened_at -= b.open_seconds
+        assert b.allow()
+        b.record_failure("probe")
+        assert b.state == OPEN
+        assert b.open_seconds == pytest.approx(expected)
+
+
+def test_stuck_probe_expires():
+    b = _breaker()
+    b._open()
+    b.opened_at -= 1.0
+    assert b.allow()
+    assert not b.allow()
+    # 탐침이 결과 없이 open 유지 시간 넘게 걸려 있음 → 새 탐침 허용
+    b.probe_started_at -= 1.0
+    assert b.allow()
+
+
+def test_release_probe_allows_next_request():
+    b = _breaker()
+    b._open()
+    b.opened_at -= 1.0
+    assert b.allow()
+    b.release_probe()
+    assert b.state == HALF_OPEN
+    assert b.allow()
+
+
+class _Inner(httpx.BaseTransport):
+    def __init__(self, outcome):
+        self.outcome = outcome
+
+    def handle_request(self, request):
+        if isinstance(self.outcome, BaseException):
+            raise self.outcome
+        return httpx.Response(self.outcome, request=request)
+
+
+def _send(breaker, outcome):
+    t = BreakerTransport(breaker, _Inner(outcome))
+    return t.handle_request(httpx.Request("GET", "http://upstream/x"))
+
+
+def test_transport_records_outcomes():
+    b = _breaker()
+    assert _send(b, 200).status_code == 200
+    _send(b, 503)
+    with pytest.raises(httpx.ConnectError):
+        _send(b, httpx.ConnectError("down"))
+    assert b.state == OPEN
+    with pytest.raises(UpstreamUnavailable):
+        _send(b, 200)
+
+
+def test_transport_releases_probe_on_cancellation():
+    b = _breaker()
+    b._open()
+    b.opened_at -= 1.0
+    with pytest.raises(KeyboardInterrupt):
+        _send(b, KeyboardInterrupt())
+    # 실패로 세지 않고 half-open 유지 → 다음 요청이 탐침
+    assert b.state == HALF_OPEN and b.failures == 0
+    assert _send(b, 200).status_code == 200
+    assert b.state == CLOSED